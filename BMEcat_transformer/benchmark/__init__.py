@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+"""Offline benchmarking tools for BMEcat_transformer."""
+
+from .standin_server import DABAGStandInServer, StandInSettings
+
+__all__ = ["DABAGStandInServer", "StandInSettings"]
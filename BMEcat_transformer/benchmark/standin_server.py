@@ -0,0 +1,359 @@
+"""Local DABAG stand-in HTTP server.
+
+Serves DABAG-shaped pages so scraper throughput can be measured offline:
+- Search results: `/?q=<id>&srv=search` with a link to the detail page
+- Product detail: `/?q=<id>&srv=search&pg=det[&lngId=1|2|3]` with a
+  `w-100 table table-striped m-0` specification table per language
+- Sitemaps: `/robots.txt` points at a `/sitemap.xml` index of gzipped
+  product sitemaps listing the detail pages of the configured catalog
+
+Latency, error rate and 429 injection are configurable. Only the standard
+library is used so the server can run anywhere.
+
+Usage:
+    python3 benchmark/standin_server.py --port 8765 --latency-ms 150 --rate-limit-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import html
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+
+# Spec labels per DABAG language id (1=de, 2=fr, 3=it)
+SPEC_LABELS: Dict[int, List[str]] = {
+    1: ["Spannung", "Leerlaufdrehzahl", "Scheibendurchmesser", "Gewicht", "Akku-Typ", "Lieferumfang"],
+    2: ["tension", "vitesse à vide", "diamètre du disque", "poids", "type d'accu", "livraison"],
+    3: ["tensione", "velocità a vuoto", "diametro disco", "peso", "tipo di batteria", "fornitura"],
+}
+SPEC_VALUES: List[str] = ["18 V", "9000 min-1", "125 mm", "1.9 kg", "--", "T-STAK"]
+
+# Filler paragraph so rendered pages pass content-length checks of the
+# Playwright content extractor, like real DABAG pages do
+FILLER = (
+    "Dieses Produkt ist Teil unseres Sortiments für Handwerk und Industrie. "
+    "Technische Angaben ohne Gewähr, Änderungen vorbehalten. "
+)
+
+
+class StandInSettings:
+    """Behaviour knobs for the stand-in server."""
+
+    def __init__(
+        self,
+        latency_ms: float = 100.0,
+        jitter_ms: float = 50.0,
+        slow_rate: float = 0.0,
+        slow_latency_ms: float = 5000.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        missing_rate: float = 0.0,
+        seed: Optional[int] = None,
+        catalog: Optional[List[str]] = None,
+        sitemap_chunk: int = 1000,
+    ) -> None:
+        """Initialize settings.
+
+        Args:
+            latency_ms: Base response latency.
+            jitter_ms: Uniform random jitter added to the base latency.
+            slow_rate: Fraction of responses delayed by `slow_latency_ms` (tail).
+            slow_latency_ms: Latency of slow responses.
+            error_rate: Fraction of responses answered with HTTP 500.
+            rate_limit_rate: Fraction of responses answered with HTTP 429.
+            retry_after: `Retry-After` seconds sent with 429 responses.
+            missing_rate: Fraction of product IDs treated as unknown
+                (deterministic per ID).
+            seed: Optional RNG seed for reproducible runs.
+            catalog: Product IDs listed in the sitemaps (unknown IDs are left
+                out); None serves empty sitemaps.
+            sitemap_chunk: Product URLs per gzipped sitemap file.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_latency_ms = slow_latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.missing_rate = missing_rate
+        self.seed = seed
+        self.catalog = catalog or []
+        self.sitemap_chunk = max(1, sitemap_chunk)
+
+
+class DABAGStandInServer:
+    """Threaded HTTP server imitating DABAG search and product pages."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, settings: Optional[StandInSettings] = None) -> None:
+        """Initialize the server (not started).
+
+        Args:
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free port.
+            settings: Behaviour settings; defaults to `StandInSettings()`.
+        """
+        self.settings = settings or StandInSettings()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {
+            "search": 0,
+            "detail": 0,
+            "not_found": 0,
+            "errors_injected": 0,
+            "rate_limited": 0,
+            "sitemap": 0,
+        }
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to point `DABAG_BASE_URL` at."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DABAGStandInServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "DABAGStandInServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def get_counters(self) -> Dict[str, int]:
+        """Return a copy of the request counters."""
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _is_known(self, product_id: str) -> bool:
+        """Deterministically decide whether a product ID exists."""
+        if not product_id:
+            return False
+        bucket = (zlib.crc32(product_id.encode("utf-8")) % 10000) / 10000.0
+        return bucket >= self.settings.missing_rate
+
+    def _delay(self) -> None:
+        s = self.settings
+        delay_ms = s.latency_ms + self._roll() * s.jitter_ms
+        if s.slow_rate and self._roll() < s.slow_rate:
+            delay_ms = s.slow_latency_ms
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                server._delay()
+
+                s = server.settings
+                if s.rate_limit_rate and server._roll() < s.rate_limit_rate:
+                    server._count("rate_limited")
+                    self._send(429, "<html><body>Too Many Requests</body></html>",
+                               {"Retry-After": str(s.retry_after)})
+                    return
+                if s.error_rate and server._roll() < s.error_rate:
+                    server._count("errors_injected")
+                    self._send(500, "<html><body>Internal Server Error</body></html>")
+                    return
+
+                path = urlparse(self.path).path
+                if path == "/robots.txt":
+                    server._count("sitemap")
+                    self._send(200, f"User-agent: *\nAllow: /\nSitemap: {server.base_url}/sitemap.xml\n",
+                               content_type="text/plain")
+                    return
+                if path.startswith("/sitemap"):
+                    server._count("sitemap")
+                    payload = server.render_sitemap(path)
+                    if payload is None:
+                        self._send(404, "<html><body>Not Found</body></html>")
+                    else:
+                        self._send_bytes(200, payload, "application/xml")
+                    return
+
+                query = parse_qs(urlparse(self.path).query)
+                product_id = (query.get("q") or [""])[0]
+                if query.get("pg", [""])[0] == "det":
+                    server._count("detail")
+                    lang_raw = (query.get("lngId") or ["1"])[0]
+                    lang_id = int(lang_raw) if lang_raw.isdigit() else 1
+                    self._send(200, server.render_detail(product_id, lang_id))
+                else:
+                    server._count("search")
+                    self._send(200, server.render_search(product_id))
+
+            def _send(
+                self,
+                status: int,
+                body: str,
+                headers: Optional[Dict[str, str]] = None,
+                content_type: str = "text/html",
+            ) -> None:
+                self._send_bytes(status, body.encode("utf-8"), f"{content_type}; charset=utf-8", headers)
+
+            def _send_bytes(
+                self, status: int, payload: bytes, content_type: str, headers: Optional[Dict[str, str]] = None
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                try:
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up, e.g. a request that lost to its hedge
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return  # keep benchmark output clean
+
+        return Handler
+
+    def render_search(self, product_id: str) -> str:
+        """Render a search result page for a product ID."""
+        safe_id = html.escape(product_id)
+        if self._is_known(product_id):
+            href = f"/?q={quote(product_id)}&srv=search&pg=det"
+            results = f'<li><a href="{href}">{safe_id} Akku-Winkelschleifer</a></li>'
+        else:
+            self._count("not_found")
+            results = "<li>Keine Resultate gefunden</li>"
+        return (
+            f"<html><head><title>Suche: {safe_id}</title></head><body>"
+            f"<main><h1>Suchresultate für {safe_id}</h1><ul>{results}</ul>"
+            f"<p>{FILLER * 20}</p></main></body></html>"
+        )
+
+    def render_sitemap(self, path: str) -> Optional[bytes]:
+        """Render the sitemap index or one gzipped product sitemap (None if unknown)."""
+        ids = [pid for pid in self.settings.catalog if self._is_known(pid)]
+        chunk = self.settings.sitemap_chunk
+        chunks = [ids[i:i + chunk] for i in range(0, len(ids), chunk)]
+        if path == "/sitemap.xml":
+            entries = "".join(
+                f"<sitemap><loc>{self.base_url}/sitemap-products-{n}.xml.gz</loc></sitemap>"
+                for n in range(1, len(chunks) + 1)
+            )
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'
+            ).encode("utf-8")
+
+        prefix, suffix = "/sitemap-products-", ".xml.gz"
+        number = path[len(prefix):-len(suffix)] if path.startswith(prefix) and path.endswith(suffix) else ""
+        if not number.isdigit() or not 1 <= int(number) <= len(chunks):
+            return None
+        entries = "".join(
+            f"<url><loc>{html.escape(f'{self.base_url}/?q={quote(pid)}&srv=search&pg=det')}</loc>"
+            f"<lastmod>2024-01-01</lastmod></url>"
+            for pid in chunks[int(number) - 1]
+        )
+        return gzip.compress(
+            (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+            ).encode("utf-8")
+        )
+
+    def render_detail(self, product_id: str, lang_id: int) -> str:
+        """Render a product detail page with a specification table."""
+        safe_id = html.escape(product_id)
+        if not self._is_known(product_id):
+            self._count("not_found")
+            return f"<html><head><title>{safe_id}</title></head><body><p>{FILLER}</p></body></html>"
+
+        labels = SPEC_LABELS.get(lang_id, SPEC_LABELS[1])
+        rows = "".join(
+            f"<tr><td>{html.escape(label)}</td><td>{html.escape(value)}</td></tr>"
+            for label, value in zip(labels, SPEC_VALUES)
+        )
+        return (
+            f"<html><head><title>{safe_id} | DABAG</title></head><body>"
+            f"<article><h1>{safe_id}</h1><p>{FILLER * 20}</p>"
+            f'<table class="w-100 table table-striped m-0"><tbody>{rows}</tbody></table>'
+            f"</article></body></html>"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local DABAG stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-latency-ms", type=float, default=5000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+def settings_from_args(args: argparse.Namespace) -> StandInSettings:
+    """Build `StandInSettings` from parsed CLI arguments."""
+    return StandInSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate,
+        slow_latency_ms=args.slow_latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        missing_rate=args.missing_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    server = DABAGStandInServer(args.host, args.port, settings_from_args(args))
+    print(f"🧪 DABAG stand-in serving on {server.base_url}")
+    print(f"   Point the scraper at it with: DABAG_BASE_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping stand-in server")
+    finally:
+        server.httpd.server_close()
+        print(f"Request counters: {server.get_counters()}")
+
+
+if __name__ == "__main__":
+    main()
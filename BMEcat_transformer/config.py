@@ -11,7 +11,8 @@ from dotenv import load_dotenv
 # Load environment variables from root .env
 load_dotenv()
 
-# Scraping method selection: "firecrawl" or "playwright"
+# Scraping method selection: "firecrawl", "playwright" or "tiered"
+# ("tiered" tries plain HTTP, then Playwright, then Firecrawl basic/stealth per page)
 SCRAPING_METHOD: str = os.getenv("SCRAPING_METHOD", "firecrawl").strip().lower()
 
 # DABAG settings
@@ -24,9 +25,48 @@ LANGUAGES: dict[str, int] = {
     "it": 3,
 }
 
+# Resolve product pages by building the detail URL from the SUPPLIER_PID and
+# verifying it with a plain GET before falling back to the search page
+DABAG_DIRECT_URL_FASTPATH: bool = os.getenv("DABAG_DIRECT_URL_FASTPATH", "true").strip().lower() in {"1", "true", "yes"}
+
+# Plain HTTP fetches of DABAG product pages (timeout in seconds)
+DABAG_HTTP_TIMEOUT: float = float(os.getenv("DABAG_HTTP_TIMEOUT", "30"))
+DABAG_HTTP_MAX_RETRIES: int = int(os.getenv("DABAG_HTTP_MAX_RETRIES", "2"))
+DABAG_HTTP_BACKOFF: float = float(os.getenv("DABAG_HTTP_BACKOFF", "1.0"))
+
+# Hedged requests: duplicate a page fetch once it exceeds the host's p95
+# latency, capped at DABAG_HEDGE_BUDGET (fraction of all requests)
+DABAG_HEDGING: bool = os.getenv("DABAG_HEDGING", "false").strip().lower() in {"1", "true", "yes"}
+DABAG_HEDGE_BUDGET: float = float(os.getenv("DABAG_HEDGE_BUDGET", "0.05"))
+DABAG_HEDGE_MIN_SAMPLES: int = int(os.getenv("DABAG_HEDGE_MIN_SAMPLES", "20"))
+
+# Firecrawl credit budget for unattended runs: blocked requests escalate
+# auto -> basic -> stealth without prompting while credits remain. Only
+# escalation spend (stealth requests, retries after a block, the tiered
+# backend's Firecrawl tiers) counts against it
+FIRECRAWL_CREDIT_BUDGET: float = float(os.getenv("FIRECRAWL_CREDIT_BUDGET", "100"))
+
 # Output directory for saved JSON
 OUTPUT_DIR: str = os.getenv("BME_OUTPUT_DIR", "outputs/")
 
+# Tiered backend (SCRAPING_METHOD="tiered"): tiers in escalation order, and
+# per-domain tier success rates remembered across runs
+TIERED_TIERS: list[str] = [
+    t.strip() for t in os.getenv("TIERED_TIERS", "http,playwright,firecrawl_basic,firecrawl_stealth").split(",")
+    if t.strip()
+]
+TIERED_STATS_PATH: str = os.getenv("TIERED_STATS_PATH", os.path.join(OUTPUT_DIR, "tier_stats.json"))
+TIERED_MIN_SAMPLES: int = int(os.getenv("TIERED_MIN_SAMPLES", "3"))
+TIERED_SUCCESS_THRESHOLD: float = float(os.getenv("TIERED_SUCCESS_THRESHOLD", "0.5"))
+
+# Sitemap discovery: index the URLs listed in DABAG's sitemaps (robots.txt
+# `Sitemap:` entries, nested indexes, .xml.gz) and resolve product detail URLs
+# from that index before verifying or rendering anything. The index is
+# rebuilt when older than DABAG_SITEMAP_MAX_AGE_HOURS
+DABAG_SITEMAP_DISCOVERY: bool = os.getenv("DABAG_SITEMAP_DISCOVERY", "false").strip().lower() in {"1", "true", "yes"}
+DABAG_SITEMAP_DB: str = os.getenv("DABAG_SITEMAP_DB", os.path.join(OUTPUT_DIR, "sitemap_index.sqlite"))
+DABAG_SITEMAP_MAX_AGE_HOURS: float = float(os.getenv("DABAG_SITEMAP_MAX_AGE_HOURS", "24"))
+
 # Comparison tables output directory and master filename
 # Default COMPARISON_TABLES_DIR nests under OUTPUT_DIR
 COMPARISON_TABLES_DIR: str = os.getenv(
@@ -43,10 +83,35 @@ MASTER_COMPARISON_FILENAME: str = os.getenv(
     "master_comparison_catalog.json"
 )
 
+# Comparison auto-scrape: only scrape products whose feature coverage across
+# Original XML, DABAG XML and master JSON is below this fraction (0.0-1.0)
+SCRAPE_COVERAGE_THRESHOLD: float = float(os.getenv("SCRAPE_COVERAGE_THRESHOLD", "0.8"))
+
 # Master JSON settings
 MASTER_JSON_FILENAME: str = os.getenv("MASTER_JSON_FILENAME", "master_bmecat_dabag.json")
 MASTER_JSON_BACKUP_COUNT: int = int(os.getenv("MASTER_JSON_BACKUP_COUNT", "2"))
 
+# Journal mode (JSON backend): save() appends changed products to
+# <master>.journal.jsonl instead of rewriting the master JSON, which is rebuilt
+# in the background after MASTER_JSON_COMPACT_AFTER records (also checked at
+# exit). Until then the master JSON lags the journal: readers other than
+# MasterJSONManager.load(), which replays it, see the last compacted state
+MASTER_JSON_JOURNAL: bool = os.getenv("MASTER_JSON_JOURNAL", "false").strip().lower() in {"1", "true", "yes"}
+MASTER_JSON_COMPACT_AFTER: int = int(os.getenv("MASTER_JSON_COMPACT_AFTER", "500"))
+
+# Product store backend: "json" (master JSON file) or "sqlite" (one row per
+# product and language in MASTER_SQLITE_FILENAME; a new database imports the
+# existing master JSON)
+MASTER_STORE_BACKEND: str = os.getenv("MASTER_STORE_BACKEND", "json").strip().lower()
+MASTER_SQLITE_FILENAME: str = os.getenv("MASTER_SQLITE_FILENAME", "master_bmecat_dabag.sqlite")
+
+# Partial refresh: for products already in the master JSON, re-fetch only
+# missing/empty languages (and languages older than LANGUAGE_STALE_AFTER_DAYS)
+# from the stored product URL instead of prompting for a full re-scrape
+PARTIAL_REFRESH: bool = os.getenv("PARTIAL_REFRESH", "false").strip().lower() in {"1", "true", "yes"}
+_stale_days = os.getenv("LANGUAGE_STALE_AFTER_DAYS", "").strip()
+LANGUAGE_STALE_AFTER_DAYS: float | None = float(_stale_days) if _stale_days else None
+
 # Grok AI Configuration for XML Specs Extraction
 GROK_API_KEY: str | None = os.getenv("GROK_API_KEY")
 GROK_MODEL: str = os.getenv("GROK_MODEL", "grok-4-fast-reasoning")
@@ -77,11 +142,14 @@ UDX_FIELD_MAPPING: dict[str, str] = {
 FIRECRAWL_API_KEY: str | None = os.getenv("FIRECRAWL_API_KEY")
 
 # Validation
-if SCRAPING_METHOD not in {"firecrawl", "playwright"}:
+if SCRAPING_METHOD not in {"firecrawl", "playwright", "tiered"}:
     raise ValueError(
-        "SCRAPING_METHOD must be either 'firecrawl' or 'playwright'"
+        "SCRAPING_METHOD must be one of 'firecrawl', 'playwright' or 'tiered'"
     )
 
+if MASTER_STORE_BACKEND not in {"json", "sqlite"}:
+    raise ValueError("MASTER_STORE_BACKEND must be 'json' or 'sqlite'")
+
 if SCRAPING_METHOD == "firecrawl" and not FIRECRAWL_API_KEY:
     raise ValueError("FIRECRAWL_API_KEY not found in environment variables for firecrawl mode")
 
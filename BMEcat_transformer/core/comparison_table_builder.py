@@ -16,7 +16,8 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from core.xml_readers import OriginalXMLReader, DABAGXMLReader  # type: ignore
-from core.master_json_manager import MasterJSONManager  # type: ignore
+from core.master_json_manager import create_master_store  # type: ignore
+from core.scrape_planner import ScrapePlanner  # type: ignore
 import config  # type: ignore
 
 # Scraper import
@@ -37,15 +38,20 @@ class ComparisonTableBuilder:
         original_xml_path: str,
         dabag_xml_path: str,
         master_json_path: str | None = None,
+        coverage_threshold: float | None = None,
     ) -> None:
         self.logger = setup_logger(__name__)
         self.original_xml_path = original_xml_path
         self.dabag_xml_path = dabag_xml_path
-        # Master JSON manager uses OUTPUT_DIR and filename from config
-        self.master_manager = MasterJSONManager(
-            master_filename=config.MASTER_JSON_FILENAME,
+        # Master product store (JSON file or SQLite) uses OUTPUT_DIR and filenames from config
+        self.master_manager = create_master_store(
+            backend=config.MASTER_STORE_BACKEND,
             output_dir=config.OUTPUT_DIR,
+            json_filename=config.MASTER_JSON_FILENAME,
+            sqlite_filename=config.MASTER_SQLITE_FILENAME,
             backup_count=config.MASTER_JSON_BACKUP_COUNT,
+            journal=config.MASTER_JSON_JOURNAL,
+            compact_after=config.MASTER_JSON_COMPACT_AFTER,
         )
         # Load or initialize master JSON
         self.master_manager.load()
@@ -53,6 +59,11 @@ class ComparisonTableBuilder:
         self.original_reader = OriginalXMLReader(original_xml_path)
         self.dabag_reader = DABAGXMLReader(dabag_xml_path)
         self.scraper = DABAGScraper()
+        self.planner = ScrapePlanner(
+            threshold=config.SCRAPE_COVERAGE_THRESHOLD if coverage_threshold is None else coverage_threshold,
+            languages=list(config.LANGUAGES.keys()),
+            stale_after_days=config.LANGUAGE_STALE_AFTER_DAYS,
+        )
 
     def _read_scraped_text(self, supplier_pid: str) -> Dict[str, str]:
         """Read scraped text file for a product if it exists.
@@ -183,7 +194,7 @@ class ComparisonTableBuilder:
             self.logger.info("Grok API key not configured — skipping XML specs extraction")
 
         # Prepare web data from master JSON
-        web_products = self.master_manager.data.get("products", {})
+        web_products = self.master_manager.get_products()
         self.logger.info(f"Master JSON: loaded {len(web_products)} products")
         web_ids: Set[str] = set(web_products.keys())
 
@@ -192,9 +203,25 @@ class ComparisonTableBuilder:
         missing_ids = self._check_missing_ids(original_ids, list(web_ids))
         self.logger.info(f"Missing IDs to scrape: {len(missing_ids)}")
 
-        if auto_scrape and missing_ids:
-            for pid in missing_ids:
-                scraped = self.scraper.process_product(pid)
+        if auto_scrape:
+            # Scrape only where the web adds information beyond the XML sources
+            plan = self.planner.plan(original_features, dabag_features, web_products)
+            self.planner.print_plan(plan)
+            todo = [p for p in plan if p["action"] != "skip"]
+            # Resolve URLs of products to scrape together (one search batch)
+            to_scrape = [p["supplier_pid"] for p in todo if p["action"] == "scrape"]
+            resolved_urls = self.scraper.resolve_product_urls(to_scrape) if len(to_scrape) > 1 else {}
+            for item in todo:
+                pid = item["supplier_pid"]
+                if item["action"] == "refresh":
+                    _, existing = self.master_manager.check_id_exists(pid)
+                    partial = self.scraper.refresh_product(pid, existing or {}, languages=item["languages"])
+                    self.master_manager.merge_product_languages(pid, partial)
+                    continue
+                if pid in resolved_urls:
+                    scraped = self.scraper.scrape_resolved_product(pid, resolved_urls[pid])
+                else:
+                    scraped = self.scraper.process_product(pid)
                 if scraped:
                     exists, _ = self.master_manager.check_id_exists(pid)
                     if exists:
@@ -202,8 +229,10 @@ class ComparisonTableBuilder:
                     else:
                         self.master_manager.append_product(pid, scraped)
             # Persist updates
-            self.master_manager.save()
-            web_products = self.master_manager.data.get("products", {})
+            if todo:
+                self.master_manager.save()
+                web_products = self.master_manager.get_products()
+                self.scraper.print_spend_report()
 
         # Merge per supplier and per language
         merged: Dict[str, Dict[str, Any]] = {}
@@ -3,33 +3,102 @@
 Manages a persistent master JSON file that tracks all scraped products.
 Provides functionality to check existence, append new entries, update existing ones,
 and maintain backup versions.
+
+In journal mode, `save()` only appends the changed products to a JSONL log
+next to the snapshot; the snapshot is rebuilt from memory (compaction) in the
+background once the log grows, and at exit. `load()` reads the snapshot and
+replays the log.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import shutil
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def merge_languages(
+    existing: Dict[str, Any], product_data: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Merge re-fetched languages into a stored product entry.
+
+    Shared by `MasterJSONManager` and `SQLiteProductStore`, which only differ
+    in how the merged entry is written back.
+
+    Args:
+        existing: The stored product entry (not modified).
+        product_data: Partial data from `DABAGScraper.refresh_product`.
+
+    Returns:
+        Tuple of (merged entry, refreshed languages). The entry is None when
+        nothing changed and there is nothing to write.
+    """
+    merged = existing.copy()
+    languages = dict(merged.get("languages") or {})
+    timestamps = dict(merged.get("language_scraped_at") or {})
+    refreshed = []
+    for lang, specs in (product_data.get("languages") or {}).items():
+        if specs:
+            languages[lang] = specs
+            refreshed.append(lang)
+    timestamps.update(product_data.get("language_scraped_at") or {})
+
+    merged["languages"] = languages
+    merged["language_scraped_at"] = timestamps
+    if product_data.get("product_url"):
+        merged["product_url"] = product_data["product_url"]
+    content_changed = (
+        languages != (existing.get("languages") or {})
+        or merged.get("product_url") != existing.get("product_url")
+    )
+    if not content_changed and timestamps == (existing.get("language_scraped_at") or {}):
+        return None, refreshed
+    # updated_at tracks content; new scrape timestamps alone don't bump it
+    if content_changed:
+        merged["updated_at"] = datetime.now().isoformat()
+    return merged, refreshed
 
 
 class MasterJSONManager:
     """Manage the master JSON file for scraped product data."""
 
-    def __init__(self, master_filename: str, output_dir: str, backup_count: int = 2) -> None:
+    def __init__(
+        self,
+        master_filename: str,
+        output_dir: str,
+        backup_count: int = 2,
+        journal: bool = False,
+        compact_after: int = 500,
+    ) -> None:
         """Initialize the master JSON manager.
 
         Args:
             master_filename: Name of the master JSON file.
             output_dir: Directory where master JSON is stored.
             backup_count: Number of backup versions to keep.
+            journal: Save by appending changed products to a JSONL log
+                instead of rewriting the master JSON.
+            compact_after: Logged records that trigger a background compaction.
         """
         self.master_filename = master_filename
         self.output_dir = output_dir
         self.backup_count = backup_count
         self.master_path = os.path.join(output_dir, master_filename)
+        self.journal_path = self.master_path + JOURNAL_SUFFIX
+        self.journal = journal
+        self.compact_after = max(1, compact_after)
         self.data: Dict[str, Any] = {"metadata": {}, "products": {}}
+        self._dirty: Dict[str, None] = {}  # Products changed since the last save (ordered)
+        self._journal_records = 0
+        self._journal_lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+        self._exit_hook = False
         os.makedirs(output_dir, exist_ok=True)
 
     def load(self) -> None:
@@ -45,6 +114,31 @@ class MasterJSONManager:
         else:
             print(f"✓ Master JSON not found. Starting fresh: {self.master_path}")
             self._initialize_fresh()
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        """Apply product upserts logged since the last compaction."""
+        self._journal_records = 0
+        if not os.path.exists(self.journal_path):
+            return
+        products = self.data.setdefault("products", {})
+        metadata = self.data.setdefault("metadata", {})
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        products[record["pid"]] = record["product"]
+                        metadata["last_updated"] = record.get("at", metadata.get("last_updated"))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # skip a torn last line
+                    self._journal_records += 1
+        except OSError as e:
+            print(f"⚠️  Warning: Failed to read master JSON journal ({e}).")
+            return
+        metadata["total_products"] = len(products)
+        if self._journal_records:
+            print(f"✓ Replayed {self._journal_records} journal record(s) from: {self.journal_path}")
 
     def _initialize_fresh(self) -> None:
         """Initialize a fresh master JSON structure."""
@@ -82,6 +176,7 @@ class MasterJSONManager:
         self.data["products"][supplier_pid] = enriched_data
         self.data["metadata"]["total_products"] = len(self.data["products"])
         self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+        self._dirty[supplier_pid] = None
         print(f"✓ Appended {supplier_pid} to master JSON")
 
     def update_product(self, supplier_pid: str, product_data: Dict[str, Any]) -> None:
@@ -96,18 +191,183 @@ class MasterJSONManager:
         enriched_data["updated_at"] = datetime.now().isoformat()
         self.data["products"][supplier_pid] = enriched_data
         self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+        self._dirty[supplier_pid] = None
         print(f"✓ Updated {supplier_pid} in master JSON")
 
+    def merge_product_languages(self, supplier_pid: str, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge re-fetched languages into an existing product entry.
+
+        Only languages that came back with specs overwrite stored ones, so a
+        failed re-fetch never erases data. `updated_at` only moves when the
+        languages or the product URL actually changed, and an entry with
+        nothing new is left untouched (not saved again). Falls back to
+        append when the product is not in the master JSON yet.
+
+        Args:
+            supplier_pid: The product ID.
+            product_data: Partial data from `DABAGScraper.refresh_product`.
+
+        Returns:
+            The merged product entry.
+        """
+        exists, existing = self.check_id_exists(supplier_pid)
+        if not exists or existing is None:
+            self.append_product(supplier_pid, product_data)
+            return self.data["products"][supplier_pid]
+
+        merged, refreshed = merge_languages(existing, product_data)
+        if merged is None:
+            print(f"✓ {supplier_pid} unchanged (nothing refreshed)")
+            return existing
+        self.data["products"][supplier_pid] = merged
+        self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+        self._dirty[supplier_pid] = None
+        langs = ", ".join(l.upper() for l in refreshed) or "none"
+        print(f"✓ Merged {supplier_pid} in master JSON (refreshed: {langs})")
+        return merged
+
     def save(self) -> None:
-        """Save the master JSON with backup rotation."""
+        """Save the master JSON with backup rotation.
+
+        In journal mode only products changed since the last save are
+        appended to the journal; a compaction starts in the background once
+        the journal holds `compact_after` records.
+        """
+        if self.journal:
+            self._append_journal()
+            if self._journal_records >= self.compact_after:
+                self.compact(background=True)
+            return
+
+        self.wait_for_compaction()
         self._rotate_backups()
         try:
             with open(self.master_path, "w", encoding="utf-8") as f:
                 json.dump(self.data, f, ensure_ascii=False, indent=2)
+            self._dirty.clear()
+            # The snapshot now includes everything a leftover journal held
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+                self._journal_records = 0
             print(f"✓ Saved master JSON to: {self.master_path}")
         except IOError as e:
             print(f"❌ Error saving master JSON: {e}")
 
+    def _append_journal(self) -> None:
+        """Append changed products to the journal and fsync it."""
+        with self._journal_lock:
+            if not self._dirty:
+                return
+            products = self.data["products"]
+            at = self.data["metadata"].get("last_updated") or datetime.now().isoformat()
+            lines = [
+                json.dumps({"pid": pid, "product": products[pid], "at": at}, ensure_ascii=False) + "\n"
+                for pid in self._dirty if pid in products
+            ]
+            try:
+                with open(self.journal_path, "a+", encoding="utf-8") as f:
+                    # A crash may have left a torn line without its newline
+                    if f.tell() > 0:
+                        f.seek(f.tell() - 1)
+                        if f.read(1) != "\n":
+                            f.write("\n")
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"❌ Error appending to master JSON journal: {e}")
+                return
+            self._dirty.clear()
+            self._journal_records += len(lines)
+        if not self._exit_hook:
+            # Fold the journal into the snapshot when the process ends
+            atexit.register(self.close)
+            self._exit_hook = True
+        print(f"✓ Journaled {len(lines)} product(s) to: {self.journal_path}")
+
+    def compact(self, background: bool = False) -> None:
+        """Rewrite the snapshot from memory and drop the journal records it covers.
+
+        Args:
+            background: Write the snapshot on a separate thread.
+        """
+        self._append_journal()
+        with self._journal_lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            if not os.path.exists(self.journal_path):
+                return
+            # Stored products are replaced, never mutated, so a shallow copy
+            # is a consistent snapshot even while the run continues
+            snapshot = {"metadata": dict(self.data["metadata"]), "products": dict(self.data["products"])}
+            snapshot["metadata"]["total_products"] = len(snapshot["products"])
+            offset = os.path.getsize(self.journal_path)
+            records = self._journal_records
+            if background:
+                # Not a daemon: an in-flight compaction finishes before exit
+                self._compaction = threading.Thread(
+                    target=self._write_snapshot, args=(snapshot, offset, records), name="master-json-compaction"
+                )
+                self._compaction.start()
+                return
+        self._write_snapshot(snapshot, offset, records)
+
+    def _write_snapshot(self, snapshot: Dict[str, Any], offset: int, records: int) -> None:
+        """Atomically replace the master JSON, then trim the compacted journal prefix."""
+        tmp_path = f"{self.master_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            self._rotate_backups()
+            os.replace(tmp_path, self.master_path)
+        except OSError as e:
+            print(f"❌ Error compacting master JSON: {e}")
+            return
+
+        with self._journal_lock:
+            try:
+                # Records appended during the compaction are kept
+                with open(self.journal_path, "rb") as f:
+                    f.seek(offset)
+                    rest = f.read()
+                if rest:
+                    with open(f"{self.journal_path}.tmp", "wb") as f:
+                        f.write(rest)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(f"{self.journal_path}.tmp", self.journal_path)
+                else:
+                    os.remove(self.journal_path)
+                self._journal_records = max(0, self._journal_records - records)
+            except OSError as e:
+                # Harmless: replaying covered records over the snapshot is idempotent
+                print(f"⚠️  Warning: Could not trim master JSON journal ({e}).")
+        print(f"✓ Compacted {records} journal record(s) into: {self.master_path}")
+
+    def wait_for_compaction(self) -> None:
+        """Block until a background compaction has finished."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+    def close(self) -> None:
+        """Persist pending changes and fold a due journal into the snapshot.
+
+        In journal mode the snapshot is only rewritten once the journal holds
+        `compact_after` records; shorter journals are replayed on the next
+        `load()` instead, so small runs never pay for a full rewrite.
+        """
+        if not self.journal and not os.path.exists(self.journal_path):
+            return
+        self.wait_for_compaction()
+        if self.journal:
+            self._append_journal()
+            if self._journal_records < self.compact_after:
+                return
+        self.compact()
+
     def _rotate_backups(self) -> None:
         """Rotate backup files, keeping only the specified number of backups."""
         if not os.path.exists(self.master_path):
@@ -128,6 +388,14 @@ class MasterJSONManager:
         backup_path = f"{self.master_path}.backup1"
         shutil.copy2(self.master_path, backup_path)
 
+    def iter_products(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (SUPPLIER_PID, product) pairs."""
+        yield from self.data.get("products", {}).items()
+
+    def get_products(self) -> Dict[str, Dict[str, Any]]:
+        """Return all products keyed by SUPPLIER_PID."""
+        return self.data.get("products", {})
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the master JSON.
 
@@ -139,3 +407,32 @@ class MasterJSONManager:
             "created_at": self.data.get("metadata", {}).get("created_at", "N/A"),
             "last_updated": self.data.get("metadata", {}).get("last_updated", "N/A"),
         }
+
+
+def create_master_store(
+    backend: str,
+    output_dir: str,
+    json_filename: str,
+    sqlite_filename: str,
+    backup_count: int = 2,
+    journal: bool = False,
+    compact_after: int = 500,
+):
+    """Create the product store for a backend.
+
+    Args:
+        backend: "json" (`MasterJSONManager`) or "sqlite" (`SQLiteProductStore`).
+        output_dir: Directory holding the store.
+        json_filename: Master JSON filename (imported into a new SQLite store).
+        sqlite_filename: SQLite database filename.
+        backup_count: Number of backup versions to keep.
+        journal: Journal mode for the JSON backend.
+        compact_after: Journal records that trigger a compaction.
+
+    Returns:
+        A store with the `MasterJSONManager` API (not loaded yet).
+    """
+    if backend == "sqlite":
+        from core.sqlite_product_store import SQLiteProductStore  # type: ignore
+        return SQLiteProductStore(sqlite_filename, output_dir, backup_count, json_filename=json_filename)
+    return MasterJSONManager(json_filename, output_dir, backup_count, journal=journal, compact_after=compact_after)
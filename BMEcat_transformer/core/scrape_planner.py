@@ -0,0 +1,194 @@
+"""Coverage-based scrape planner.
+
+Decides which products are worth web scraping by measuring how much feature
+data is already available per language from the Original XML, the DABAG XML
+and the master JSON. Only products whose coverage falls below a threshold are
+scheduled, and products that already have a stored product URL are only
+refreshed for lacking languages whose web data is missing, empty or stale
+(re-scraping a language the web already answered cannot raise its coverage).
+Products already in the master JSON without a product URL (search found
+nothing) are not retried.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from tabulate import tabulate  # type: ignore
+from utils.logger import setup_logger
+
+
+def languages_needing_refresh(
+    entry: Dict[str, Any],
+    languages: List[str],
+    max_age_days: Optional[float] = None,
+) -> List[str]:
+    """Return languages of a master entry that are missing, empty or stale.
+
+    Staleness uses the per-language `language_scraped_at` timestamp, falling
+    back to the entry's `updated_at`/`scraped_at`; an unreadable timestamp
+    counts as stale.
+
+    Args:
+        entry: Product entry from the master JSON.
+        languages: Language codes to check, in order.
+        max_age_days: Languages older than this are stale. None disables
+            the staleness check.
+
+    Returns:
+        Language codes to re-fetch, in the order given.
+    """
+    stored = entry.get("languages") or {}
+    timestamps = entry.get("language_scraped_at") or {}
+    fallback_ts = entry.get("updated_at") or entry.get("scraped_at")
+    cutoff = datetime.now() - timedelta(days=max_age_days) if max_age_days is not None else None
+
+    refresh: List[str] = []
+    for lang in languages:
+        if not stored.get(lang):
+            refresh.append(lang)
+            continue
+        if cutoff is None:
+            continue
+        try:
+            scraped_at = datetime.fromisoformat(timestamps.get(lang) or fallback_ts or "")
+        except ValueError:
+            scraped_at = None
+        if scraped_at is None or scraped_at < cutoff:
+            refresh.append(lang)
+    return refresh
+
+
+class ScrapePlanner:
+    """Plan web scraping from per-product, per-language feature coverage."""
+
+    def __init__(
+        self,
+        threshold: float,
+        languages: List[str],
+        search_requests: int = 1,
+        stale_after_days: Optional[float] = None,
+    ) -> None:
+        """Initialize the planner.
+
+        Args:
+            threshold: Minimum coverage (0.0-1.0) a product needs to be skipped.
+            languages: Language codes to plan for (e.g. ["de", "fr", "it"]).
+            search_requests: Requests needed to resolve a product URL.
+            stale_after_days: Web data older than this may be refreshed even
+                when present. None: only missing or empty languages are.
+        """
+        self.threshold = threshold
+        self.languages = languages
+        self.search_requests = search_requests
+        self.stale_after_days = stale_after_days
+        self.logger = setup_logger(__name__)
+
+    def language_coverage(
+        self,
+        original_list: List[Dict[str, Any]],
+        dabag_langs: Dict[str, List[Dict[str, Any]]],
+        web_entry: Dict[str, Any],
+    ) -> Dict[str, float]:
+        """Compute coverage per language for one product.
+
+        The reference feature count is the largest count seen in any source.
+        A language is covered by the best of DABAG XML and web data for that
+        language; Original XML features (German FDESCR) also count for "de".
+
+        Returns:
+            Mapping of language code to coverage in [0.0, 1.0].
+        """
+        web_langs: Dict[str, Dict[str, str]] = web_entry.get("languages") or {}
+        counts = {
+            lang: max(len(dabag_langs.get(lang) or []), len(web_langs.get(lang) or {}))
+            for lang in self.languages
+        }
+        if "de" in counts:
+            counts["de"] = max(counts["de"], len(original_list))
+
+        reference = max([len(original_list), *counts.values()])
+        if reference == 0:
+            return {lang: 0.0 for lang in self.languages}
+        return {lang: min(1.0, count / reference) for lang, count in counts.items()}
+
+    def refreshable_languages(self, web_entry: Dict[str, Any]) -> List[str]:
+        """Languages whose web data is missing, empty or stale.
+
+        See `languages_needing_refresh`; stale after `stale_after_days`.
+        """
+        return languages_needing_refresh(web_entry, self.languages, self.stale_after_days)
+
+    def plan(
+        self,
+        original_features: Dict[str, List[Dict[str, Any]]],
+        dabag_features: Dict[str, Dict[str, List[Dict[str, Any]]]],
+        web_products: Dict[str, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Build the scrape plan for all products in the Original XML.
+
+        Returns:
+            One entry per product: {"supplier_pid", "coverage",
+            "language_coverage", "action" ("skip" | "refresh" | "scrape"),
+            "languages", "estimated_requests", "in_master"}.
+        """
+        plan: List[Dict[str, Any]] = []
+        for pid, orig_list in original_features.items():
+            web_entry = web_products.get(pid) or {}
+            lang_cov = self.language_coverage(orig_list, dabag_features.get(pid, {}), web_entry)
+            coverage = sum(lang_cov.values()) / len(lang_cov) if lang_cov else 0.0
+
+            if coverage >= self.threshold or (web_entry and not web_entry.get("product_url")):
+                action, languages, requests = "skip", [], 0
+            elif web_entry.get("product_url"):
+                refreshable = self.refreshable_languages(web_entry)
+                languages = [lang for lang in refreshable if lang_cov[lang] < self.threshold]
+                action, requests = ("refresh", len(languages)) if languages else ("skip", 0)
+            else:
+                languages = [lang for lang in self.languages if lang_cov[lang] < self.threshold]
+                action, requests = "scrape", self.search_requests + len(self.languages)
+
+            plan.append({
+                "supplier_pid": pid,
+                "coverage": coverage,
+                "language_coverage": lang_cov,
+                "action": action,
+                "languages": languages,
+                "estimated_requests": requests,
+                "in_master": pid in web_products,
+            })
+        return plan
+
+    def print_plan(self, plan: List[Dict[str, Any]]) -> None:
+        """Print the planned scrapes and estimated request counts."""
+        todo = [p for p in plan if p["action"] != "skip"]
+        print("\n" + "=" * 80)
+        print(f"Scrape Plan (coverage threshold: {self.threshold:.0%})")
+        print("-" * 80)
+        if todo:
+            rows = [
+                [
+                    p["supplier_pid"],
+                    f"{p['coverage']:.0%}",
+                    " ".join(f"{lang}:{cov:.0%}" for lang, cov in p["language_coverage"].items()),
+                    p["action"],
+                    ",".join(p["languages"]),
+                    p["estimated_requests"],
+                ]
+                for p in todo
+            ]
+            print(tabulate(rows, headers=["SUPPLIER_PID", "Coverage", "Per language", "Action", "Languages", "Requests"]))
+        else:
+            print("All products meet the coverage threshold; nothing to scrape.")
+
+        per_product = self.search_requests + len(self.languages)
+        naive = sum(per_product for p in plan if not p["in_master"])
+        planned = sum(p["estimated_requests"] for p in plan)
+        print("-" * 80)
+        print(f"Products: {len(plan)} | skip: {len(plan) - len(todo)} | "
+              f"refresh: {sum(1 for p in todo if p['action'] == 'refresh')} | "
+              f"scrape: {sum(1 for p in todo if p['action'] == 'scrape')}")
+        print(f"Estimated requests: {planned} (scraping all missing IDs: {naive})")
+        print("=" * 80)
+        self.logger.info(f"Scrape plan: {len(todo)}/{len(plan)} products, ~{planned} requests")
@@ -0,0 +1,356 @@
+"""SQLite product store for BMEcat_transformer.
+
+Drop-in alternative to `MasterJSONManager` for large catalogs. Products live
+in a SQLite database (WAL mode) with one row per product and one row per
+product language, so checking, appending or merging a product touches only
+that product's rows instead of loading and rewriting the whole master JSON.
+The master JSON layout stays available through `import_json` / `export_json`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from core.master_json_manager import JOURNAL_SUFFIX, merge_languages  # type: ignore
+
+# Routine backups taken on load at most this often; bulk imports always back up
+BACKUP_INTERVAL_HOURS = 24
+
+
+class SQLiteProductStore:
+    """Store scraped products in SQLite behind the `MasterJSONManager` API."""
+
+    def __init__(
+        self,
+        db_filename: str,
+        output_dir: str,
+        backup_count: int = 2,
+        json_filename: Optional[str] = None,
+    ) -> None:
+        """Initialize the store (the database is opened by `load`).
+
+        Args:
+            db_filename: Name of the SQLite database file.
+            output_dir: Directory where the database is stored.
+            backup_count: Number of backup versions to keep.
+            json_filename: Master JSON imported when the database is new.
+        """
+        self.db_filename = db_filename
+        self.output_dir = output_dir
+        self.backup_count = backup_count
+        self.db_path = os.path.join(output_dir, db_filename)
+        self.json_path = os.path.join(output_dir, json_filename) if json_filename else None
+        self.conn: Optional[sqlite3.Connection] = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    # ---- Lifecycle --------------------------------------------------------
+
+    def load(self) -> None:
+        """Open the database, creating it (or importing the master JSON) if new."""
+        if self.conn is not None:
+            return
+        is_new = not os.path.exists(self.db_path)
+        if not is_new and self._backup_due():
+            # Copying a large database on every run would dominate short runs
+            self._rotate_backups()
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                supplier_pid TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS product_languages (
+                supplier_pid TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                specs TEXT NOT NULL,
+                PRIMARY KEY (supplier_pid, lang)
+            );
+            """
+        )
+        if is_new:
+            now = datetime.now().isoformat()
+            self._set_metadata(created_at=now, last_updated=now)
+            self.conn.commit()
+            if self.json_path and os.path.exists(self.json_path):
+                count = self.import_json(self.json_path)
+                print(f"✓ Imported {count} products from {self.json_path}")
+            print(f"✓ Created product store: {self.db_path}")
+        else:
+            print(f"✓ Opened product store: {self.db_path}")
+
+    def _db(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.load()
+        return self.conn  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Close the database."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def save(self) -> None:
+        """Commit pending changes (every upsert is already committed)."""
+        try:
+            self._db().commit()
+            print(f"✓ Saved product store: {self.db_path}")
+        except sqlite3.Error as e:
+            print(f"❌ Error saving product store: {e}")
+
+    def _backup_due(self) -> bool:
+        """Whether the newest backup is older than `BACKUP_INTERVAL_HOURS` (or missing)."""
+        newest = f"{self.db_path}.backup1"
+        if self.backup_count < 1:
+            return False
+        if not os.path.exists(newest):
+            return True
+        return time.time() - os.path.getmtime(newest) >= BACKUP_INTERVAL_HOURS * 3600
+
+    def _rotate_backups(self) -> None:
+        """Rotate backup copies of the database, keeping `backup_count`."""
+        if self.backup_count < 1:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            old_backup = f"{self.db_path}.backup{i}"
+            if os.path.exists(old_backup):
+                shutil.move(old_backup, f"{self.db_path}.backup{i+1}")
+        # The backup API gives a consistent copy even with WAL pages pending
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(f"{self.db_path}.backup1")
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+    # ---- Rows <-> product dicts ------------------------------------------
+
+    def _set_metadata(self, **values: Any) -> None:
+        self._db().executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, str(value)) for key, value in values.items()],
+        )
+
+    def _get_metadata(self, key: str) -> Optional[str]:
+        row = self._db().execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _write_product(self, supplier_pid: str, product: Dict[str, Any]) -> None:
+        """Replace a product's rows (not committed)."""
+        db = self._db()
+        base = {key: value for key, value in product.items() if key != "languages"}
+        db.execute(
+            "INSERT INTO products (supplier_pid, data) VALUES (?, ?) "
+            "ON CONFLICT(supplier_pid) DO UPDATE SET data = excluded.data",
+            (supplier_pid, json.dumps(base, ensure_ascii=False)),
+        )
+        db.execute("DELETE FROM product_languages WHERE supplier_pid = ?", (supplier_pid,))
+        db.executemany(
+            "INSERT INTO product_languages (supplier_pid, lang, specs) VALUES (?, ?, ?)",
+            [
+                (supplier_pid, lang, json.dumps(specs, ensure_ascii=False))
+                for lang, specs in (product.get("languages") or {}).items()
+            ],
+        )
+
+    def _read_product(self, supplier_pid: str, data: str) -> Dict[str, Any]:
+        product = json.loads(data)
+        product["languages"] = {
+            lang: json.loads(specs)
+            for lang, specs in self._db().execute(
+                "SELECT lang, specs FROM product_languages WHERE supplier_pid = ? ORDER BY rowid", (supplier_pid,)
+            )
+        }
+        return product
+
+    def _commit_product(self, supplier_pid: str, product: Dict[str, Any]) -> None:
+        """Write a product and touch `last_updated` in one transaction."""
+        with self._db():
+            self._write_product(supplier_pid, product)
+            self._set_metadata(last_updated=datetime.now().isoformat())
+
+    # ---- MasterJSONManager API -------------------------------------------
+
+    def check_id_exists(self, supplier_pid: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Check if a SUPPLIER_PID exists in the store.
+
+        Args:
+            supplier_pid: The product ID to check.
+
+        Returns:
+            Tuple of (exists: bool, existing_data: dict or None)
+        """
+        row = self._db().execute("SELECT data FROM products WHERE supplier_pid = ?", (supplier_pid,)).fetchone()
+        if row is None:
+            return False, None
+        return True, self._read_product(supplier_pid, row[0])
+
+    def append_product(self, supplier_pid: str, product_data: Dict[str, Any]) -> None:
+        """Append a new product to the store.
+
+        Args:
+            supplier_pid: The product ID.
+            product_data: The scraped product data.
+        """
+        enriched_data = product_data.copy()
+        enriched_data["scraped_at"] = datetime.now().isoformat()
+        self._commit_product(supplier_pid, enriched_data)
+        print(f"✓ Appended {supplier_pid} to product store")
+
+    def update_product(self, supplier_pid: str, product_data: Dict[str, Any]) -> None:
+        """Update an existing product in the store.
+
+        Args:
+            supplier_pid: The product ID.
+            product_data: The new scraped product data.
+        """
+        enriched_data = product_data.copy()
+        enriched_data["scraped_at"] = datetime.now().isoformat()
+        enriched_data["updated_at"] = datetime.now().isoformat()
+        self._commit_product(supplier_pid, enriched_data)
+        print(f"✓ Updated {supplier_pid} in product store")
+
+    def merge_product_languages(self, supplier_pid: str, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge re-fetched languages into an existing product entry.
+
+        Same rules as `MasterJSONManager.merge_product_languages` (both use
+        `merge_languages`); only the write to the database differs.
+
+        Args:
+            supplier_pid: The product ID.
+            product_data: Partial data from `DABAGScraper.refresh_product`.
+
+        Returns:
+            The merged product entry.
+        """
+        exists, existing = self.check_id_exists(supplier_pid)
+        if not exists or existing is None:
+            self.append_product(supplier_pid, product_data)
+            return self.check_id_exists(supplier_pid)[1] or {}
+
+        merged, refreshed = merge_languages(existing, product_data)
+        if merged is None:
+            print(f"✓ {supplier_pid} unchanged (nothing refreshed)")
+            return existing
+        self._commit_product(supplier_pid, merged)
+        langs = ", ".join(l.upper() for l in refreshed) or "none"
+        print(f"✓ Merged {supplier_pid} in product store (refreshed: {langs})")
+        return merged
+
+    def iter_products(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (SUPPLIER_PID, product) pairs without loading the whole catalog."""
+        db = self._db()
+        languages: Dict[str, Dict[str, Any]] = {}
+        lang_rows = db.execute(
+            "SELECT supplier_pid, lang, specs FROM product_languages ORDER BY supplier_pid, rowid"
+        )
+        pending = next(lang_rows, None)
+        # Both queries walk the primary key order, so languages are merged in one pass
+        for supplier_pid, data in db.execute("SELECT supplier_pid, data FROM products ORDER BY supplier_pid"):
+            languages = {}
+            while pending is not None and pending[0] <= supplier_pid:
+                if pending[0] == supplier_pid:
+                    languages[pending[1]] = json.loads(pending[2])
+                pending = next(lang_rows, None)
+            product = json.loads(data)
+            product["languages"] = languages
+            yield supplier_pid, product
+
+    def get_products(self) -> Dict[str, Dict[str, Any]]:
+        """Return all products keyed by SUPPLIER_PID."""
+        return dict(self.iter_products())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics about the store.
+
+        Returns:
+            Dictionary with statistics.
+        """
+        return {
+            "total_products": self._db().execute("SELECT COUNT(*) FROM products").fetchone()[0],
+            "created_at": self._get_metadata("created_at") or "N/A",
+            "last_updated": self._get_metadata("last_updated") or "N/A",
+        }
+
+    # ---- JSON compatibility ----------------------------------------------
+
+    def import_json(self, json_path: str) -> int:
+        """Import (upsert) every product of a master JSON file.
+
+        Existing products are overwritten, so a non-empty database is backed
+        up first.
+
+        Args:
+            json_path: Path to a file in the master JSON layout.
+
+        Returns:
+            Number of products imported.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        products = data.get("products", {})
+        metadata = data.get("metadata", {})
+        # Products logged by the JSON backend's journal mode since its last compaction
+        journal_path = json_path + JOURNAL_SUFFIX
+        if os.path.exists(journal_path):
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        products[record["pid"]] = record["product"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        db = self._db()
+        if db.execute("SELECT 1 FROM products LIMIT 1").fetchone() is not None:
+            # Bulk upserts overwrite existing products: keep a copy first
+            self._rotate_backups()
+        with db:
+            for supplier_pid, product in products.items():
+                self._write_product(supplier_pid, product)
+            if metadata.get("created_at"):
+                self._set_metadata(created_at=metadata["created_at"])
+            self._set_metadata(last_updated=metadata.get("last_updated") or datetime.now().isoformat())
+        return len(products)
+
+    def export_json(self, json_path: str) -> int:
+        """Write the store as a master JSON file (atomically).
+
+        Args:
+            json_path: Destination path.
+
+        Returns:
+            Number of products exported.
+        """
+        stats = self.get_statistics()
+        count = 0
+        tmp_path = f"{json_path}.tmp"
+        os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # Streamed product by product so the catalog is never held in memory
+            metadata = {
+                "created_at": stats["created_at"],
+                "last_updated": stats["last_updated"],
+                "total_products": stats["total_products"],
+            }
+            f.write('{\n  "metadata": ' + json.dumps(metadata, ensure_ascii=False) + ',\n  "products": {')
+            for supplier_pid, product in self.iter_products():
+                f.write(("," if count else "") + "\n    " + json.dumps(supplier_pid, ensure_ascii=False) + ": ")
+                f.write(json.dumps(product, ensure_ascii=False))
+                count += 1
+            f.write("\n  }\n}\n")
+        os.replace(tmp_path, json_path)
+        print(f"✓ Exported {count} products to: {json_path}")
+        return count
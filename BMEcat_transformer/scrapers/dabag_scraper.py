@@ -1,17 +1,20 @@
 """DABAG scraper for BMEcat_transformer.
 
-Selects scraping backend based on config (firecrawl or playwright) to locate
-product pages, then fetches product page HTML and extracts specification tables
-for multiple languages.
+Selects scraping backend based on config (firecrawl, playwright or tiered) to
+locate product pages, then fetches product page HTML and extracts
+specification tables for multiple languages.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import re
 import sys
+import threading
+import time
 from pathlib import Path
-from urllib.parse import urljoin
-import requests
+from urllib.parse import parse_qs, quote, urljoin, urlparse
 
 # Import config from project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -23,15 +26,37 @@ import config  # type: ignore
 PARENT_PROJECT = PROJECT_ROOT.parent
 sys.path.append(str(PARENT_PROJECT))
 
+StealthEscalationPolicy = None
 if config.SCRAPING_METHOD == "firecrawl":
     from easy_rich.src.web_scraper import WebScraper  # type: ignore
+    from easy_rich.src.stealth_escalation import StealthEscalationPolicy  # type: ignore
 elif config.SCRAPING_METHOD == "playwright":
     from manual_scrape.src.web_scraper import WebScraper  # type: ignore
+elif config.SCRAPING_METHOD == "tiered":
+    WebScraper = None  # built from scrapers.tiered_backend below
+    if config.FIRECRAWL_API_KEY:
+        from easy_rich.src.stealth_escalation import StealthEscalationPolicy  # type: ignore
 else:  # Defensive
     from easy_rich.src.web_scraper import WebScraper  # type: ignore
 
 # Local imports
 from scrapers.table_extractor import TableExtractor
+from scrapers.http_fetcher import HTTPFetcher
+from scrapers.tiered_backend import TieredScraper
+from scrapers.sitemap_discovery import SitemapDiscovery
+from core.scrape_planner import languages_needing_refresh  # type: ignore
+
+# Search pages are only parsed for links, so request the cheapest output
+SEARCH_SCRAPE_PROFILE = "links"
+
+# Seconds before a failed or empty sitemap discovery is retried
+SITEMAP_RETRY_SECONDS = 60
+
+
+def is_detail_link(href: str) -> bool:
+    """Whether a link points to a product detail page (`srv=search&pg=det`, any order)."""
+    query = parse_qs(urlparse(href).query)
+    return query.get("srv") == ["search"] and query.get("pg") == ["det"] and bool(query.get("q"))
 
 
 class DABAGScraper:
@@ -39,12 +64,183 @@ class DABAGScraper:
 
     def __init__(self) -> None:
         """Initialize scraper backend and table extractor."""
+        self.table_extractor = TableExtractor()
+        self.fetcher = HTTPFetcher(
+            timeout=config.DABAG_HTTP_TIMEOUT,
+            max_retries=config.DABAG_HTTP_MAX_RETRIES,
+            backoff=config.DABAG_HTTP_BACKOFF,
+            hedging=config.DABAG_HEDGING,
+            hedge_budget=config.DABAG_HEDGE_BUDGET,
+            hedge_min_samples=config.DABAG_HEDGE_MIN_SAMPLES,
+        )
+        # Unattended runs: escalate blocked Firecrawl requests within a credit
+        # budget instead of prompting for stealth
+        self.escalation_policy = (
+            StealthEscalationPolicy(credit_budget=config.FIRECRAWL_CREDIT_BUDGET)
+            if StealthEscalationPolicy is not None else None
+        )
         try:
-            self.scraper = WebScraper()
+            if config.SCRAPING_METHOD == "tiered":
+                # Search pages count as scraped only once a detail link is found
+                self.scraper = TieredScraper(
+                    fetcher=self.fetcher,
+                    tiers=config.TIERED_TIERS,
+                    stats_path=config.TIERED_STATS_PATH,
+                    target_check=self._has_detail_link,
+                    min_samples=config.TIERED_MIN_SAMPLES,
+                    success_threshold=config.TIERED_SUCCESS_THRESHOLD,
+                    escalation_policy=self.escalation_policy,
+                )
+            elif self.escalation_policy is not None:
+                self.scraper = WebScraper(escalation_policy=self.escalation_policy)
+            else:
+                self.scraper = WebScraper()
         except Exception as e:
             print(f"⚠️ Warning: Failed to initialize scraper backend: {e}")
             self.scraper = None
-        self.table_extractor = TableExtractor()
+        self.resolver_stats: Dict[str, int] = {
+            "sitemap_hits": 0, "sitemap_misses": 0, "direct_hits": 0, "direct_misses": 0,
+        }
+        self._stats_lock = threading.Lock()
+        self.sitemap: Optional[SitemapDiscovery] = None
+        if config.DABAG_SITEMAP_DISCOVERY:
+            try:
+                self.sitemap = SitemapDiscovery(config.DABAG_SITEMAP_DB, fetcher=self.fetcher)
+            except Exception as e:
+                print(f"⚠️ Warning: Sitemap discovery unavailable: {e}")
+        self._sitemap_checked = False
+        self._sitemap_retry_at = 0.0
+        self._sitemap_lock = threading.Lock()
+
+    def print_spend_report(self) -> None:
+        """Print Firecrawl credit spend and escalation counters, and Playwright request-blocking totals."""
+        if self.escalation_policy is not None:
+            self.escalation_policy.print_report()
+        if config.SCRAPING_METHOD in ("playwright", "tiered"):
+            from manual_scrape.src.request_blocking import get_blocking_report  # type: ignore
+            get_blocking_report().print_report()
+
+    @staticmethod
+    def _has_detail_link(result: Dict[str, Any]) -> bool:
+        """Whether a scraped search page contains a product detail link."""
+        hrefs = [link[1] if isinstance(link, (list, tuple)) else str(link) for link in result.get("links") or []]
+        hrefs.extend(re.findall(r"\]\(([^)\s]+)", result.get("markdown_content") or ""))
+        return any(is_detail_link(href) for href in hrefs)
+
+    def build_detail_url(self, SUPPLIER_PID: str) -> str:
+        """Build the candidate DABAG detail URL for a product directly."""
+        return f"{config.DABAG_BASE_URL}/?q={quote(SUPPLIER_PID, safe='')}&srv=search&pg=det"
+
+    def resolve_product_url(self, SUPPLIER_PID: str) -> Optional[str]:
+        """Resolve the product detail URL, trying the direct URL first.
+
+        The detail link follows a fixed `?q=<id>&srv=search&pg=det` pattern,
+        so the candidate is built from the SUPPLIER_PID and verified with a
+        plain GET (spec table present). Only when that check fails does this
+        fall back to rendering and parsing the search page.
+
+        With `DABAG_SITEMAP_DISCOVERY` the sitemap index is consulted first,
+        which needs no request per product at all.
+
+        Args:
+            SUPPLIER_PID: The product identifier.
+
+        Returns:
+            Full URL to the product detail page, or None if not found.
+        """
+        sitemap_url = self._sitemap_url(SUPPLIER_PID)
+        if sitemap_url:
+            return sitemap_url
+
+        if config.DABAG_DIRECT_URL_FASTPATH:
+            direct_url = self._verify_direct_url(SUPPLIER_PID)
+            if direct_url:
+                return direct_url
+
+        return self.search_product(SUPPLIER_PID)
+
+    def _verify_direct_url(self, SUPPLIER_PID: str) -> Optional[str]:
+        """Return the direct detail URL if a plain GET finds the spec table."""
+        candidate = self.build_detail_url(SUPPLIER_PID)
+        verified = False
+        try:
+            resp = self.fetcher.get(candidate)
+            verified = (
+                resp is not None
+                and resp.status_code < 400
+                and self.table_extractor.has_specs_table(resp.text)
+            )
+        except Exception as e:
+            print(f"⚠️ Warning: Direct URL check failed for {SUPPLIER_PID}: {e}")
+
+        with self._stats_lock:
+            self.resolver_stats["direct_hits" if verified else "direct_misses"] += 1
+        return candidate if verified else None
+
+    def _sitemap_url(self, SUPPLIER_PID: str) -> Optional[str]:
+        """Return the product's detail URL from the sitemap index, if listed there."""
+        if self.sitemap is None:
+            return None
+        with self._sitemap_lock:
+            # (Re)build the index once per scraper when stale; a failed or
+            # empty discovery is retried after SITEMAP_RETRY_SECONDS
+            if not self._sitemap_checked and time.monotonic() >= self._sitemap_retry_at:
+                try:
+                    self._sitemap_checked = self.sitemap.ensure_fresh(
+                        config.DABAG_BASE_URL, config.DABAG_SITEMAP_MAX_AGE_HOURS
+                    )
+                except Exception as e:
+                    print(f"⚠️ Warning: Sitemap discovery failed: {e}")
+                if not self._sitemap_checked:
+                    self._sitemap_retry_at = time.monotonic() + SITEMAP_RETRY_SECONDS
+
+        url = None
+        try:
+            for candidate, _lastmod in self.sitemap.find(
+                contains=f"q={quote(SUPPLIER_PID, safe='')}", host=urlparse(config.DABAG_BASE_URL).netloc
+            ):
+                if is_detail_link(candidate) and parse_qs(urlparse(candidate).query).get("q") == [SUPPLIER_PID]:
+                    url = candidate
+                    break
+        except Exception as e:
+            print(f"⚠️ Warning: Sitemap lookup failed for {SUPPLIER_PID}: {e}")
+
+        with self._stats_lock:
+            self.resolver_stats["sitemap_hits" if url else "sitemap_misses"] += 1
+        return url
+
+    def resolve_product_urls(self, SUPPLIER_PIDs: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve detail URLs for many products.
+
+        Sitemap-listed products resolve from the index, direct URLs are
+        verified per product and the remaining products are searched together
+        via `search_products`.
+
+        Returns:
+            Mapping of SUPPLIER_PID to product detail URL (None if not found).
+        """
+        resolved: Dict[str, Optional[str]] = {}
+        unresolved: List[str] = []
+        for pid in dict.fromkeys(SUPPLIER_PIDs):
+            url = self._sitemap_url(pid)
+            if not url and config.DABAG_DIRECT_URL_FASTPATH:
+                url = self._verify_direct_url(pid)
+            if url:
+                resolved[pid] = url
+            else:
+                unresolved.append(pid)
+        resolved.update(self.search_products(unresolved))
+        return resolved
+
+    def direct_url_success_rate(self) -> float:
+        """Fraction of direct detail-URL checks that were verified."""
+        with self._stats_lock:
+            total = self.resolver_stats["direct_hits"] + self.resolver_stats["direct_misses"]
+            return self.resolver_stats["direct_hits"] / total if total else 0.0
+
+    def search_url(self, SUPPLIER_PID: str) -> str:
+        """Build the DABAG search page URL for a product."""
+        return f"{config.DABAG_BASE_URL}/?q={SUPPLIER_PID}&srv=search"
 
     def search_product(self, SUPPLIER_PID: str) -> Optional[str]:
         """Search DABAG for a product and return the product detail URL.
@@ -56,59 +252,115 @@ class DABAGScraper:
             Full URL to the product detail page, or None if not found.
         """
         try:
-            search_url = f"{config.DABAG_BASE_URL}/?q={SUPPLIER_PID}&srv=search"
+            search_url = self.search_url(SUPPLIER_PID)
             if not self.scraper:
                 print("⚠️ Warning: Scraper not initialized; cannot perform search.")
                 return None
 
-            result = self.scraper.scrape_page(search_url)
-            if not result:
-                print(f"⚠️ Warning: Search failed for SUPPLIER_PID={SUPPLIER_PID}")
-                return None
+            result = self.scraper.scrape_page(search_url, profile=SEARCH_SCRAPE_PROFILE)
+            return self._detail_link_from_search(SUPPLIER_PID, search_url, result)
+
+        except Exception as e:
+            print(f"⚠️ Warning: Error during product search for {SUPPLIER_PID}: {e}")
+            return None
 
-            markdown = result.get("markdown_content", "")
+    def search_products(self, SUPPLIER_PIDs: List[str]) -> Dict[str, Optional[str]]:
+        """Search DABAG for many products, as one batch when the backend supports it.
+
+        With the Firecrawl backend all search pages are submitted as a single
+        batch job instead of N serial scrapes; other backends fall back to
+        `search_product` per ID.
+
+        Args:
+            SUPPLIER_PIDs: Product identifiers to search.
+
+        Returns:
+            Mapping of SUPPLIER_PID to product detail URL (None if not found).
+        """
+        found: Dict[str, Optional[str]] = {pid: None for pid in SUPPLIER_PIDs}
+        if not SUPPLIER_PIDs:
+            return found
+        if not self.scraper or not hasattr(self.scraper, "scrape_batch"):
+            for pid in SUPPLIER_PIDs:
+                found[pid] = self.search_product(pid)
+            return found
+
+        by_url = {self.search_url(pid): pid for pid in SUPPLIER_PIDs}
+        print(f"🔎 Searching {len(by_url)} product(s) in one batch")
+        try:
+            for search_url, result in self.scraper.scrape_batch(list(by_url), profile=SEARCH_SCRAPE_PROFILE):
+                pid = by_url.get(search_url)
+                if pid is not None:
+                    found[pid] = self._detail_link_from_search(pid, search_url, result)
+        except Exception as e:
+            print(f"⚠️ Warning: Batch search failed: {e}")
+        return found
+
+    def _detail_link_from_search(
+        self, SUPPLIER_PID: str, search_url: str, result: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Find the product detail link in a scraped search page."""
+        if not result:
+            print(f"⚠️ Warning: Search failed for SUPPLIER_PID={SUPPLIER_PID}")
+            return None
+
+        # Links returned by the backend (URLs or (title, URL) pairs), then
+        # links parsed from the markdown
+        hrefs: List[str] = [
+            link[1] if isinstance(link, (list, tuple)) else str(link) for link in result.get("links") or []
+        ]
+        markdown = result.get("markdown_content", "")
+        if markdown:
             # Reuse link extractor from the backend if available
             try:
                 links = self.scraper.extract_links_from_markdown(markdown, search_url)  # type: ignore[attr-defined]
             except Exception:
                 links = []
+            hrefs.extend(href for _title, href in links)
 
-            # Find product detail link with expected pattern
-            target: Optional[str] = None
-            for _title, href in links:
-                if "srv=search&pg=det&q=" in href:
-                    target = href
-                    break
-
-            if not target:
-                print(f"⚠️ Warning: Product detail link not found for SUPPLIER_PID={SUPPLIER_PID}")
-                return None
+        # Find product detail link with expected pattern
+        target: Optional[str] = None
+        for href in hrefs:
+            if is_detail_link(href):
+                target = href
+                break
 
-            # Ensure full URL
-            full_url = target if target.startswith("http") else urljoin(config.DABAG_BASE_URL, target)
-            return full_url
-
-        except Exception as e:
-            print(f"⚠️ Warning: Error during product search for {SUPPLIER_PID}: {e}")
+        if not target:
+            print(f"⚠️ Warning: Product detail link not found for SUPPLIER_PID={SUPPLIER_PID}")
             return None
 
-    def scrape_product_languages(self, base_url: str, SUPPLIER_PID: str) -> Dict[str, Dict[str, str]]:
-        """Scrape product specs for all configured languages.
+        # Ensure full URL
+        return target if target.startswith("http") else urljoin(config.DABAG_BASE_URL, target)
+
+    def scrape_product_languages(
+        self,
+        base_url: str,
+        SUPPLIER_PID: str,
+        languages: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """Scrape product specs for the configured languages.
 
         Args:
             base_url: The base product detail page URL (likely in default language).
             SUPPLIER_PID: The product identifier for logging only.
+            languages: Optional subset of language codes to fetch. Defaults
+                to all configured languages.
 
         Returns:
             Mapping of language code (de/fr/it) to specs dict.
         """
         results: Dict[str, Dict[str, str]] = {}
-        headers = {"User-Agent": "Mozilla/5.0 (compatible; BMEcatTransformer/1.0)"}
+        wanted = set(languages) if languages is not None else set(config.LANGUAGES)
 
         for lang_code, lang_id in config.LANGUAGES.items():
+            if lang_code not in wanted:
+                continue
             try:
                 url = f"{base_url}&&&lngId={lang_id}"
-                resp = requests.get(url, headers=headers, timeout=30)
+                resp = self.fetcher.get(url)
+                if resp is None:
+                    results[lang_code] = {}
+                    continue
                 if resp.status_code >= 400:
                     print(f"⚠️ Warning: {lang_code.upper()} page HTTP {resp.status_code} for {SUPPLIER_PID}")
                     results[lang_code] = {}
@@ -133,7 +385,14 @@ class DABAGScraper:
             "languages": {"de": {...}, "fr": {...}, "it": {...}}
         }
         """
-        product_url = self.search_product(SUPPLIER_PID)
+        return self.scrape_resolved_product(SUPPLIER_PID, self.resolve_product_url(SUPPLIER_PID))
+
+    def scrape_resolved_product(self, SUPPLIER_PID: str, product_url: Optional[str]) -> Dict[str, object]:
+        """Scrape all languages of a product whose URL is already resolved.
+
+        Used with `resolve_product_urls` to resolve many products in one
+        batch first. Returns the same structure as `process_product`.
+        """
         lang_data: Dict[str, Dict[str, str]] = {}
         if product_url:
             lang_data = self.scrape_product_languages(product_url, SUPPLIER_PID)
@@ -144,5 +403,72 @@ class DABAGScraper:
             "SUPPLIER_PID": SUPPLIER_PID,
             "product_url": product_url,
             "languages": lang_data,
+            "language_scraped_at": self._language_timestamps(lang_data),
+        }
+
+    def languages_to_refresh(
+        self,
+        existing_data: Dict[str, Any],
+        max_age_days: Optional[float] = None,
+    ) -> List[str]:
+        """Return languages of a master entry that are missing, empty or stale.
+
+        Same rule as the scrape planner (`languages_needing_refresh`).
+
+        Args:
+            existing_data: Product entry from the master JSON.
+            max_age_days: Languages older than this are stale. None disables
+                the staleness check.
+
+        Returns:
+            Language codes to re-fetch, in configured order.
+        """
+        return languages_needing_refresh(existing_data, config.LANGUAGES, max_age_days)
+
+    def refresh_product(
+        self,
+        SUPPLIER_PID: str,
+        existing_data: Dict[str, Any],
+        max_age_days: Optional[float] = None,
+        languages: Optional[List[str]] = None,
+    ) -> Dict[str, object]:
+        """Re-fetch only the missing, empty or stale languages of a product.
+
+        Reuses the stored `product_url` so no search is needed. Falls back to
+        a full `process_product` when the entry has no URL.
+
+        Args:
+            SUPPLIER_PID: The product identifier.
+            existing_data: Product entry from the master JSON.
+            max_age_days: Staleness threshold, see `languages_to_refresh`.
+            languages: Explicit languages to re-fetch, overriding the
+                missing/empty/stale selection.
+
+        Returns:
+            Same structure as `process_product`, with `languages` holding only
+            the re-fetched languages (to merge into the existing entry).
+        """
+        product_url = existing_data.get("product_url")
+        if not product_url:
+            print(f"⚠️ Warning: No stored product URL for {SUPPLIER_PID}; running full scrape")
+            return self.process_product(SUPPLIER_PID)
+
+        if languages is None:
+            languages = self.languages_to_refresh(existing_data, max_age_days)
+        lang_data: Dict[str, Dict[str, str]] = {}
+        if languages:
+            print(f"🔁 Refreshing {SUPPLIER_PID}: {', '.join(l.upper() for l in languages)}")
+            lang_data = self.scrape_product_languages(product_url, SUPPLIER_PID, languages)
+
+        return {
+            "SUPPLIER_PID": SUPPLIER_PID,
+            "product_url": product_url,
+            "languages": lang_data,
+            "language_scraped_at": self._language_timestamps(lang_data),
         }
 
+    @staticmethod
+    def _language_timestamps(lang_data: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        """Timestamp every language that returned specs."""
+        now = datetime.now().isoformat()
+        return {lang: now for lang, specs in lang_data.items() if specs}
@@ -0,0 +1,367 @@
+"""HTTP fetch layer for BMEcat_transformer.
+
+Wraps a pooled `requests.Session` used for plain GET requests against DABAG
+product pages. Retries rate-limited (429) and transient (5xx) responses with
+backoff, honouring `Retry-After`, and records per-request latency and retry
+counters so callers (and the throughput benchmark) can report them.
+
+Optional hedging: once a host has enough latency samples, a request still
+running after that host's observed p95 gets one duplicate request; the first
+response wins and the other is cancelled. The primary request runs on the
+calling thread and only the hedge uses the executor; a winning hedge aborts
+the primary by shutting down its connection's socket. Hedges are capped by a
+budget (fraction of all requests) so tail latency drops without doubling load.
+"""
+
+from __future__ import annotations
+
+import math
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; BMEcatTransformer/1.0)"}
+
+# Status codes worth retrying: rate limiting and transient upstream errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Latency samples kept per host for the hedging threshold
+HOST_LATENCY_WINDOW = 200
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples (0.0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class FetchStats:
+    """Thread-safe counters and latency samples for an `HTTPFetcher`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.latencies: List[float] = []
+
+    def record(self, latency: float, status_code: Optional[int]) -> None:
+        """Record one completed attempt."""
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            if status_code == 429:
+                self.rate_limited += 1
+            if status_code is None or status_code >= 400:
+                self.errors += 1
+
+    def record_retry(self) -> None:
+        """Record that an attempt is being retried."""
+        with self._lock:
+            self.retries += 1
+
+    def reserve_hedge(self, budget: float) -> bool:
+        """Count one more hedge if it stays within `budget` (a fraction of requests)."""
+        with self._lock:
+            if self.hedges + 1 > budget * max(self.requests, 1):
+                return False
+            self.hedges += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        """Record that a hedge beat its primary."""
+        with self._lock:
+            self.hedge_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the counters and latency samples."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "errors": self.errors,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "latencies": list(self.latencies),
+            }
+
+
+class _TrackingPoolMixin:
+    """Connection pool that reports which connection each thread checked out."""
+
+    def __init__(self, *args: Any, tracker: "_HedgingAdapter", **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[call-arg]
+        self._tracker = tracker
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        self._tracker.track(conn)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        self._tracker.release(conn)
+        super()._put_conn(conn)  # type: ignore[misc]
+
+
+class _TrackingHTTPConnectionPool(_TrackingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSConnectionPool(_TrackingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _HedgingAdapter(HTTPAdapter):
+    """Adapter that knows each thread's connection, so a winning hedge can abort its primary."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Set before super().__init__, which builds the pool manager
+        self._active: Dict[int, Any] = {}
+        self._active_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": partial(_TrackingHTTPConnectionPool, tracker=self),
+            "https": partial(_TrackingHTTPSConnectionPool, tracker=self),
+        }
+
+    def track(self, conn: Any) -> None:
+        """Record the connection the calling thread checked out."""
+        with self._active_lock:
+            self._active[threading.get_ident()] = conn
+
+    def release(self, conn: Any = None) -> None:
+        """Forget the calling thread's connection (only if it is `conn`, when given)."""
+        ident = threading.get_ident()
+        with self._active_lock:
+            if conn is None or self._active.get(ident) is conn:
+                self._active.pop(ident, None)
+
+    def abort(self, thread_id: int) -> None:
+        """Shut down the socket of the connection a thread is waiting on."""
+        with self._active_lock:
+            conn = self._active.get(thread_id)
+        sock = getattr(conn, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class HTTPFetcher:
+    """Pooled GET client with retry/backoff, latency tracking and hedging."""
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        backoff: float = 1.0,
+        pool_size: int = 10,
+        headers: Optional[Dict[str, str]] = None,
+        hedging: bool = False,
+        hedge_budget: float = 0.05,
+        hedge_min_samples: int = 20,
+        hedge_percentile: float = 95.0,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            timeout: Per-request timeout in seconds.
+            max_retries: Retries after the first attempt for retryable statuses.
+            backoff: Base backoff in seconds (doubled per retry) when no
+                `Retry-After` header is present.
+            pool_size: Connection pool size per host.
+            headers: Default request headers.
+            hedging: Issue a duplicate request when one exceeds the host's
+                observed latency percentile.
+            hedge_budget: Maximum hedges as a fraction of all requests.
+            hedge_min_samples: Latency samples required per host before
+                hedging starts.
+            hedge_percentile: Host latency percentile used as hedge delay.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stats = FetchStats()
+        self.hedging = hedging
+        self.hedge_budget = hedge_budget
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_percentile = hedge_percentile
+        self._host_latencies: Dict[str, Deque[float]] = {}
+        self._host_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=pool_size * 2, thread_name_prefix="hedge") if hedging else None
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter_cls = _HedgingAdapter if hedging else HTTPAdapter
+        self._adapter = adapter_cls(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+    def get(self, url: str) -> Optional[requests.Response]:
+        """GET a URL, retrying rate-limited and transient failures.
+
+        Args:
+            url: URL to fetch.
+
+        Returns:
+            The final response (which may still carry an error status), or
+            None if every attempt raised a network error.
+        """
+        response: Optional[requests.Response] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._hedged_get(url) if self.hedging else self._timed_get(url)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ Warning: Request failed for {url}: {e}")
+                response = None
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+
+            if attempt < self.max_retries:
+                self.stats.record_retry()
+                time.sleep(self._retry_delay(response, attempt))
+
+        return response
+
+    def _timed_get(self, url: str, aborted: Optional[threading.Event] = None) -> requests.Response:
+        """Single GET that records latency in stats and the host window.
+
+        A request failing because `aborted` is set (its hedge won) is not
+        counted as an error.
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            if aborted is None or not aborted.is_set():
+                self.stats.record(time.perf_counter() - start, None)
+            raise
+        finally:
+            # A failed request may never hand its connection back to the pool
+            if isinstance(self._adapter, _HedgingAdapter):
+                self._adapter.release()
+        latency = time.perf_counter() - start
+        self.stats.record(latency, response.status_code)
+        if response.status_code < 400:
+            host = urlparse(url).netloc
+            with self._host_lock:
+                window = self._host_latencies.setdefault(host, deque(maxlen=HOST_LATENCY_WINDOW))
+                window.append(latency)
+        return response
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """Return the hedge threshold for the URL's host, if known yet."""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            samples = list(self._host_latencies.get(host, ()))
+        if len(samples) < self.hedge_min_samples:
+            return None
+        return percentile(samples, self.hedge_percentile)
+
+    def _hedged_get(self, url: str) -> requests.Response:
+        """GET with one duplicate request once the host p95 is exceeded.
+
+        The primary runs on the calling thread. A hedge task on the executor
+        waits out the host's hedge delay and, if the primary is still
+        running, sends the duplicate; whichever response arrives first wins.
+        """
+        delay = self.hedge_delay(url)
+        if delay is None or self._executor is None:
+            return self._timed_get(url)
+
+        caller = threading.get_ident()
+        primary_done = threading.Event()
+        hedge_won = threading.Event()
+        winner: List[str] = []
+        winner_lock = threading.Lock()
+
+        def claim(name: str) -> bool:
+            with winner_lock:
+                if not winner:
+                    winner.append(name)
+                return winner[0] == name
+
+        def run_hedge() -> Optional[requests.Response]:
+            if primary_done.wait(delay) or not self.stats.reserve_hedge(self.hedge_budget):
+                return None
+            try:
+                response = self._timed_get(url)
+            except requests.exceptions.RequestException:
+                return None
+            if not claim("hedge"):
+                response.close()
+                return None
+            hedge_won.set()
+            self._adapter.abort(caller)
+            return response
+
+        hedge = self._executor.submit(run_hedge)
+        try:
+            response = self._timed_get(url, aborted=hedge_won)
+        except requests.exceptions.RequestException:
+            primary_done.set()
+            if claim("primary"):
+                self._cancel(hedge)
+                raise
+        else:
+            primary_done.set()
+            if claim("primary"):
+                self._cancel(hedge)
+                return response
+            response.close()
+
+        # The hedge won (and aborted the primary)
+        self.stats.record_hedge_win()
+        return hedge.result()
+
+    @staticmethod
+    def _cancel(future: Future) -> None:
+        """Cancel a losing request, closing its response if it still arrives."""
+        if future.cancel():
+            return
+
+        def _close(f: Future) -> None:
+            if not f.cancelled() and f.exception() is None and f.result() is not None:
+                f.result().close()
+
+        future.add_done_callback(_close)
+
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int) -> float:
+        """Compute how long to wait before the next attempt."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+    def close(self) -> None:
+        """Close the hedge executor and the underlying session."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
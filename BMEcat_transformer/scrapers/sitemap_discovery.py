@@ -0,0 +1,266 @@
+"""Sitemap-driven URL discovery for BMEcat_transformer.
+
+Reads `Sitemap:` entries from a site's robots.txt (falling back to
+`/sitemap.xml`), follows nested sitemap indexes and gzip-compressed
+sitemaps, and stream-parses each file with `iterparse` so memory stays flat
+on 50k-URL sitemaps. Every page URL is stored with its `lastmod` in a SQLite
+index that callers query by pattern, e.g. for DABAG product detail URLs.
+Bulk discovery then costs a few compressed XML downloads instead of one
+rendered search page per product.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree  # type: ignore
+
+from scrapers.http_fetcher import HTTPFetcher
+
+
+# Guard against runaway or cyclic sitemap indexes
+MAX_SITEMAPS = 1000
+
+_ROBOTS_SITEMAP = re.compile(r"^\s*sitemap\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _local_name(tag: str) -> str:
+    """Tag name without the XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_sitemap_entries(stream: io.BufferedIOBase) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Stream-parse a sitemap or sitemap index.
+
+    Args:
+        stream: Binary file object with the (decompressed) XML.
+
+    Yields:
+        ("url" | "sitemap", loc, lastmod) per `<url>` / `<sitemap>` entry.
+    """
+    loc: Optional[str] = None
+    lastmod: Optional[str] = None
+    for _event, element in etree.iterparse(stream, events=("end",), recover=True, huge_tree=True):
+        if not isinstance(element.tag, str):
+            continue
+        name = _local_name(element.tag)
+        if name == "loc":
+            loc = (element.text or "").strip()
+        elif name == "lastmod":
+            lastmod = (element.text or "").strip() or None
+        elif name in ("url", "sitemap"):
+            if loc:
+                yield name, loc, lastmod
+            loc = lastmod = None
+            # Free parsed entries as we go
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+
+class SitemapDiscovery:
+    """Discover a site's URLs from its sitemaps into a SQLite URL → lastmod index."""
+
+    def __init__(self, db_path: str, fetcher: Optional[HTTPFetcher] = None, max_sitemaps: int = MAX_SITEMAPS) -> None:
+        """Open (or create) the index.
+
+        Args:
+            db_path: SQLite file for the URL index.
+            fetcher: HTTP client for robots.txt and sitemap downloads.
+            max_sitemaps: Maximum sitemap files fetched per discovery run.
+        """
+        self.db_path = db_path
+        self.fetcher = fetcher or HTTPFetcher()
+        self.max_sitemaps = max_sitemaps
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                host TEXT NOT NULL,
+                lastmod TEXT,
+                sitemap TEXT,
+                seen_at REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_host ON urls(host)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sites (host TEXT PRIMARY KEY, discovered_at REAL NOT NULL, url_count INTEGER)"
+        )
+        self.conn.commit()
+
+    # ---- Discovery --------------------------------------------------------
+
+    def sitemaps_from_robots(self, base_url: str) -> List[str]:
+        """Return the `Sitemap:` URLs of a site's robots.txt (or `/sitemap.xml`)."""
+        robots_url = urljoin(base_url, "/robots.txt")
+        response = self.fetcher.get(robots_url)
+        sitemaps: List[str] = []
+        if response is not None and response.status_code < 400:
+            sitemaps = [urljoin(robots_url, loc) for loc in _ROBOTS_SITEMAP.findall(response.text or "")]
+        return sitemaps or [urljoin(base_url, "/sitemap.xml")]
+
+    def _open_sitemap(self, url: str) -> Optional[io.BufferedIOBase]:
+        """Download a sitemap, transparently decompressing `.xml.gz` files."""
+        response = self.fetcher.get(url)
+        if response is None or response.status_code >= 400:
+            print(f"⚠️ Warning: Sitemap unavailable ({getattr(response, 'status_code', 'no response')}): {url}")
+            return None
+        body = io.BytesIO(response.content)
+        # Servers may or may not have decoded Content-Encoding already
+        if response.content[:2] == _GZIP_MAGIC:
+            return gzip.GzipFile(fileobj=body)
+        return body
+
+    def discover(self, base_url: str) -> Dict[str, int]:
+        """Crawl a site's sitemaps into the index.
+
+        Args:
+            base_url: Any URL of the site (scheme and host are used).
+
+        Returns:
+            Counters: sitemaps fetched, URLs indexed, errors. The site only
+            counts as discovered (see `ensure_fresh`) after a run without
+            errors that indexed at least one URL.
+        """
+        parsed = urlparse(base_url)
+        root = f"{parsed.scheme}://{parsed.netloc}"
+        queue: Deque[str] = deque(self.sitemaps_from_robots(root))
+        visited = set()
+        stats = {"sitemaps": 0, "urls": 0, "errors": 0}
+        started = time.perf_counter()
+
+        while queue and stats["sitemaps"] < self.max_sitemaps:
+            sitemap_url = queue.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            stream = self._open_sitemap(sitemap_url)
+            if stream is None:
+                stats["errors"] += 1
+                continue
+            stats["sitemaps"] += 1
+
+            batch: List[Tuple[str, str, Optional[str], str, float]] = []
+            try:
+                for kind, loc, lastmod in iter_sitemap_entries(stream):
+                    if kind == "sitemap":
+                        queue.append(urljoin(sitemap_url, loc))
+                        continue
+                    batch.append((loc, urlparse(loc).netloc.lower(), lastmod, sitemap_url, time.time()))
+                    if len(batch) >= 5000:
+                        stats["urls"] += self._store(batch)
+                        batch = []
+            except (etree.XMLSyntaxError, OSError, EOFError) as e:
+                print(f"⚠️ Warning: Could not parse sitemap {sitemap_url}: {e}")
+                stats["errors"] += 1
+            stats["urls"] += self._store(batch)
+
+        if stats["errors"] or not stats["urls"]:
+            print(f"⚠️ Warning: Sitemap discovery for {parsed.netloc} incomplete "
+                  f"({stats['errors']} error(s), {stats['urls']} URLs); will retry")
+        else:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sites (host, discovered_at, url_count) VALUES (?, ?, ?)",
+                    (parsed.netloc.lower(), time.time(), stats["urls"]),
+                )
+                self.conn.commit()
+        print(f"🗺️  Sitemap discovery for {parsed.netloc}: {stats['urls']} URLs from "
+              f"{stats['sitemaps']} sitemap(s) in {time.perf_counter() - started:.1f}s")
+        return stats
+
+    def _store(self, rows: List[Tuple[str, str, Optional[str], str, float]]) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO urls (url, host, lastmod, sitemap, seen_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def ensure_fresh(self, base_url: str, max_age_hours: float) -> bool:
+        """Run discovery unless the site was discovered within `max_age_hours`.
+
+        Returns:
+            Whether the index is fresh (False after a failed or empty discovery).
+        """
+        host = urlparse(base_url).netloc.lower()
+        with self._lock:
+            row = self.conn.execute("SELECT discovered_at FROM sites WHERE host = ?", (host,)).fetchone()
+        if row is not None and time.time() - row[0] <= max_age_hours * 3600:
+            return True
+        stats = self.discover(base_url)
+        return not stats["errors"] and stats["urls"] > 0
+
+    # ---- Queries ----------------------------------------------------------
+
+    def lastmod(self, url: str) -> Optional[str]:
+        """Return the `lastmod` of an indexed URL (None if unknown or not indexed)."""
+        with self._lock:
+            row = self.conn.execute("SELECT lastmod FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def find(
+        self,
+        pattern: Optional[str] = None,
+        contains: Optional[str] = None,
+        host: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Query indexed URLs.
+
+        Args:
+            pattern: Regular expression the URL must match (`re.search`).
+            contains: Substring prefilter evaluated in SQLite (fast path).
+            host: Restrict to one host.
+            limit: Maximum results.
+
+        Returns:
+            (url, lastmod) pairs, newest lastmod first.
+        """
+        sql = "SELECT url, lastmod FROM urls WHERE 1=1"
+        params: List[object] = []
+        if host:
+            sql += " AND host = ?"
+            params.append(host.lower())
+        if contains:
+            sql += " AND instr(url, ?) > 0"
+            params.append(contains)
+        sql += " ORDER BY lastmod DESC"
+        regex = re.compile(pattern) if pattern else None
+
+        results: List[Tuple[str, Optional[str]]] = []
+        with self._lock:
+            for url, lastmod in self.conn.execute(sql, params):
+                if regex is None or regex.search(url):
+                    results.append((url, lastmod))
+                    if limit is not None and len(results) >= limit:
+                        break
+        return results
+
+    def count(self, host: Optional[str] = None) -> int:
+        """Number of indexed URLs (optionally for one host)."""
+        with self._lock:
+            if host:
+                return self.conn.execute("SELECT COUNT(*) FROM urls WHERE host = ?", (host.lower(),)).fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self.conn.close()
@@ -15,6 +15,7 @@ class TableExtractor:
 
     Methods:
         extract_specs_table(html_content): Return dict of spec label -> value.
+        has_specs_table(html_content): Return whether the spec table exists.
     """
 
     def __init__(self) -> None:
@@ -38,17 +39,7 @@ class TableExtractor:
         specs: Dict[str, str] = {}
         try:
             soup = BeautifulSoup(html_content or "", "html.parser")
-            table = soup.find("table", class_="w-100 table table-striped m-0")
-            if table is None:
-                # Attempt a broader match if exact class chain changes order
-                # or is partially applied by the site.
-                candidate_tables = soup.find_all("table")
-                for t in candidate_tables:
-                    classes = set((t.get("class") or []))
-                    needed = {"w-100", "table", "table-striped", "m-0"}
-                    if needed.issubset(classes):
-                        table = t
-                        break
+            table = self._find_specs_table(soup)
 
             if table is None:
                 print("⚠️ Warning: Specification table not found in HTML.")
@@ -69,3 +60,28 @@ class TableExtractor:
 
         return specs
 
+    def has_specs_table(self, html_content: str) -> bool:
+        """Return True if the HTML contains the specification table.
+
+        Cheap presence check (no row parsing, no warnings) used to verify
+        candidate product detail URLs.
+        """
+        try:
+            soup = BeautifulSoup(html_content or "", "html.parser")
+            return self._find_specs_table(soup) is not None
+        except Exception:
+            return False
+
+    def _find_specs_table(self, soup: BeautifulSoup):
+        """Locate the specification table, tolerating class order changes."""
+        table = soup.find("table", class_="w-100 table table-striped m-0")
+        if table is None:
+            # Attempt a broader match if exact class chain changes order
+            # or is partially applied by the site.
+            needed = {"w-100", "table", "table-striped", "m-0"}
+            for t in soup.find_all("table"):
+                classes = set((t.get("class") or []))
+                if needed.issubset(classes):
+                    table = t
+                    break
+        return table
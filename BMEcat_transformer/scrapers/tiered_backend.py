@@ -0,0 +1,321 @@
+"""Tiered scraping backend for BMEcat_transformer.
+
+One `scrape_page` interface over four tiers, cheapest first: a plain HTTP
+GET, pooled Playwright, Firecrawl with the basic proxy and Firecrawl with the
+stealth proxy. A page escalates to the next tier only when the cheaper one
+fails: no response, a bot-detection status, an empty extraction or a failed
+target-content check. A page that loads fine but misses the target content
+escalates at most one tier, since stronger proxies rarely change what an
+unblocked page contains. Success rates per domain and tier are persisted, so
+later pages of a domain start at the first tier known to work there.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+from html import unescape
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from scrapers.http_fetcher import HTTPFetcher
+
+PARENT_PROJECT = Path(__file__).resolve().parent.parent.parent
+if str(PARENT_PROJECT) not in sys.path:
+    sys.path.append(str(PARENT_PROJECT))
+from manual_scrape.src.html_to_markdown import html_to_markdown  # type: ignore
+
+
+TIERS: List[str] = ["http", "playwright", "firecrawl_basic", "firecrawl_stealth"]
+
+# Statuses treated as "blocked" rather than "page missing"
+BOT_DETECTION_CODES = {401, 403, 429, 500, 503}
+
+# Extractions shorter than this are treated as empty
+MIN_CONTENT_CHARS = 200
+
+# A loaded page missing the target content escalates this many extra tiers
+TARGET_MISS_ESCALATIONS = 1
+TARGET_MISSING = "target content missing"
+
+# Tier stats are written after this many recorded attempts (and at exit)
+STATS_SAVE_EVERY = 25
+
+_TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+FIRECRAWL_PROXY = {"firecrawl_basic": "basic", "firecrawl_stealth": "stealth"}
+
+TargetCheck = Callable[[Dict[str, Any]], bool]
+
+
+def _domain(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class TierStats:
+    """Per-domain, per-tier attempt and success counters persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, save_every: int = STATS_SAVE_EVERY) -> None:
+        """Load counters from `path` (no persistence when None).
+
+        Args:
+            path: JSON file for the counters.
+            save_every: Recorded attempts between automatic saves; pending
+                counters are also written at exit.
+        """
+        self.path = path
+        self.save_every = max(1, save_every)
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.data: Dict[str, Dict[str, Dict[str, int]]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Warning: Could not load tier stats from {path}: {e}")
+        if path:
+            atexit.register(self.save)
+
+    def record(self, url: str, tier: str, success: bool) -> None:
+        """Count one attempt of a tier on the URL's domain."""
+        with self._lock:
+            counters = self.data.setdefault(_domain(url), {}).setdefault(tier, {"attempts": 0, "successes": 0})
+            counters["attempts"] += 1
+            if success:
+                counters["successes"] += 1
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def success_rate(self, url: str, tier: str, min_samples: int) -> Optional[float]:
+        """Success rate of a tier on the URL's domain, or None with too few samples."""
+        with self._lock:
+            counters = self.data.get(_domain(url), {}).get(tier)
+            if not counters or counters["attempts"] < min_samples:
+                return None
+            return counters["successes"] / counters["attempts"]
+
+    def save(self) -> None:
+        """Write counters atomically (no-op without unsaved attempts)."""
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                payload = json.dumps(self.data, indent=2, sort_keys=True)
+                self._unsaved = 0
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not save tier stats to {self.path}: {e}")
+
+
+class TieredScraper:
+    """Scrape pages with the cheapest tier that works, escalating on failure."""
+
+    def __init__(
+        self,
+        fetcher: Optional[HTTPFetcher] = None,
+        tiers: Optional[List[str]] = None,
+        stats_path: Optional[str] = None,
+        target_check: Optional[TargetCheck] = None,
+        min_samples: int = 3,
+        success_threshold: float = 0.5,
+        escalation_policy: Any = None,
+    ) -> None:
+        """Initialize the tiered backend.
+
+        Args:
+            fetcher: HTTP client for the `http` tier (a default one is created).
+            tiers: Tiers to use, in escalation order (default: all of `TIERS`).
+            stats_path: JSON file for per-domain tier stats (None: in memory).
+            target_check: Predicate on a scrape result; False escalates.
+            min_samples: Attempts before a domain's tier success rate is trusted.
+            success_threshold: Tiers below this success rate on a domain are
+                skipped for its later pages.
+            escalation_policy: Optional `StealthEscalationPolicy` whose credit
+                budget also caps the Firecrawl tiers.
+        """
+        self.fetcher = fetcher or HTTPFetcher()
+        self.tiers = [tier for tier in (tiers or TIERS) if tier in TIERS]
+        self.stats = TierStats(stats_path)
+        self.target_check = target_check
+        self.min_samples = min_samples
+        self.success_threshold = success_threshold
+        self.escalation_policy = escalation_policy
+        self._backends: Dict[str, Any] = {}
+        self._unavailable: Dict[str, str] = {}
+        self._backend_lock = threading.Lock()
+
+    # ---- Backends ---------------------------------------------------------
+
+    def _backend(self, tier: str) -> Any:
+        """Create the Playwright/Firecrawl backend on first use (None if unavailable)."""
+        kind = "firecrawl" if tier in FIRECRAWL_PROXY else tier
+        with self._backend_lock:
+            if kind in self._backends:
+                return self._backends[kind]
+            if kind in self._unavailable:
+                return None
+            try:
+                if kind == "playwright":
+                    from manual_scrape.src.web_scraper import WebScraper  # type: ignore
+                    backend = WebScraper()
+                else:
+                    if not os.getenv("FIRECRAWL_API_KEY"):
+                        raise RuntimeError("FIRECRAWL_API_KEY not set")
+                    from easy_rich.src.web_scraper import WebScraper  # type: ignore
+                    backend = WebScraper()
+            except Exception as e:
+                print(f"⚠️ Warning: {kind} tier unavailable: {e}")
+                self._unavailable[kind] = str(e)
+                return None
+            self._backends[kind] = backend
+            return backend
+
+    def _fetch_http(self, url: str) -> Optional[Dict[str, Any]]:
+        """Plain GET; markdown (and its links) converted from the static HTML."""
+        response = self.fetcher.get(url)
+        if response is None:
+            return None
+        html = response.text or ""
+        title = _TITLE_PATTERN.search(html)
+        markdown = html_to_markdown(html, url)
+        return {
+            "url": url,
+            "title": unescape(_WHITESPACE.sub(" ", title.group(1))).strip() if title else url,
+            "markdown_content": markdown,
+            "structured_data": None,
+            "links": self.extract_links_from_markdown(markdown, url),
+            "status_code": str(response.status_code),
+            "html": html,
+        }
+
+    def _fetch(self, tier: str, url: str, profile: Optional[str]) -> Optional[Dict[str, Any]]:
+        if tier == "http":
+            return self._fetch_http(url)
+        backend = self._backend(tier)
+        if backend is None:
+            return None
+        if tier == "playwright":
+            return backend.scrape_page(url, profile=profile)
+
+        mode = FIRECRAWL_PROXY[tier]
+        policy = self.escalation_policy
+        # Firecrawl tiers only run once the free tiers failed: escalation spend
+        if policy is not None and not policy.can_afford(mode):
+            print(f"💸 Skipping {tier}: credit budget exhausted")
+            return None
+        content = backend.scrape_with_proxy(url, mode, profile)
+        if policy is not None:
+            policy.record(url, mode, content, bool(content) and self._blocked(content), escalated=True)
+        return content
+
+    # ---- Escalation -------------------------------------------------------
+
+    @staticmethod
+    def _blocked(content: Dict[str, Any]) -> bool:
+        try:
+            return int(content.get("status_code", 0)) in BOT_DETECTION_CODES
+        except (TypeError, ValueError):
+            return False
+
+    def failure_reason(self, content: Optional[Dict[str, Any]], target_check: Optional[TargetCheck]) -> Optional[str]:
+        """Why a tier's result is not good enough, or None if it is."""
+        if not content:
+            return "no response"
+        if self._blocked(content):
+            return f"blocked (HTTP {content.get('status_code')})"
+        try:
+            if int(content.get("status_code", 200)) >= 400:
+                return f"HTTP {content.get('status_code')}"
+        except (TypeError, ValueError):
+            pass
+        if len((content.get("markdown_content") or "").strip()) < MIN_CONTENT_CHARS and not content.get("links"):
+            return "empty extraction"
+        if target_check is not None and not target_check(content):
+            return TARGET_MISSING
+        return None
+
+    def tiers_for(self, url: str) -> List[str]:
+        """Tiers to try for a URL: known-bad tiers for its domain are skipped."""
+        tiers = [
+            tier for tier in self.tiers
+            if (rate := self.stats.success_rate(url, tier, self.min_samples)) is None
+            or rate >= self.success_threshold
+        ]
+        # Always keep the strongest tier as a last resort
+        if self.tiers and self.tiers[-1] not in tiers:
+            tiers.append(self.tiers[-1])
+        return tiers
+
+    def scrape_page(
+        self,
+        url: str,
+        profile: Optional[str] = None,
+        target_check: Optional[TargetCheck] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Scrape a URL with the cheapest tier that yields usable content.
+
+        Args:
+            url: URL to scrape.
+            profile: Scrape profile passed to the Playwright/Firecrawl tiers.
+            target_check: Per-call override of the constructor's check.
+
+        Returns:
+            The result dict of the successful tier (with a `tier` key), or None.
+        """
+        check = target_check or self.target_check
+        failed: List[str] = []
+        target_misses = 0
+        for tier in self.tiers_for(url):
+            try:
+                content = self._fetch(tier, url, profile)
+            except Exception as e:
+                print(f"⚠️ Warning: {tier} tier failed for {url}: {e}")
+                content = None
+            reason = self.failure_reason(content, check)
+            if reason is None:
+                # Cheaper tiers only count as failures when a stronger one
+                # proved the content exists
+                for cheaper in failed:
+                    self.stats.record(url, cheaper, False)
+                self.stats.record(url, tier, True)
+                content["tier"] = tier
+                return content
+            if reason == TARGET_MISSING:
+                target_misses += 1
+                if target_misses > TARGET_MISS_ESCALATIONS:
+                    print(f"⏹️  {tier} tier loaded {url} without the target content, not escalating further")
+                    return None
+            print(f"⤴️  {tier} tier insufficient for {url}: {reason}")
+            failed.append(tier)
+        return None
+
+    def close(self) -> None:
+        """Write pending tier stats."""
+        self.stats.save()
+
+    def extract_links_from_markdown(self, markdown_content: str, base_url: str) -> List[Tuple[str, str]]:
+        """Return (title, absolute URL) pairs for markdown links in the content."""
+        links: List[Tuple[str, str]] = []
+        for title, href in re.findall(r"\[([^\]]*)\]\(([^)\s]+)", markdown_content or ""):
+            links.append((title.strip(), urljoin(base_url, href)))
+        return links
+
+    def tier_report(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Per-domain tier counters."""
+        return self.stats.data
@@ -0,0 +1,168 @@
+"""End-to-end throughput benchmark for DABAGScraper against a local stand-in.
+
+Starts `benchmark/standin_server.py` in-process, points `DABAG_BASE_URL` at
+it and runs `DABAGScraper.process_product` for a set of product IDs, then
+reports products/min, p50/p95/p99 latency and retry counts.
+
+Usage:
+    python3 scripts/benchmark_throughput.py --products 50 --workers 4 \
+      --latency-ms 150 --rate-limit-rate 0.05 --method playwright
+
+    # Compare tail latency with hedging against 5% slow pages
+    python3 scripts/benchmark_throughput.py --slow-rate 0.05 --hedging
+
+    # Resolve product URLs from the stand-in's sitemaps instead of per-product checks
+    python3 scripts/benchmark_throughput.py --sitemap
+
+    # Or benchmark against real IDs from an input file
+    python3 scripts/benchmark_throughput.py --input inputs/example_supplier_ids.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root for imports
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmark.standin_server import DABAGStandInServer, StandInSettings  # type: ignore
+from scrapers.http_fetcher import percentile  # type: ignore
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark DABAGScraper against a local DABAG stand-in")
+    parser.add_argument("--products", type=int, default=20, help="Number of synthetic product IDs")
+    parser.add_argument("--input", help="Optional XML/JSON input file with SUPPLIER_PIDs")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent process_product calls")
+    parser.add_argument(
+        "--method",
+        default="playwright",
+        choices=["firecrawl", "playwright", "tiered"],
+        help="Scraping backend (Firecrawl cannot reach a local server)",
+    )
+    parser.add_argument("--hedging", action="store_true", help="Enable hedged page requests")
+    parser.add_argument("--sitemap", action="store_true", help="Resolve product URLs via sitemap discovery")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-latency-ms", type=float, default=5000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def load_ids(args: argparse.Namespace) -> List[str]:
+    """Return product IDs from the input file or synthetic ones."""
+    if args.input:
+        from core.input_handler import InputHandler  # type: ignore
+        return InputHandler.load_supplier_ids(args.input)
+    return [f"BENCH-{i:05d}" for i in range(1, args.products + 1)]
+
+
+def main() -> None:
+    args = parse_args()
+    ids = load_ids(args)
+    settings = StandInSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate,
+        slow_latency_ms=args.slow_latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        missing_rate=args.missing_rate,
+        seed=args.seed,
+        catalog=ids,
+    )
+
+    with DABAGStandInServer(settings=settings) as server:
+        # Config reads the environment at import time, so set it first
+        os.environ["DABAG_BASE_URL"] = server.base_url
+        os.environ["SCRAPING_METHOD"] = args.method
+        # Per-run state lives in a temp dir: the stand-in's port changes every
+        # time, and its hosts must not end up in the real outputs
+        run_dir = tempfile.mkdtemp(prefix="bme_benchmark_")
+        os.environ["TIERED_STATS_PATH"] = os.path.join(run_dir, "tier_stats.json")
+        if args.hedging:
+            os.environ["DABAG_HEDGING"] = "true"
+        if args.sitemap:
+            os.environ["DABAG_SITEMAP_DISCOVERY"] = "true"
+            os.environ["DABAG_SITEMAP_DB"] = os.path.join(run_dir, "sitemap_index.sqlite")
+        from scrapers.dabag_scraper import DABAGScraper  # type: ignore
+
+        print("=" * 80)
+        print("BMEcat_transformer - Throughput Benchmark")
+        print(f"Stand-in: {server.base_url} | backend: {args.method} | workers: {args.workers}")
+        print(f"Products: {len(ids)}")
+        print("=" * 80)
+
+        scraper = DABAGScraper()
+        latencies: List[float] = []
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def run_one(pid: str) -> tuple[str, Dict[str, Any], float]:
+            t0 = time.perf_counter()
+            data = scraper.process_product(pid)
+            return pid, data, time.perf_counter() - t0
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = [pool.submit(run_one, pid) for pid in ids]
+            for future in as_completed(futures):
+                try:
+                    pid, data, elapsed = future.result()
+                except Exception as e:
+                    print(f"⚠️ Warning: Benchmark task failed: {e}")
+                    continue
+                latencies.append(elapsed)
+                results[pid] = data
+        wall = time.perf_counter() - start
+
+        resolved = sum(1 for d in results.values() if d.get("product_url"))
+        complete = sum(
+            1 for d in results.values()
+            if d.get("languages") and all(d["languages"].get(lang) for lang in ("de", "fr", "it"))
+        )
+        fetch = scraper.fetcher.stats.snapshot()
+
+        print("\n" + "=" * 80)
+        print("Benchmark Summary")
+        print("-" * 80)
+        print(f"Wall time: {wall:.2f}s")
+        print(f"Throughput: {len(results) / wall * 60 if wall else 0.0:.1f} products/min")
+        print(f"Product latency p50/p95/p99: "
+              f"{percentile(latencies, 50):.2f}s / {percentile(latencies, 95):.2f}s / {percentile(latencies, 99):.2f}s")
+        page_latencies = fetch["latencies"]
+        print(f"Page fetch latency p50/p95/p99: "
+              f"{percentile(page_latencies, 50):.3f}s / {percentile(page_latencies, 95):.3f}s / "
+              f"{percentile(page_latencies, 99):.3f}s")
+        print(f"Product URLs resolved: {resolved}/{len(results)}")
+        print(f"Direct detail-URL hits: {scraper.resolver_stats['direct_hits']} "
+              f"(success rate {scraper.direct_url_success_rate():.0%}) | "
+              f"misses: {scraper.resolver_stats['direct_misses']}")
+        if args.sitemap:
+            print(f"Sitemap hits: {scraper.resolver_stats['sitemap_hits']} | "
+                  f"misses: {scraper.resolver_stats['sitemap_misses']}")
+        print(f"Products with all languages: {complete}/{len(results)}")
+        print(f"Page requests: {fetch['requests']} | retries: {fetch['retries']} | "
+              f"429s seen: {fetch['rate_limited']} | error responses: {fetch['errors']}")
+        print(f"Hedges issued: {fetch['hedges']} | hedges won: {fetch['hedge_wins']}")
+        print(f"Stand-in counters: {server.get_counters()}")
+        print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
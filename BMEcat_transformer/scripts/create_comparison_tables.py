@@ -6,7 +6,7 @@ Usage:
     python3 scripts/create_comparison_tables.py \
       --original path/to/DEWALT_BMEcat_Original.xml \
       --dabag path/to/DEWALT_Version_DABAG.xml \
-      [--auto-scrape]
+      [--auto-scrape] [--coverage-threshold 0.8]
 """
 
 import sys
@@ -44,7 +44,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--auto-scrape",
         action="store_true",
-        help="Automatically scrape missing supplier IDs from web",
+        help="Automatically scrape supplier IDs whose feature coverage is below the threshold",
+    )
+    parser.add_argument(
+        "--coverage-threshold",
+        type=float,
+        default=None,
+        help="Coverage (0.0-1.0) below which a product is scraped (default: config.SCRAPE_COVERAGE_THRESHOLD)",
     )
     return parser.parse_args()
 
@@ -72,6 +78,7 @@ def main() -> None:
     builder = ComparisonTableBuilder(
         original_xml_path=str(original_xml_path),
         dabag_xml_path=str(dabag_xml_path),
+        coverage_threshold=args.coverage_threshold,
     )
 
     merged = builder.build_comparison_tables(auto_scrape=bool(args.auto_scrape))
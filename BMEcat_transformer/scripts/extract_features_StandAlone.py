@@ -73,6 +73,7 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import config
+from core.master_json_manager import JOURNAL_SUFFIX, MasterJSONManager
 from processors.feature_extractor import FeatureExtractor
 
 
@@ -80,6 +81,20 @@ def main() -> None:
     """Run feature extraction."""
     # Construct master JSON path
     master_json_path = Path(config.OUTPUT_DIR) / config.MASTER_JSON_FILENAME
+
+    # The extractor reads the master JSON layout: export the SQLite store first
+    if config.MASTER_STORE_BACKEND == "sqlite":
+        from core.sqlite_product_store import SQLiteProductStore
+        store = SQLiteProductStore(config.MASTER_SQLITE_FILENAME, config.OUTPUT_DIR, backup_count=0)
+        if Path(store.db_path).exists():
+            store.load()
+            store.export_json(str(master_json_path))
+            store.close()
+    elif Path(str(master_json_path) + JOURNAL_SUFFIX).exists():
+        # Journal mode: fold pending journal records into the master JSON
+        manager = MasterJSONManager(config.MASTER_JSON_FILENAME, config.OUTPUT_DIR, config.MASTER_JSON_BACKUP_COUNT)
+        manager.load()
+        manager.compact()
     
     if not master_json_path.exists():
         print(f"❌ Error: Master JSON not found at {master_json_path}")
@@ -23,7 +23,7 @@ import config
 from scrapers.dabag_scraper import DABAGScraper
 from output.output_formatter import OutputFormatter
 from core.input_handler import InputHandler
-from core.master_json_manager import MasterJSONManager
+from core.master_json_manager import create_master_store
 from ui.user_prompt import UserPrompt
 
 
@@ -66,11 +66,15 @@ def main() -> None:
         print("Nothing to do. Exiting.")
         return
 
-    # Initialize master JSON manager
-    master_manager = MasterJSONManager(
-        master_filename=config.MASTER_JSON_FILENAME,
+    # Initialize master product store (JSON file or SQLite)
+    master_manager = create_master_store(
+        backend=config.MASTER_STORE_BACKEND,
         output_dir=config.OUTPUT_DIR,
-        backup_count=config.MASTER_JSON_BACKUP_COUNT
+        json_filename=config.MASTER_JSON_FILENAME,
+        sqlite_filename=config.MASTER_SQLITE_FILENAME,
+        backup_count=config.MASTER_JSON_BACKUP_COUNT,
+        journal=config.MASTER_JSON_JOURNAL,
+        compact_after=config.MASTER_JSON_COMPACT_AFTER
     )
     master_manager.load()
 
@@ -88,6 +92,11 @@ def main() -> None:
     new_count = 0
     updated_count = 0
     skipped_count = 0
+    refreshed_count = 0
+
+    # Resolve product URLs of new IDs up front so their searches run as one batch
+    new_ids = [pid for pid in SUPPLIER_PIDs if not master_manager.check_id_exists(pid)[0]]
+    resolved_urls = scraper.resolve_product_urls(new_ids) if len(new_ids) > 1 else {}
 
     for idx, pid in enumerate(SUPPLIER_PIDs, 1):
         print("-" * 80)
@@ -96,7 +105,23 @@ def main() -> None:
         # Check if ID exists in master JSON
         exists, existing_data = master_manager.check_id_exists(pid)
 
-        if exists:
+        if exists and config.PARTIAL_REFRESH:
+            # Repair mode: re-fetch only missing/empty/stale languages
+            languages = scraper.languages_to_refresh(existing_data, config.LANGUAGE_STALE_AFTER_DAYS)
+            if not languages:
+                print(f"⏭️  Skipping {pid} (all languages present)")
+                results[pid] = existing_data
+                skipped_count += 1
+                continue
+            try:
+                partial = scraper.refresh_product(pid, existing_data, config.LANGUAGE_STALE_AFTER_DAYS)
+                results[pid] = master_manager.merge_product_languages(pid, partial)
+                refreshed_count += 1
+            except Exception as e:
+                print(f"⚠️  Warning: Error refreshing {pid}: {e}")
+                results[pid] = existing_data
+
+        elif exists:
             # Show existing data WITHOUT scraping
             UserPrompt.show_existing_data(pid, existing_data)
 
@@ -121,7 +146,10 @@ def main() -> None:
         else:
             # New ID - scrape and append
             try:
-                data = scraper.process_product(pid)
+                if pid in resolved_urls:
+                    data = scraper.scrape_resolved_product(pid, resolved_urls[pid])
+                else:
+                    data = scraper.process_product(pid)
                 master_manager.append_product(pid, data)
                 results[pid] = data
                 new_count += 1
@@ -129,6 +157,10 @@ def main() -> None:
                 print(f"⚠️  Warning: Error processing {pid}: {e}")
                 results[pid] = {"SUPPLIER_PID": pid, "product_url": None, "languages": {}}
 
+        if config.MASTER_JSON_JOURNAL:
+            # Journal each product as it lands so a crash loses at most one
+            master_manager.save()
+
     # Save master JSON
     master_manager.save()
 
@@ -145,9 +177,16 @@ def main() -> None:
     print(f"New products added: {new_count}")
     print(f"Products updated: {updated_count}")
     print(f"Products skipped: {skipped_count}")
+    if config.PARTIAL_REFRESH:
+        print(f"Products partially refreshed: {refreshed_count}")
     print(f"Total in master: {master_manager.get_statistics()['total_products']}")
     print("-" * 80)
 
+    scraper.print_spend_report()
+
+    # Compact the journal if it is due (journal mode) / close the store
+    master_manager.close()
+
     elapsed = time.time() - start
     print(f"Elapsed time: {elapsed:.2f}s")
 
@@ -0,0 +1,4 @@
+"""Pytest configuration for the BMEcat_transformer tests."""
+
+# Debug script that runs top to bottom on import (and writes to outputs/); run it directly
+collect_ignore = ["test_feature_matcher.py"]
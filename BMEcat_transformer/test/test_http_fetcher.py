@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Tests for scrapers/http_fetcher.py"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the BMEcat_transformer package directory so 'scrapers' resolves
+BMECAT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BMECAT_DIR))
+
+from scrapers.http_fetcher import FetchStats, HTTPFetcher
+
+
+def test_hedge_budget_holds_under_concurrent_reservations():
+    stats = FetchStats()
+    for _ in range(100):
+        stats.record(0.01, 200)
+    barrier = threading.Barrier(20)
+    granted = []
+
+    def reserve():
+        barrier.wait()
+        granted.append(stats.reserve_hedge(0.05))
+
+    threads = [threading.Thread(target=reserve) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert granted.count(True) == 5
+    assert stats.snapshot()["hedges"] == 5
+
+
+def test_server_errors_are_retried():
+    fetcher = HTTPFetcher(max_retries=1, backoff=0)
+    statuses = [500, 200]
+    fetcher._timed_get = lambda url: SimpleNamespace(status_code=statuses.pop(0), headers={})
+    assert fetcher.get("https://shop.example/p/1").status_code == 200
+    assert fetcher.stats.snapshot()["retries"] == 1
+    fetcher.close()
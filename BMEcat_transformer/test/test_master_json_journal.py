@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the journal mode of core/master_json_manager.py"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add the BMEcat_transformer package directory so 'core' resolves
+BMECAT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BMECAT_DIR))
+
+from core.master_json_manager import MasterJSONManager
+
+
+def _manager(directory, compact_after=100):
+    manager = MasterJSONManager("master.json", str(directory), journal=True, compact_after=compact_after)
+    manager.load()
+    return manager
+
+
+def _journal_pids(manager):
+    with open(manager.journal_path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["pid"] for line in f]
+
+
+def test_save_appends_only_changed_products(tmp_path):
+    manager = _manager(tmp_path)
+    manager.append_product("A", {"languages": {"de": {"x": "1"}}})
+    manager.append_product("B", {"languages": {}})
+    manager.save()
+    manager.update_product("A", {"languages": {"de": {"x": "2"}}})
+    manager.save()
+    manager.save()  # nothing changed: nothing appended
+
+    assert _journal_pids(manager) == ["A", "B", "A"]
+    assert not os.path.exists(manager.master_path)
+
+
+def test_load_replays_journal_and_skips_torn_line(tmp_path):
+    manager = _manager(tmp_path)
+    manager.append_product("A", {"languages": {"de": {"x": "1"}}})
+    manager.save()
+    manager.update_product("A", {"languages": {"de": {"x": "2"}}})
+    manager.save()
+    with open(manager.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"pid": "TORN", "prod')
+
+    reloaded = _manager(tmp_path)
+    assert reloaded.data["products"]["A"]["languages"] == {"de": {"x": "2"}}
+    assert "TORN" not in reloaded.data["products"]
+    assert reloaded.data["metadata"]["total_products"] == 1
+
+    # The next append starts on a fresh line after the torn one
+    reloaded.append_product("B", {"languages": {}})
+    reloaded.save()
+    assert "B" in _manager(tmp_path).data["products"]
+
+
+def test_compaction_writes_snapshot_and_trims_journal(tmp_path):
+    manager = _manager(tmp_path, compact_after=2)
+    manager.append_product("A", {"languages": {}})
+    manager.save()
+    manager.append_product("B", {"languages": {}})
+    manager.save()  # due: compacts in the background
+    manager.wait_for_compaction()
+
+    with open(manager.master_path, "r", encoding="utf-8") as f:
+        assert set(json.load(f)["products"]) == {"A", "B"}
+    assert not os.path.exists(manager.journal_path)
+
+    manager.append_product("C", {"languages": {}})
+    manager.save()
+    assert _journal_pids(manager) == ["C"]
+    assert set(_manager(tmp_path).data["products"]) == {"A", "B", "C"}
+
+
+def test_close_compacts_only_when_due(tmp_path):
+    manager = _manager(tmp_path, compact_after=3)
+    manager.append_product("A", {"languages": {}})
+    manager.close()
+    # Short journals are left for the next load to replay
+    assert _journal_pids(manager) == ["A"]
+    assert not os.path.exists(manager.master_path)
+
+    manager.append_product("B", {"languages": {}})
+    manager.append_product("C", {"languages": {}})
+    manager.close()
+    assert not os.path.exists(manager.journal_path)
+    with open(manager.master_path, "r", encoding="utf-8") as f:
+        assert set(json.load(f)["products"]) == {"A", "B", "C"}
+
+
+def test_plain_save_folds_in_leftover_journal(tmp_path):
+    manager = _manager(tmp_path)
+    manager.append_product("A", {"languages": {}})
+    manager.save()
+
+    plain = MasterJSONManager("master.json", str(tmp_path))
+    plain.load()
+    plain.save()
+    assert not os.path.exists(plain.journal_path)
+    with open(plain.master_path, "r", encoding="utf-8") as f:
+        assert set(json.load(f)["products"]) == {"A"}
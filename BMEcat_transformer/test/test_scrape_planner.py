@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for core/scrape_planner.py"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the BMEcat_transformer package directory so 'core' and 'utils' resolve
+BMECAT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BMECAT_DIR))
+
+from core.scrape_planner import ScrapePlanner
+
+LANGUAGES = ["de", "fr", "it"]
+
+
+def _features(count):
+    return [{"fname": f"F{i}", "fvalue": str(i)} for i in range(count)]
+
+
+def _specs(count):
+    return {f"F{i}": str(i) for i in range(count)}
+
+
+def _ago(days):
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def _plan(planner, original, dabag=None, web=None):
+    return planner.plan({"P1": original}, {"P1": dabag or {}}, {"P1": web} if web is not None else {})[0]
+
+
+def test_language_coverage_uses_best_source_per_language():
+    planner = ScrapePlanner(0.8, LANGUAGES)
+    coverage = planner.language_coverage(
+        _features(10), {"fr": _features(5)}, {"languages": {"fr": _specs(8), "it": _specs(2)}}
+    )
+    assert coverage == {"de": 1.0, "fr": 0.8, "it": 0.2}
+
+
+def test_unknown_product_is_scraped_in_lacking_languages():
+    planner = ScrapePlanner(0.8, LANGUAGES, search_requests=2)
+    entry = _plan(planner, _features(10), {"fr": _features(10)})
+    assert entry["action"] == "scrape"
+    assert entry["languages"] == ["it"]
+    assert entry["estimated_requests"] == 2 + len(LANGUAGES)
+    assert not entry["in_master"]
+
+
+def test_covered_product_and_product_without_url_are_skipped():
+    planner = ScrapePlanner(0.5, LANGUAGES)
+    dabag = {"fr": _features(10), "it": _features(10)}
+    assert _plan(planner, _features(10), dabag)["action"] == "skip"
+    # Search found nothing last time: not retried
+    entry = _plan(planner, _features(10), web={"product_url": None, "languages": {}})
+    assert entry["action"] == "skip" and entry["in_master"]
+
+
+def test_refresh_only_covers_missing_or_empty_languages():
+    planner = ScrapePlanner(0.8, LANGUAGES)
+    web = {"product_url": "https://shop.example/p1", "languages": {"de": _specs(10), "fr": {}, "it": _specs(3)}}
+    entry = _plan(planner, _features(10), web=web)
+    # "it" was answered by the web already (just with fewer specs): refreshing cannot help
+    assert entry["action"] == "refresh"
+    assert entry["languages"] == ["fr"]
+    assert entry["estimated_requests"] == 1
+
+
+def test_refresh_skips_when_only_answered_languages_lack_coverage():
+    planner = ScrapePlanner(0.8, LANGUAGES)
+    web = {"product_url": "https://shop.example/p1", "languages": {"de": _specs(10), "fr": _specs(10), "it": _specs(3)}}
+    assert _plan(planner, _features(10), web=web)["action"] == "skip"
+
+
+def test_stale_languages_are_refreshed():
+    planner = ScrapePlanner(0.8, LANGUAGES, stale_after_days=30)
+    web = {
+        "product_url": "https://shop.example/p1",
+        "languages": {"de": _specs(10), "fr": _specs(3), "it": _specs(3)},
+        "language_scraped_at": {"fr": _ago(60), "it": _ago(1)},
+        "scraped_at": _ago(90),
+    }
+    assert planner.refreshable_languages(web) == ["de", "fr"]
+    # "de" is stale (entry timestamp) but fully covered, so only "fr" is planned
+    assert _plan(planner, _features(10), web=web)["languages"] == ["fr"]
+
+
+def test_missing_timestamps_count_as_stale():
+    planner = ScrapePlanner(0.8, ["de"], stale_after_days=30)
+    assert planner.refreshable_languages({"languages": {"de": _specs(1)}}) == ["de"]
+    assert ScrapePlanner(0.8, ["de"]).refreshable_languages({"languages": {"de": _specs(1)}}) == []
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for core/sqlite_product_store.py"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the BMEcat_transformer package directory so 'core' resolves
+BMECAT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BMECAT_DIR))
+
+from core.sqlite_product_store import BACKUP_INTERVAL_HOURS, SQLiteProductStore
+
+MASTER = {
+    "metadata": {"created_at": "2025-01-01T00:00:00", "last_updated": "2025-01-02T00:00:00", "total_products": 2},
+    "products": {
+        "B-2": {"product_url": "https://shop.example/b", "languages": {"de": {"Farbe": "Rot"}, "fr": {"Couleur": "Rouge"}}},
+        "A-1": {"product_url": "https://shop.example/a", "languages": {}, "scraped_at": "2025-01-01T00:00:00"},
+    },
+}
+
+
+def _store(directory, **kwargs):
+    store = SQLiteProductStore("products.sqlite", str(directory), **kwargs)
+    store.load()
+    return store
+
+
+def test_new_store_imports_master_json_and_exports_it_back(tmp_path):
+    (tmp_path / "master.json").write_text(json.dumps(MASTER), encoding="utf-8")
+    store = _store(tmp_path, json_filename="master.json")
+    assert store.get_statistics()["total_products"] == 2
+    assert store.get_statistics()["created_at"] == "2025-01-01T00:00:00"
+
+    exported = tmp_path / "export.json"
+    assert store.export_json(str(exported)) == 2
+    data = json.loads(exported.read_text(encoding="utf-8"))
+    assert data["products"] == MASTER["products"]
+    assert list(data["products"]) == ["A-1", "B-2"]
+    store.close()
+
+
+def test_products_round_trip_through_reopen(tmp_path):
+    store = _store(tmp_path)
+    store.append_product("P1", {"product_url": "u", "languages": {"de": {"a": "1"}, "it": {"b": "2"}}})
+    store.close()
+
+    reopened = _store(tmp_path)
+    exists, product = reopened.check_id_exists("P1")
+    assert exists and product["languages"] == {"de": {"a": "1"}, "it": {"b": "2"}}
+    assert "scraped_at" in product
+    assert reopened.check_id_exists("missing") == (False, None)
+    reopened.close()
+
+
+def test_merge_keeps_stored_languages_and_bumps_updated_at_only_on_change(tmp_path):
+    store = _store(tmp_path)
+    store.append_product("P1", {"languages": {"de": {"a": "1"}, "fr": {"b": "2"}}})
+
+    merged = store.merge_product_languages("P1", {"languages": {"de": {"a": "9"}, "fr": {}}})
+    assert merged["languages"] == {"de": {"a": "9"}, "fr": {"b": "2"}}
+    updated_at = merged["updated_at"]
+
+    unchanged = store.merge_product_languages("P1", {"languages": {"de": {"a": "9"}}})
+    assert unchanged["updated_at"] == updated_at
+    store.close()
+
+
+def test_backups_are_taken_at_most_once_per_interval(tmp_path):
+    store = _store(tmp_path)
+    store.append_product("P1", {"languages": {}})
+    store.close()
+    backup = tmp_path / "products.sqlite.backup1"
+    assert not backup.exists()  # a new database has nothing to back up
+
+    _store(tmp_path).close()
+    assert backup.exists()
+    _store(tmp_path).close()
+    assert not (tmp_path / "products.sqlite.backup2").exists()
+
+    aged = time.time() - BACKUP_INTERVAL_HOURS * 3600 - 60
+    os.utime(backup, (aged, aged))
+    _store(tmp_path).close()
+    assert (tmp_path / "products.sqlite.backup2").exists()
+
+
+def test_import_into_non_empty_store_backs_up_first(tmp_path):
+    (tmp_path / "master.json").write_text(json.dumps(MASTER), encoding="utf-8")
+    store = _store(tmp_path)
+    store.import_json(str(tmp_path / "master.json"))
+    assert not (tmp_path / "products.sqlite.backup1").exists()
+
+    store.import_json(str(tmp_path / "master.json"))
+    assert (tmp_path / "products.sqlite.backup1").exists()
+    store.close()
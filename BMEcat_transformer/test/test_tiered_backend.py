@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for scrapers/tiered_backend.py"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the BMEcat_transformer package directory so 'scrapers' resolves
+BMECAT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BMECAT_DIR))
+
+from scrapers.tiered_backend import TierStats, TieredScraper
+
+URL = "https://www.shop.example/p/1"
+GOOD = {"markdown_content": "Spec " * 100, "status_code": "200"}
+BLOCKED = {"markdown_content": "Access denied", "status_code": "403"}
+EMPTY = {"markdown_content": "", "status_code": "200"}
+
+
+def _scraper(results, **kwargs):
+    """Scraper whose tiers return canned results; `calls` lists the tiers tried."""
+    scraper = TieredScraper(fetcher=object(), **kwargs)
+    scraper.calls = []
+
+    def fake_fetch(tier, url, profile):
+        scraper.calls.append(tier)
+        result = results.get(tier)
+        return dict(result) if result else None
+
+    scraper._fetch = fake_fetch
+    return scraper
+
+
+def _attempts(scraper, tier):
+    return scraper.stats.data.get("shop.example", {}).get(tier, {"attempts": 0, "successes": 0})
+
+
+def test_cheapest_working_tier_wins():
+    scraper = _scraper({"http": GOOD, "playwright": GOOD})
+    content = scraper.scrape_page(URL)
+    assert content["tier"] == "http"
+    assert scraper.calls == ["http"]
+
+
+def test_failures_escalate_and_are_recorded_once_a_tier_succeeds():
+    scraper = _scraper({"http": BLOCKED, "playwright": EMPTY, "firecrawl_basic": GOOD})
+    assert scraper.scrape_page(URL)["tier"] == "firecrawl_basic"
+    assert scraper.calls == ["http", "playwright", "firecrawl_basic"]
+    assert _attempts(scraper, "http") == {"attempts": 1, "successes": 0}
+    assert _attempts(scraper, "firecrawl_basic") == {"attempts": 1, "successes": 1}
+
+
+def test_nothing_is_recorded_when_every_tier_fails():
+    scraper = _scraper({})
+    assert scraper.scrape_page(URL) is None
+    assert scraper.calls == ["http", "playwright", "firecrawl_basic", "firecrawl_stealth"]
+    assert scraper.stats.data == {}
+
+
+def test_target_miss_escalates_only_one_tier():
+    scraper = _scraper({tier: GOOD for tier in ("http", "playwright", "firecrawl_basic")})
+    assert scraper.scrape_page(URL, target_check=lambda content: content.get("tier") == "never") is None
+    assert scraper.calls == ["http", "playwright"]
+
+
+def test_target_found_by_the_next_tier():
+    with_table = dict(GOOD, markdown_content=GOOD["markdown_content"] + "| a | b |")
+    scraper = _scraper({"http": GOOD, "playwright": with_table}, target_check=lambda c: "|" in c["markdown_content"])
+    assert scraper.scrape_page(URL)["tier"] == "playwright"
+
+
+def test_known_bad_tiers_are_skipped_but_the_strongest_is_kept():
+    scraper = _scraper({"playwright": GOOD}, tiers=["http", "playwright"], min_samples=2)
+    for _ in range(2):
+        scraper.stats.record(URL, "http", False)
+        scraper.stats.record(URL, "playwright", False)
+    assert scraper.tiers_for("https://shop.example/other") == ["playwright"]
+    assert scraper.scrape_page(URL)["tier"] == "playwright"
+    assert scraper.calls == ["playwright"]
+
+
+def test_firecrawl_tiers_respect_the_escalation_budget():
+    class FakeFirecrawl:
+        def __init__(self):
+            self.modes = []
+
+        def scrape_with_proxy(self, url, mode, profile):
+            self.modes.append(mode)
+            return dict(BLOCKED) if mode == "basic" else dict(GOOD)
+
+    class FakePolicy:
+        """Budget of 4 credits: basic costs 1, stealth 5 (like StealthEscalationPolicy)."""
+
+        def __init__(self):
+            self.spent = 0
+            self.records = []
+
+        def can_afford(self, mode):
+            return self.spent + (5 if mode == "stealth" else 1) <= 4
+
+        def record(self, url, mode, content, blocked, escalated=False):
+            self.spent += 5 if mode == "stealth" else 1
+            self.records.append((mode, blocked, escalated))
+
+    policy = FakePolicy()
+    scraper = TieredScraper(fetcher=object(), tiers=["firecrawl_basic", "firecrawl_stealth"], escalation_policy=policy)
+    firecrawl = FakeFirecrawl()
+    scraper._backends["firecrawl"] = firecrawl
+
+    assert scraper.scrape_page(URL) is None
+    # Basic ran and was charged as escalation; stealth no longer fits the budget
+    assert firecrawl.modes == ["basic"]
+    assert policy.records == [("basic", True, True)]
+
+
+def test_tier_stats_save_periodically_and_reload(tmp_path):
+    path = tmp_path / "tier_stats.json"
+    stats = TierStats(str(path), save_every=2)
+    stats.record(URL, "http", True)
+    assert not path.exists()
+    stats.record(URL, "http", False)
+    assert json.loads(path.read_text())["shop.example"]["http"] == {"attempts": 2, "successes": 1}
+
+    stats.record(URL, "http", True)
+    stats.save()
+    reloaded = TierStats(str(path))
+    assert reloaded.success_rate(URL, "http", min_samples=3) == 2 / 3
+    assert reloaded.success_rate(URL, "http", min_samples=4) is None
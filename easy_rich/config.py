@@ -2,6 +2,8 @@
 Configuration settings for the Generic Web Scraper.
 """
 
+import os
+
 # Proxy Settings
 DEFAULT_PROXY_MODE = "auto"  # "auto", "basic", "stealth"
 MANUAL_STEALTH_OVERRIDE = False  # Force stealth from start if True
@@ -18,3 +20,41 @@ STEALTH_WARNING_MSG = "💰 Stealth mode costs {} credits per request"
 BOT_DETECTED_MSG = "❌ Bot detected (Status: {})"
 STEALTH_PROMPT_MSG = "🤔 Try stealth mode? [y/N]: "
 STEALTH_TRYING_MSG = "🥷 Trying stealth mode..."
+
+# Batch Scraping (WebScraper.scrape_batch)
+BATCH_POLL_INTERVAL = 2   # Seconds between batch job status polls
+BATCH_TIMEOUT = 600       # Seconds before unfinished batch pages are given up
+
+# Default scrape profile: "links", "markdown", "markdown_links" or "markdown_json"
+# (markdown_json adds an LLM extraction: slower and more credits)
+DEFAULT_SCRAPE_PROFILE = "markdown_json"
+
+# Unattended Proxy Escalation (src/stealth_escalation.py)
+AUTO_ESCALATION = False        # Escalate auto -> basic -> stealth without prompting
+CREDIT_BUDGET = 100            # Credits a run may spend on escalation (stealth + retries after a block); None: no limit
+BASIC_CREDITS_COST = 1         # Credits per basic request (auto is charged as stealth)
+BLOCK_RATE_THRESHOLD = 0.5     # Domains blocking this share of requests start with stealth
+BLOCK_RATE_MIN_SAMPLES = 3     # Requests before a domain's block rate is trusted
+
+# Site Crawling (manual_scrape/src/site_crawler.py)
+CRAWL_MAX_DEPTH = 2          # Link distance from the seed URL
+CRAWL_MAX_PAGES = 50         # Pages fetched per crawl run
+CRAWL_CONCURRENCY = 4        # Pages fetched at once
+CRAWL_DELAY = 1.0            # Seconds between requests to the same domain
+CRAWL_RESPECT_ROBOTS = True  # Honour robots.txt rules and Crawl-delay
+
+# Near-Duplicate Detection (manual_scrape/src/near_duplicate.py)
+NEAR_DUPLICATE_DETECTION = True     # SimHash each scraped page; skip saving near-duplicates
+NEAR_DUPLICATE_MAX_DISTANCE = 3     # Max differing bits (of 64) counted as near-duplicate
+# Kept in this package folder, separate from manual_scrape's index
+NEAR_DUPLICATE_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".near_duplicate_index.jsonl")
+
+# SerpAPI Response Cache (manual_scrape/src/serp_cache.py, shared with manual_scrape)
+SERP_CACHE_ENABLED = True     # Answer repeated searches from a local SQLite cache
+SERP_CACHE_TTL_HOURS = 24     # Age until a cached response is refreshed
+SERP_CACHE_STALE_HOURS = 144  # Stale responses still served (and refreshed in the background) this long
+SERP_CACHE_PATH = None        # None: manual_scrape/.serp_cache.sqlite, one cache for both scrapers
+
+# Concurrent Searches (SerpAPIClient.search_many in manual_scrape/src/serp_api_client.py)
+SERP_MAX_CONCURRENCY = 5      # Searches sent to SerpAPI at once
+SERP_CREDIT_BUDGET = None     # Searches a client may send (cache hits are free); None: no limit
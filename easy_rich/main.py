@@ -5,11 +5,16 @@ Searches for user input on the web and scrapes the page content.
 """
 
 from typing import Tuple, Optional, List
-from src.serp_api_client import SerpAPIClient
-from src.web_scraper import WebScraper
+from src.web_scraper import WebScraper, close_session_writer
+from src.stealth_escalation import StealthEscalationPolicy, get_default_policy
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The search client, its cache and the site crawler are shared with manual_scrape
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manual_scrape.src.serp_api_client import SerpAPIClient  # type: ignore
+from manual_scrape.src.serp_cache import get_serp_cache  # type: ignore
+from manual_scrape.src.site_crawler import SiteCrawler  # type: ignore
 from config import MANUAL_STEALTH_OVERRIDE, DEFAULT_PROXY_MODE
 import config
 
@@ -20,13 +25,16 @@ def get_scraping_mode() -> str:
     print("Choose your option:")
     print("1. Search the web for something")
     print("2. Enter a direct URL to scrape")
+    print("3. Crawl a site from a seed URL")
     
     while True:
-        choice = input("Your choice (1, 2): ").strip()
+        choice = input("Your choice (1, 2, 3): ").strip()
         if choice == "1":
             return "search"
         elif choice == "2":
             return "url"
+        elif choice == "3":
+            return "crawl"
         else:
             print("Please enter a valid choice")
 
@@ -51,6 +59,45 @@ def get_direct_url() -> str:
     return url
 
 
+def get_crawl_limits() -> Tuple[int, int]:
+    """Get optional page and depth limits for a crawl (Enter keeps the config defaults)."""
+    max_pages = input(f"Max pages to crawl [{config.CRAWL_MAX_PAGES}]: ").strip()
+    max_depth = input(f"Max link depth [{config.CRAWL_MAX_DEPTH}]: ").strip()
+    if (max_pages and not max_pages.isdigit()) or (max_depth and not max_depth.isdigit()):
+        raise ValueError("Limits must be whole numbers!")
+    return (
+        int(max_pages) if max_pages else config.CRAWL_MAX_PAGES,
+        int(max_depth) if max_depth else config.CRAWL_MAX_DEPTH,
+    )
+
+
+def run_crawl(web_scraper: WebScraper) -> None:
+    """Crawl a site from a seed URL into its own session folder."""
+    seed_url = get_direct_url()
+    max_pages, max_depth = get_crawl_limits()
+    session_folder = web_scraper.create_session_folder(seed_url, "crawl")
+    print(f"Created session folder: {session_folder}")
+    print(f"\nCrawling {seed_url} (max {max_pages} pages, depth {max_depth})...")
+
+    # Crawl workers must never prompt: escalate within the credit budget instead
+    if web_scraper.escalation_policy is None:
+        web_scraper = WebScraper(escalation_policy=StealthEscalationPolicy())
+
+    crawler = SiteCrawler(
+        web_scraper,
+        session_folder,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        concurrency=config.CRAWL_CONCURRENCY,
+        delay=config.CRAWL_DELAY,
+        respect_robots=config.CRAWL_RESPECT_ROBOTS,
+    )
+    stats = crawler.crawl(seed_url)
+    print(f"✅ Crawl finished: {stats['saved']} pages saved, {stats['failed']} failed, "
+          f"{stats['duplicates']} near-duplicates skipped, {stats['disallowed']} disallowed by robots.txt, "
+          f"{stats['frontier'].get('queued', 0)} still queued ({stats['seconds']}s)")
+
+
 def display_subpage_menu(links: List[Tuple[str, str]]) -> None:
     """Display available subpages in a numbered menu with improved formatting."""
     if not links:
@@ -124,6 +171,10 @@ def main() -> None:
                 # Create WebScraper instance after applying any session overrides
                 web_scraper = WebScraper()
                 
+                if mode == "crawl":
+                    run_crawl(web_scraper)
+                    continue
+
                 if mode == "search":
                     # Original search workflow
                     search_text, website = get_search_input()
@@ -173,8 +224,11 @@ def main() -> None:
 
                 print(f"Successfully scraped: {scraped_content['title']}")
                 
-                # Save content to session folder
-                web_scraper.save_content_to_session(scraped_content, filename, session_folder)
+                # Save content to session folder (near-duplicates of saved pages are skipped)
+                if scraped_content.get("near_duplicate_of"):
+                    print(f"Not saved: near-duplicate of {scraped_content['near_duplicate_of']}")
+                else:
+                    web_scraper.save_content_to_session(scraped_content, filename, session_folder)
                 
                 # Extract and display subpage options
                 links = web_scraper.extract_links_from_markdown(
@@ -216,7 +270,10 @@ def main() -> None:
                                 subpage_filename = subpage_filename or "subpage"
                             
                             print(f"Successfully scraped subpage: {subpage_content['title']}")
-                            web_scraper.save_content_to_session(subpage_content, subpage_filename, session_folder)
+                            if subpage_content.get("near_duplicate_of"):
+                                print(f"Not saved: near-duplicate of {subpage_content['near_duplicate_of']}")
+                            else:
+                                web_scraper.save_content_to_session(subpage_content, subpage_filename, session_folder)
                             
                             # Extract links from subpage for further exploration
                             subpage_links = web_scraper.extract_links_from_markdown(
@@ -246,6 +303,11 @@ def main() -> None:
     except Exception as e:
         print(f"Application error: {e}")
     finally:
+        # Let background search-cache refreshes finish before the report
+        if 'serp_client' in locals():
+            serp_client.close()
+        # Flush session files still queued in the background writer
+        close_session_writer()
         # Restore proxy mode if it was overridden for stealth session
         try:
             if 'stealth_session_applied' in locals() and stealth_session_applied:
@@ -253,6 +315,16 @@ def main() -> None:
         except Exception:
             pass
     
+    # Report credit spend when unattended escalation was enabled
+    policy = get_default_policy()
+    if policy is not None:
+        policy.print_report()
+    
+    # Report how many searches the response cache answered
+    serp_cache = get_serp_cache()
+    if serp_cache is not None:
+        serp_cache.print_report()
+    
     print("Scraping session completed!")
 
 
@@ -0,0 +1,231 @@
+"""Budget-aware proxy escalation for unattended Firecrawl scraping.
+
+Replaces the interactive stealth prompt: a blocked request (status in
+`BOT_DETECTION_CODES`) is retried up the proxy ladder auto -> basic ->
+stealth as long as the credit budget allows. The budget caps escalation
+spend only (stealth requests and retries after a block); first attempts in
+a cheaper mode are never refused. Per-domain block rates are tracked so
+domains known to block start directly with stealth. Spend and success
+counters can be printed at the end of a run.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from config import (
+        DEFAULT_PROXY_MODE, STEALTH_CREDITS_COST, BASIC_CREDITS_COST, CREDIT_BUDGET,
+        AUTO_ESCALATION, BLOCK_RATE_THRESHOLD, BLOCK_RATE_MIN_SAMPLES
+    )
+except ImportError:
+    # Fallback values if config.py doesn't define them
+    DEFAULT_PROXY_MODE = "auto"
+    STEALTH_CREDITS_COST = 5
+    BASIC_CREDITS_COST = 1
+    CREDIT_BUDGET = 100
+    AUTO_ESCALATION = False
+    BLOCK_RATE_THRESHOLD = 0.5
+    BLOCK_RATE_MIN_SAMPLES = 3
+
+# Proxy modes from cheapest to most expensive
+PROXY_LADDER = ["auto", "basic", "stealth"]
+
+
+class StealthEscalationPolicy:
+    """Decide proxy modes per request within a credit budget."""
+
+    def __init__(
+        self,
+        credit_budget: float = CREDIT_BUDGET,
+        stealth_cost: float = STEALTH_CREDITS_COST,
+        basic_cost: float = BASIC_CREDITS_COST,
+        block_rate_threshold: float = BLOCK_RATE_THRESHOLD,
+        min_domain_samples: int = BLOCK_RATE_MIN_SAMPLES,
+        start_mode: str = DEFAULT_PROXY_MODE,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            credit_budget: Credits the run may spend on escalation (stealth
+                requests and retries after a block); None: no limit.
+            stealth_cost: Credits per stealth request.
+            basic_cost: Credits per basic request. Auto requests are charged
+                the stealth cost, since Firecrawl bills an auto request that
+                falls back to stealth as stealth.
+            block_rate_threshold: Domains blocking at least this share of
+                requests start directly with stealth.
+            min_domain_samples: Requests needed before a domain's block rate
+                is trusted.
+            start_mode: First proxy mode for domains not known to block.
+        """
+        self.credit_budget = credit_budget
+        self.costs = {"auto": max(basic_cost, stealth_cost), "basic": basic_cost, "stealth": stealth_cost}
+        self.block_rate_threshold = block_rate_threshold
+        self.min_domain_samples = min_domain_samples
+        self.start_mode = start_mode if start_mode in PROXY_LADDER else "auto"
+        self.spent = 0.0
+        self.escalation_spent = 0.0
+        self.mode_stats: Dict[str, Dict[str, int]] = {
+            mode: {"attempts": 0, "successes": 0, "blocked": 0, "errors": 0} for mode in PROXY_LADDER
+        }
+        self.domain_stats: Dict[str, Dict[str, int]] = {}
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def cost(self, mode: str) -> float:
+        """Credits charged for one request in a proxy mode."""
+        return self.costs.get(mode, self.costs["auto"])
+
+    def remaining(self) -> float:
+        """Escalation credits left in the budget."""
+        if self.credit_budget is None:
+            return float("inf")
+        with self._lock:
+            return self.credit_budget - self.escalation_spent
+
+    def can_afford(self, mode: str, escalated: bool = True) -> bool:
+        """Whether the budget still covers one request in this mode.
+
+        Args:
+            mode: Proxy mode of the request.
+            escalated: Whether the request retries a blocked attempt; first
+                attempts are only budgeted in stealth mode.
+        """
+        if not escalated and mode != "stealth":
+            return True
+        return self.remaining() >= self.cost(mode)
+
+    def block_rate(self, url: str) -> Optional[float]:
+        """Observed block rate of the URL's domain, or None with too few samples."""
+        with self._lock:
+            stats = self.domain_stats.get(self._domain(url))
+            if not stats or stats["requests"] < self.min_domain_samples:
+                return None
+            return stats["blocked"] / stats["requests"]
+
+    def first_mode(self, url: str) -> Optional[str]:
+        """Proxy mode for the first attempt, or None when the budget is spent."""
+        rate = self.block_rate(url)
+        if rate is not None and rate >= self.block_rate_threshold and self.can_afford("stealth"):
+            print(f"🥷 {self._domain(url)} blocks {rate:.0%} of requests; starting with stealth")
+            return "stealth"
+        if self.can_afford(self.start_mode, escalated=False):
+            return self.start_mode
+        self._note_exhausted()
+        return None
+
+    def next_mode(self, current: str) -> Optional[str]:
+        """Next affordable proxy mode after a blocked attempt, or None."""
+        index = PROXY_LADDER.index(current) if current in PROXY_LADDER else 0
+        if index + 1 >= len(PROXY_LADDER):
+            return None
+        mode = PROXY_LADDER[index + 1]
+        if self.can_afford(mode):
+            return mode
+        self._note_exhausted()
+        return None
+
+    def _note_exhausted(self) -> None:
+        with self._lock:
+            self.budget_exhausted += 1
+        print(f"💸 Credit budget exhausted ({self.escalation_spent:.0f}/{self.credit_budget:.0f}); not escalating")
+
+    def record(
+        self, url: str, mode: str, content: Optional[Dict[str, Any]], blocked: bool, escalated: bool = False
+    ) -> None:
+        """
+        Record the outcome of one attempt and charge its credits.
+
+        Args:
+            url: Requested URL.
+            mode: Proxy mode used.
+            content: Scrape result (None on errors).
+            blocked: Whether bot detection triggered.
+            escalated: Whether the attempt retried a blocked one (charged to
+                the budget, like every stealth attempt).
+        """
+        with self._lock:
+            self.spent += self.cost(mode)
+            if escalated or mode == "stealth":
+                self.escalation_spent += self.cost(mode)
+            stats = self.mode_stats.setdefault(mode, {"attempts": 0, "successes": 0, "blocked": 0, "errors": 0})
+            stats["attempts"] += 1
+            if blocked:
+                stats["blocked"] += 1
+            elif content is None:
+                stats["errors"] += 1
+            else:
+                stats["successes"] += 1
+
+            if mode != "stealth":
+                # Block rates describe the non-stealth proxies only
+                domain = self.domain_stats.setdefault(self._domain(url), {"requests": 0, "blocked": 0})
+                domain["requests"] += 1
+                if blocked:
+                    domain["blocked"] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Return spend, per-mode counters and the most-blocking domains."""
+        with self._lock:
+            blocking: List[Dict[str, Any]] = sorted(
+                (
+                    {"domain": d, "requests": s["requests"], "blocked": s["blocked"],
+                     "block_rate": s["blocked"] / s["requests"] if s["requests"] else 0.0}
+                    for d, s in self.domain_stats.items() if s["blocked"]
+                ),
+                key=lambda item: item["block_rate"],
+                reverse=True,
+            )
+            return {
+                "credits_spent": self.spent,
+                "escalation_spent": self.escalation_spent,
+                "credit_budget": self.credit_budget,
+                "budget_exhausted": self.budget_exhausted,
+                "modes": {mode: dict(stats) for mode, stats in self.mode_stats.items()},
+                "blocking_domains": blocking,
+            }
+
+    def print_report(self) -> None:
+        """Print the spend and success summary."""
+        report = self.report()
+        attempts = sum(stats["attempts"] for stats in report["modes"].values())
+        if not attempts:
+            return
+        print("\n" + "=" * 80)
+        print("Proxy Escalation Summary")
+        print("-" * 80)
+        budget = "unlimited" if report["credit_budget"] is None else f"{report['credit_budget']:.0f}"
+        print(f"Credits spent: {report['credits_spent']:.0f} | on escalation: {report['escalation_spent']:.0f} / {budget}"
+              f" | escalations refused (budget): {report['budget_exhausted']}")
+        for mode, stats in report["modes"].items():
+            if stats["attempts"]:
+                print(f"  {mode:<8} attempts: {stats['attempts']:<5} ok: {stats['successes']:<5} "
+                      f"blocked: {stats['blocked']:<5} errors: {stats['errors']}")
+        for item in report["blocking_domains"][:10]:
+            print(f"  🚫 {item['domain']}: {item['blocked']}/{item['requests']} blocked ({item['block_rate']:.0%})")
+        print("-" * 80)
+
+
+_default_policy: Optional[StealthEscalationPolicy] = None
+_default_lock = threading.Lock()
+
+
+def get_default_policy() -> Optional[StealthEscalationPolicy]:
+    """Return the process-wide policy when `AUTO_ESCALATION` is enabled, else None."""
+    global _default_policy
+    if not AUTO_ESCALATION:
+        return None
+    with _default_lock:
+        if _default_policy is None:
+            _default_policy = StealthEscalationPolicy()
+        return _default_policy
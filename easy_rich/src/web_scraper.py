@@ -1,18 +1,31 @@
-from typing import Optional, Dict, List, Tuple, Set
+from typing import Any, Iterator, Optional, Dict, List, Tuple, Set
 import os
 import sys
+import time
 from firecrawl import Firecrawl
 from dotenv import load_dotenv
 import re
 from urllib.parse import urlparse, urljoin
 
+from .stealth_escalation import StealthEscalationPolicy, get_default_policy
+
+# Helpers shared with manual_scrape (one implementation, imported from there)
+PARENT_PROJECT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PARENT_PROJECT not in sys.path:
+    sys.path.append(PARENT_PROJECT)
+from manual_scrape.src.near_duplicate import (  # type: ignore
+    NearDuplicateIndex, annotate_near_duplicate, get_near_duplicate_index,
+)
+from manual_scrape.src.session_writer import close_session_writer, get_session_writer  # type: ignore
+
 # Add config imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from config import (
         DEFAULT_PROXY_MODE, BOT_DETECTION_CODES, STEALTH_COST_WARNING, 
         STEALTH_CREDITS_COST, STEALTH_WARNING_MSG, BOT_DETECTED_MSG, 
-        STEALTH_PROMPT_MSG, STEALTH_TRYING_MSG
+        STEALTH_PROMPT_MSG, STEALTH_TRYING_MSG, BATCH_POLL_INTERVAL, BATCH_TIMEOUT,
+        DEFAULT_SCRAPE_PROFILE
     )
 except ImportError:
     # Fallback values if config.py doesn't exist yet
@@ -24,18 +37,87 @@ except ImportError:
     BOT_DETECTED_MSG = "❌ Bot detected (Status: {})"
     STEALTH_PROMPT_MSG = "🤔 Try stealth mode? [y/N]: "
     STEALTH_TRYING_MSG = "🥷 Trying stealth mode..."
+    BATCH_POLL_INTERVAL = 2
+    BATCH_TIMEOUT = 600
+    DEFAULT_SCRAPE_PROFILE = "markdown_json"
+
+# Generic LLM extraction prompt used by the "markdown_json" profile
+JSON_EXTRACTION_PROMPT = "Extract key information from this page including title, main content summary, key points, and any important data like prices, dates, or contact information."
+
+# Output formats per scrape profile, cheapest first. LLM JSON extraction adds
+# seconds of latency and extra credits, so only request it when needed.
+SCRAPE_PROFILES: Dict[str, List[Any]] = {
+    "links": ["links"],
+    "markdown": ["markdown"],
+    "markdown_links": ["markdown", "links"],
+    "markdown_json": ["markdown", {"type": "json", "prompt": JSON_EXTRACTION_PROMPT}],
+}
+
+# Formats of the default profile (kept for callers importing the constant)
+SCRAPE_FORMATS = SCRAPE_PROFILES["markdown_json"]
+
+
+def scrape_formats(profile: Optional[str] = None, json_schema: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    Return the Firecrawl formats for a scrape profile.
+
+    Args:
+        profile: Key of `SCRAPE_PROFILES`; defaults to `DEFAULT_SCRAPE_PROFILE`.
+        json_schema: JSON schema for structured extraction. Adds a schema-driven
+            json format (replacing the generic prompt) to the profile's formats.
+
+    Returns:
+        Formats list for `Firecrawl.scrape` / `start_batch_scrape`.
+    """
+    name = profile or DEFAULT_SCRAPE_PROFILE
+    if name not in SCRAPE_PROFILES:
+        print(f"⚠️ Warning: Unknown scrape profile '{name}', using '{DEFAULT_SCRAPE_PROFILE}'")
+        name = DEFAULT_SCRAPE_PROFILE
+    formats = list(SCRAPE_PROFILES[name])
+    if json_schema is not None:
+        formats = [f for f in formats if not isinstance(f, dict)]
+        if "markdown" not in formats:
+            formats.insert(0, "markdown")
+        formats.append({"type": "json", "schema": json_schema})
+    return formats
+
+
+def _normalize_url(url: str) -> str:
+    """Normalize a URL for matching batch results to requested URLs."""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    query = f"?{parsed.query}" if parsed.query else ""
+    host = parsed.netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    return f"{host}{path}{query}"
 
 
 class WebScraper:
     """Web scraper for extracting content from web pages."""
 
-    def __init__(self) -> None:
-        """Initialize Firecrawl client."""
+    def __init__(
+        self,
+        escalation_policy: Optional[StealthEscalationPolicy] = None,
+        near_duplicate_index: Optional[NearDuplicateIndex] = None,
+    ) -> None:
+        """
+        Initialize Firecrawl client.
+
+        Args:
+            escalation_policy: Escalate blocked requests automatically within a
+                credit budget instead of prompting. Defaults to the shared
+                policy when `AUTO_ESCALATION` is enabled in config.
+            near_duplicate_index: SimHash index used to flag near-duplicate
+                pages. Defaults to the shared index when
+                `NEAR_DUPLICATE_DETECTION` is enabled in config.
+        """
         load_dotenv()
         api_key = os.getenv("FIRECRAWL_API_KEY")
         if not api_key:
             raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
         self.firecrawl = Firecrawl(api_key=api_key)
+        self.escalation_policy = escalation_policy or get_default_policy()
+        self.near_duplicate_index = near_duplicate_index or get_near_duplicate_index()
 
     def is_bot_detected(self, status_code: str) -> bool:
         """Check if the response indicates bot detection."""
@@ -58,61 +140,93 @@ class WebScraper:
             else:
                 print("Please enter 'y' or 'n'")
 
-    def scrape_with_proxy(self, url: str, proxy_mode: str = DEFAULT_PROXY_MODE) -> Optional[Dict[str, str]]:
+    def scrape_with_proxy(
+        self,
+        url: str,
+        proxy_mode: str = DEFAULT_PROXY_MODE,
+        profile: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, str]]:
         """
         Scrape content with specified proxy mode.
         
         Args:
             url: URL to scrape
             proxy_mode: Proxy mode ("auto", "basic", "stealth")
+            profile: Scrape profile ("links", "markdown", "markdown_links", "markdown_json")
+            json_schema: Optional JSON schema for structured extraction
         
         Returns:
             Scraped content dict or None if failed
         """
-        try:
-            result = self.firecrawl.scrape(
-                url,
-                proxy=proxy_mode,
-                formats=[
-                    "markdown",
-                    {
-                        "type": "json",
-                        "prompt": "Extract key information from this page including title, main content summary, key points, and any important data like prices, dates, or contact information.",
-                    },
-                ],
-            )
+        return self._scrape(url, proxy_mode, scrape_formats(profile, json_schema))
 
-            # Access attributes from Firecrawl Document object safely
-            has_metadata = hasattr(result, "metadata") and result.metadata is not None
-            title = getattr(result.metadata, "title", "No title found") if has_metadata else "No title found"
-            status_code = getattr(result.metadata, "statusCode", "Unknown") if has_metadata else "Unknown"
-            markdown_content = getattr(result, "markdown", "")
-            structured_data = getattr(result, "json", {})
-
-            return {
-                "url": url,
-                "title": title,
-                "markdown_content": markdown_content,
-                "structured_data": structured_data,
-                "status_code": str(status_code),
-            }
+    def _scrape(self, url: str, proxy_mode: str, formats: List[Any]) -> Optional[Dict[str, str]]:
+        """Single Firecrawl scrape with explicit formats."""
+        try:
+            result = self.firecrawl.scrape(url, proxy=proxy_mode, formats=formats)
+            return self._document_to_result(url, result)
 
         except Exception as e:  # noqa: BLE001 - broad except with logging for robustness
             print(f"Error scraping {url}: {e}")
             return None
 
-    def scrape_page(self, url: str) -> Optional[Dict[str, str]]:
+    @staticmethod
+    def _document_to_result(url: str, result: Any) -> Dict[str, str]:
+        """Convert a Firecrawl Document into the scraper's result dict."""
+        # Access attributes from Firecrawl Document object safely
+        has_metadata = hasattr(result, "metadata") and result.metadata is not None
+        title = getattr(result.metadata, "title", None) if has_metadata else None
+        status_code = None
+        if has_metadata:
+            status_code = getattr(result.metadata, "status_code", None) or getattr(result.metadata, "statusCode", None)
+        markdown_content = getattr(result, "markdown", None) or ""
+        structured_data = getattr(result, "json", None)
+
+        return {
+            "url": url,
+            "title": title or "No title found",
+            "markdown_content": markdown_content,
+            "structured_data": structured_data,
+            "links": getattr(result, "links", None) or [],
+            "status_code": str(status_code or "Unknown"),
+        }
+
+    def scrape_page(
+        self,
+        url: str,
+        profile: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, str]]:
         """
         Scrape content from a given URL using Firecrawl with bot detection and stealth fallback.
 
         Args:
             url: URL to scrape.
+            profile: Scrape profile (see `SCRAPE_PROFILES`); pick the cheapest
+                one that yields what the caller needs.
+            json_schema: Optional JSON schema for structured extraction.
 
         Returns:
             A dict containing metadata, markdown content, and structured data, or None if the request fails.
+            With near-duplicate detection on, `simhash` and `near_duplicate_of` are set as well.
         """
+        content = self._scrape_page(url, profile, json_schema)
+        if content and self.is_bot_detected(content.get("status_code", "Unknown")):
+            # Block pages are not fingerprinted
+            return content
+        return annotate_near_duplicate(content, self.near_duplicate_index)
+
+    def _scrape_page(
+        self, url: str, profile: Optional[str], json_schema: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, str]]:
+        """Scrape with the escalation policy, or interactively with a stealth prompt."""
+        if self.escalation_policy is not None:
+            # Unattended: escalate auto -> basic -> stealth within the credit budget
+            return self._scrape_with_policy(url, scrape_formats(profile, json_schema))
+
         # First attempt with default proxy
-        scraped_content = self.scrape_with_proxy(url, DEFAULT_PROXY_MODE)
+        scraped_content = self.scrape_with_proxy(url, DEFAULT_PROXY_MODE, profile, json_schema)
         
         if not scraped_content:
             return None
@@ -125,7 +239,7 @@ class WebScraper:
             # Prompt for stealth retry
             if self.prompt_stealth_retry():
                 print(STEALTH_TRYING_MSG)
-                stealth_content = self.scrape_with_proxy(url, "stealth")
+                stealth_content = self.scrape_with_proxy(url, "stealth", profile, json_schema)
                 if stealth_content:
                     print("✅ Success with stealth mode!")
                     return stealth_content
@@ -138,6 +252,173 @@ class WebScraper:
         
         return scraped_content
 
+    def _scrape_with_policy(
+        self, url: str, formats: List[Any], start_mode: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        """Scrape a URL, escalating the proxy mode on bot detection per the policy."""
+        policy = self.escalation_policy
+        # A start mode is passed in when retrying a page blocked in a batch
+        escalated = start_mode is not None
+        mode = start_mode or policy.first_mode(url)
+        while mode:
+            content = self._scrape(url, mode, formats)
+            blocked = bool(content) and self.is_bot_detected(content.get("status_code", "Unknown"))
+            policy.record(url, mode, content, blocked, escalated=escalated)
+            if not blocked:
+                return content
+            escalated = True
+
+            print(BOT_DETECTED_MSG.format(content.get("status_code")))
+            mode = policy.next_mode(mode)
+            if mode:
+                print(f"🔁 Escalating to {mode} proxy for {url}")
+        return None
+
+    def scrape_batch(
+        self,
+        urls: List[str],
+        proxy_mode: str = DEFAULT_PROXY_MODE,
+        stealth_fallback: Optional[bool] = None,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        timeout: float = BATCH_TIMEOUT,
+        profile: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Tuple[str, Optional[Dict[str, str]]]]:
+        """
+        Scrape many URLs as one Firecrawl batch job, yielding results as they finish.
+
+        Bot-blocked pages are collected and, after the batch, retried as a
+        second batch in stealth mode (asking once, unless `stealth_fallback`
+        is given). With an escalation policy, URLs are grouped by the policy's
+        first mode for them (one batch per mode, URLs it has no budget for
+        are not submitted), and blocked pages are escalated one by one within
+        its credit budget. If the batch job cannot be started, URLs are
+        scraped one by one with `scrape_page`.
+
+        Args:
+            urls: URLs to scrape.
+            proxy_mode: Proxy mode for the first batch (without a policy).
+            stealth_fallback: Retry blocked pages with stealth without asking
+                (True), never (False) or ask once (None).
+            poll_interval: Seconds between job status polls.
+            timeout: Seconds before giving up on unfinished pages.
+            profile: Scrape profile for every page (see `SCRAPE_PROFILES`).
+            json_schema: Optional JSON schema for structured extraction.
+
+        Yields:
+            (url, result) tuples in completion order; result has the same
+            shape as `scrape_page` and is None for failed or blocked pages.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+
+        formats = scrape_formats(profile, json_schema)
+        policy = self.escalation_policy
+        # With a policy each URL starts in its own first mode: one batch per mode
+        batches: Dict[str, List[str]] = {}
+        for url in urls:
+            mode = policy.first_mode(url) if policy is not None else proxy_mode
+            if mode is None:
+                # Budget spent: not submitted
+                yield url, None
+                continue
+            batches.setdefault(mode, []).append(url)
+
+        blocked: Dict[str, str] = {}
+        for mode, batch_urls in batches.items():
+            for url, content in self._run_batch(batch_urls, mode, formats, poll_interval, timeout):
+                is_blocked = bool(content) and self.is_bot_detected(content.get("status_code", "Unknown"))
+                if policy is not None:
+                    policy.record(url, mode, content, is_blocked)
+                if is_blocked:
+                    print(BOT_DETECTED_MSG.format(content.get("status_code")) + f" for {url}")
+                    blocked[url] = mode
+                    continue
+                yield url, annotate_near_duplicate(content, self.near_duplicate_index)
+
+        if not blocked:
+            return
+        if policy is not None and stealth_fallback is None:
+            for url, mode in blocked.items():
+                next_mode = policy.next_mode(mode)
+                content = self._scrape_with_policy(url, formats, next_mode) if next_mode else None
+                yield url, annotate_near_duplicate(content, self.near_duplicate_index)
+            return
+        if stealth_fallback is None:
+            print(f"{len(blocked)} page(s) in the batch were blocked")
+            stealth_fallback = self.prompt_stealth_retry()
+        if not stealth_fallback:
+            print("⏭️  Skipping stealth mode")
+            for url in blocked:
+                yield url, None
+            return
+
+        print(STEALTH_TRYING_MSG)
+        for url, content in self._run_batch(list(blocked), "stealth", formats, poll_interval, timeout):
+            if content and self.is_bot_detected(content.get("status_code", "Unknown")):
+                print(f"❌ Stealth mode also failed for {url}")
+                content = None
+            yield url, annotate_near_duplicate(content, self.near_duplicate_index)
+
+    def _run_batch(
+        self, urls: List[str], proxy_mode: str, formats: List[Any], poll_interval: float, timeout: float
+    ) -> Iterator[Tuple[str, Optional[Dict[str, str]]]]:
+        """Submit one batch job and yield (url, result) as documents complete."""
+        try:
+            job = self.firecrawl.start_batch_scrape(
+                urls, formats=formats, proxy=proxy_mode, ignore_invalid_urls=True
+            )
+        except Exception as e:  # noqa: BLE001 - fall back to per-URL scraping
+            print(f"⚠️ Warning: Batch scrape could not start ({e}); scraping {len(urls)} URL(s) one by one")
+            for url in urls:
+                yield url, self._scrape(url, proxy_mode, formats)
+            return
+
+        pending = {_normalize_url(url): url for url in urls}
+        for invalid in getattr(job, "invalid_urls", None) or []:
+            url = pending.pop(_normalize_url(invalid), None)
+            if url:
+                print(f"⚠️ Warning: Firecrawl rejected invalid URL {url}")
+                yield url, None
+
+        print(f"📦 Batch job {job.id}: {len(pending)} URL(s) submitted")
+        deadline = time.monotonic() + timeout
+        seen = 0
+        while pending:
+            try:
+                status = self.firecrawl.get_batch_scrape_status(job.id)
+                state, documents = status.status, list(status.data or [])[seen:]
+            except Exception as e:  # noqa: BLE001 - transient status errors are retried
+                print(f"⚠️ Warning: Batch status check failed: {e}")
+                state, documents = None, []
+
+            # Documents arrive in completion order; only those after `seen` are new
+            seen += len(documents)
+            for doc in documents:
+                metadata = getattr(doc, "metadata", None)
+                source = getattr(metadata, "source_url", None) or getattr(metadata, "url", None) or ""
+                url = pending.pop(_normalize_url(source), None)
+                if url is None:
+                    print(f"⚠️ Warning: Batch job {job.id} returned a document for an unrequested URL: {source or '?'}")
+                    continue
+                yield url, self._document_to_result(url, doc)
+            if state in ("completed", "failed", "cancelled"):
+                break
+
+            if time.monotonic() >= deadline:
+                print(f"⚠️ Warning: Batch job {job.id} timed out after {timeout:.0f}s")
+                try:
+                    self.firecrawl.cancel_batch_scrape(job.id)
+                except Exception:
+                    pass
+                break
+            time.sleep(poll_interval)
+
+        # Pages the job finished without (failed) or never returned
+        for url in pending.values():
+            yield url, None
+
     def save_content(self, content: Dict[str, str], filename: str = "scraped_content") -> None:
         """
         Save scraped content to both markdown and JSON files.
@@ -267,29 +548,30 @@ class WebScraper:
             return "."
 
     def save_content_to_session(self, content: Dict[str, str], filename: str, session_folder: str) -> None:
-        """Save content to session folder."""
+        """Save content to session folder (written by the background session writer)."""
         try:
             import json
             
+            writer = get_session_writer()
+            
             # Save markdown content
             md_path = os.path.join(session_folder, f"{filename}.md")
-            with open(md_path, "w", encoding="utf-8") as f:
-                f.write(f"# {content['title']}\n\n")
-                f.write(f"**Source:** {content['url']}\n\n")
-                f.write(content.get("markdown_content", ""))
+            writer.write(
+                md_path,
+                f"# {content['title']}\n\n**Source:** {content['url']}\n\n{content.get('markdown_content', '')}",
+            )
             print(f"Markdown saved to {md_path}")
 
             # Save structured data if available
             if content.get("structured_data") is not None:
                 json_path = os.path.join(session_folder, f"{filename}_data.json")
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "url": content.get("url", ""),
-                        "title": content.get("title", ""),
-                        "status_code": content.get("status_code", ""),
-                        "structured_data": content.get("structured_data", {}),
-                    }, f, indent=2, ensure_ascii=False)
+                writer.write(json_path, json.dumps({
+                    "url": content.get("url", ""),
+                    "title": content.get("title", ""),
+                    "status_code": content.get("status_code", ""),
+                    "structured_data": content.get("structured_data", {}),
+                }, indent=2, ensure_ascii=False))
                 print(f"Structured data saved to {json_path}")
             
         except Exception as e:
-            print(f"Error saving content to session: {e}")
\ No newline at end of file
+            print(f"Error saving content to session: {e}")
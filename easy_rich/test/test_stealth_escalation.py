@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for src/stealth_escalation.py"""
+
+import sys
+from pathlib import Path
+
+# Add the easy_rich package directory so 'src' resolves
+PACKAGE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PACKAGE_DIR))
+
+from src.stealth_escalation import StealthEscalationPolicy
+
+URL = "https://www.shop.example/p/1"
+PAGE = {"markdown_content": "ok"}
+
+
+def _policy(budget=10, **kwargs):
+    return StealthEscalationPolicy(
+        credit_budget=budget, stealth_cost=5, basic_cost=1,
+        block_rate_threshold=0.5, min_domain_samples=3, start_mode="auto", **kwargs,
+    )
+
+
+def test_auto_is_charged_as_stealth_but_first_attempts_are_not_budgeted():
+    policy = _policy(budget=0)
+    assert policy.cost("auto") == 5
+    assert policy.first_mode(URL) == "auto"
+    policy.record(URL, "auto", PAGE, blocked=False)
+    assert policy.spent == 5
+    assert policy.escalation_spent == 0
+
+
+def test_escalation_climbs_the_ladder_within_budget():
+    policy = _policy(budget=6)
+    assert policy.next_mode("auto") == "basic"
+    policy.record(URL, "basic", None, blocked=True, escalated=True)
+    assert policy.escalation_spent == 1
+    assert policy.next_mode("basic") == "stealth"
+    policy.record(URL, "stealth", PAGE, blocked=False, escalated=True)
+    assert policy.escalation_spent == 6
+    assert policy.remaining() == 0
+    assert policy.next_mode("stealth") is None
+
+
+def test_exhausted_budget_refuses_escalation_and_counts_it():
+    policy = _policy(budget=4)
+    assert policy.next_mode("basic") is None
+    assert policy.report()["budget_exhausted"] == 1
+
+
+def test_stealth_first_attempts_are_charged_to_the_budget():
+    policy = _policy(budget=5)
+    policy.record(URL, "stealth", PAGE, blocked=False)
+    assert policy.escalation_spent == 5
+    assert not policy.can_afford("stealth", escalated=False)
+    # Cheaper first attempts still go through
+    assert policy.first_mode(URL) == "auto"
+
+
+def test_blocking_domains_start_with_stealth():
+    policy = _policy(budget=100)
+    for blocked in (True, True, False):
+        policy.record(URL, "auto", None if blocked else PAGE, blocked=blocked)
+    assert policy.block_rate("https://shop.example/other") == 2 / 3
+    assert policy.first_mode(URL) == "stealth"
+    # Too few samples: the default start mode is used
+    assert policy.first_mode("https://new.example/") == "auto"
+
+
+def test_unlimited_budget():
+    policy = _policy(budget=None)
+    assert policy.remaining() == float("inf")
+    assert policy.next_mode("basic") == "stealth"
@@ -31,5 +31,62 @@ BROWSER = {
             'timeout': 30000,
             'stealth_mode': True
         }
+    },
+    # Persistent browser pool: browsers launch once per process (per thread)
+    # and every scrape gets a fresh context
+    'pool': {
+        'size': 1,                    # Browsers kept alive
+        'max_pages_per_browser': 50,  # Recycle a browser after this many pages
+        'warm_up': False,             # Launch all browsers on first use
+        'headless': True
+    },
+    # Request blocking during page loads (src/request_blocking.py)
+    # Profiles: 'none', 'no-media', 'text-only', 'first-party-only'
+    # The 'no-media' default changes what pages load: images, video, fonts and
+    # ad/analytics hosts are aborted, so screenshots lack them and sites that
+    # gate content behind those scripts may render less. Use 'none' to load
+    # everything as before.
+    'blocking': {
+        'profile': 'no-media',
+        'blocklist': None     # Blocked domains; None uses the built-in ad/analytics list
+    },
+    # Page readiness before extraction (src/page_readiness.py)
+    # Profiles: 'fast' (no scrolling/pauses), 'balanced', 'stealth' (human-like pauses)
+    'readiness': {
+        'profile': 'balanced',
+        'target_selectors': []    # Wait for one of these selectors (e.g. 'table', 'article')
+    },
+    # Consent state persisted per site after accepting a banner (src/consent_store.py)
+    'consent': {
+        'persist': True,
+        'state_dir': None,    # None: manual_scrape/.consent_state
+        'max_age_days': 30
+    },
+    # Async backend (src/async_web_scraper.py): pages rendered in parallel
+    'async': {
+        'concurrency': 4,     # Pages rendered at once
+        'page_timeout': 90    # Seconds before a page is abandoned
     }
 }
+
+# Site Crawling (src/site_crawler.py)
+CRAWL_MAX_DEPTH = 2          # Link distance from the seed URL
+CRAWL_MAX_PAGES = 50         # Pages fetched per crawl run
+CRAWL_CONCURRENCY = 4        # Pages fetched at once
+CRAWL_DELAY = 1.0            # Seconds between requests to the same domain
+CRAWL_RESPECT_ROBOTS = True  # Honour robots.txt rules and Crawl-delay
+
+# Near-Duplicate Detection (src/near_duplicate.py)
+NEAR_DUPLICATE_DETECTION = True     # SimHash each scraped page; skip saving near-duplicates
+NEAR_DUPLICATE_MAX_DISTANCE = 3     # Max differing bits (of 64) counted as near-duplicate
+NEAR_DUPLICATE_INDEX_PATH = None    # None: .near_duplicate_index.jsonl in the package folder
+
+# SerpAPI Response Cache (src/serp_cache.py)
+SERP_CACHE_ENABLED = True     # Answer repeated searches from a local SQLite cache
+SERP_CACHE_TTL_HOURS = 24     # Age until a cached response is refreshed
+SERP_CACHE_STALE_HOURS = 144  # Stale responses still served (and refreshed in the background) this long
+SERP_CACHE_PATH = None        # None: .serp_cache.sqlite in the package folder (also used by easy_rich)
+
+# Concurrent Searches (SerpAPIClient.search_many)
+SERP_MAX_CONCURRENCY = 5      # Searches sent to SerpAPI at once
+SERP_CREDIT_BUDGET = None     # Searches a client may send (cache hits are free); None: no limit
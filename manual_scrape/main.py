@@ -6,7 +6,13 @@ Searches for user input on the web and scrapes the page content.
 
 from typing import Tuple, Optional, List
 from src.serp_api_client import SerpAPIClient
+from src.serp_cache import get_serp_cache
 from src.web_scraper import WebScraper
+from src.async_web_scraper import scrape_many_blocking
+from src.site_crawler import SiteCrawler
+from src.browsers.browser_pool import close_browser_pools
+from src.session_writer import close_session_writer
+from src.request_blocking import get_blocking_report
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -20,13 +26,16 @@ def get_scraping_mode() -> str:
     print("Choose your option:")
     print("1. Search the web for something")
     print("2. Enter a direct URL to scrape")
+    print("3. Crawl a site from a seed URL")
     
     while True:
-        choice = input("Your choice (1, 2): ").strip()
+        choice = input("Your choice (1, 2, 3): ").strip()
         if choice == "1":
             return "search"
         elif choice == "2":
             return "url"
+        elif choice == "3":
+            return "crawl"
         else:
             print("Please enter a valid choice")
 
@@ -51,6 +60,43 @@ def get_direct_url() -> str:
     return url
 
 
+def get_crawl_limits() -> Tuple[int, int]:
+    """Get optional page and depth limits for a crawl (Enter keeps the config defaults)."""
+    max_pages = input(f"Max pages to crawl [{config.CRAWL_MAX_PAGES}]: ").strip()
+    max_depth = input(f"Max link depth [{config.CRAWL_MAX_DEPTH}]: ").strip()
+    if (max_pages and not max_pages.isdigit()) or (max_depth and not max_depth.isdigit()):
+        raise ValueError("Limits must be whole numbers!")
+    return (
+        int(max_pages) if max_pages else config.CRAWL_MAX_PAGES,
+        int(max_depth) if max_depth else config.CRAWL_MAX_DEPTH,
+    )
+
+
+def run_crawl(web_scraper: WebScraper) -> None:
+    """Crawl a site from a seed URL into its own session folder."""
+    seed_url = get_direct_url()
+    max_pages, max_depth = get_crawl_limits()
+    session_folder = web_scraper.create_session_folder(seed_url, "crawl")
+    print(f"Created session folder: {session_folder}")
+    print(f"\nCrawling {seed_url} (max {max_pages} pages, depth {max_depth})...")
+
+    crawler = SiteCrawler(
+        web_scraper,
+        session_folder,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        concurrency=config.CRAWL_CONCURRENCY,
+        delay=config.CRAWL_DELAY,
+        respect_robots=config.CRAWL_RESPECT_ROBOTS,
+        # Browser pools are per thread: close the workers' pools with them
+        worker_cleanup=close_browser_pools,
+    )
+    stats = crawler.crawl(seed_url)
+    print(f"✅ Crawl finished: {stats['saved']} pages saved, {stats['failed']} failed, "
+          f"{stats['duplicates']} near-duplicates skipped, {stats['disallowed']} disallowed by robots.txt, "
+          f"{stats['frontier'].get('queued', 0)} still queued ({stats['seconds']}s)")
+
+
 def display_subpage_menu(links: List[Tuple[str, str]]) -> None:
     """Display available subpages in a numbered menu with improved formatting."""
     if not links:
@@ -74,13 +120,15 @@ def handle_subpage_choice(links: List[Tuple[str, str]]) -> Optional[str]:
         return None
         
     while True:
-        print("\nEnter number (1-{0}), 'n' for new search, or 'q' to quit:".format(len(links)))
+        print("\nEnter number (1-{0}), 'a' to scrape all, 'n' for new search, or 'q' to quit:".format(len(links)))
         choice = input("> ").strip().lower()
         
         if choice == 'q':
             return 'quit'
         elif choice == 'n':
             return 'new'
+        elif choice == 'a':
+            return 'all'
         elif choice.isdigit():
             num = int(choice)
             if 1 <= num <= len(links):
@@ -91,6 +139,22 @@ def handle_subpage_choice(links: List[Tuple[str, str]]) -> Optional[str]:
             print("\nPlease enter a valid number, 'n', or 'q'")
 
 
+def scrape_all_subpages(web_scraper: WebScraper, links: List[Tuple[str, str]], session_folder: str) -> None:
+    """Render every listed subpage in parallel and save them to the session folder."""
+    print(f"\nScraping {len(links)} subpages in parallel...")
+    results = scrape_many_blocking([url for _, url in links])
+    saved = 0
+    for (title, url), content in zip(links, results):
+        if not content:
+            print(f"Failed to scrape subpage: {url}")
+        elif content.get("near_duplicate_of"):
+            print(f"Not saved: {url} is a near-duplicate of {content['near_duplicate_of']}")
+        else:
+            web_scraper.save_content_to_session(content, web_scraper.sanitize_filename(title or url), session_folder)
+            saved += 1
+    print(f"✅ Saved {saved}/{len(links)} subpages")
+
+
 def main() -> None:
     """Main application entry point with enhanced subpage support."""
     print("Starting Enhanced Generic Web Scraper...")
@@ -124,6 +188,10 @@ def main() -> None:
                 # Create WebScraper instance after applying any session overrides
                 web_scraper = WebScraper()
                 
+                if mode == "crawl":
+                    run_crawl(web_scraper)
+                    continue
+
                 if mode == "search":
                     # Original search workflow
                     search_text, website = get_search_input()
@@ -173,8 +241,11 @@ def main() -> None:
 
                 print(f"Successfully scraped: {scraped_content['title']}")
                 
-                # Save content to session folder
-                web_scraper.save_content_to_session(scraped_content, filename, session_folder)
+                # Save content to session folder (near-duplicates of saved pages are skipped)
+                if scraped_content.get("near_duplicate_of"):
+                    print(f"Not saved: near-duplicate of {scraped_content['near_duplicate_of']}")
+                else:
+                    web_scraper.save_content_to_session(scraped_content, filename, session_folder)
                 
                 # Extract and display subpage options
                 links = web_scraper.extract_links_from_markdown(
@@ -193,6 +264,9 @@ def main() -> None:
                         return
                     elif choice == 'new':
                         break  # Break inner loop to start new search
+                    elif choice == 'all':
+                        scrape_all_subpages(web_scraper, links, session_folder)
+                        break
                     elif choice:  # It's a URL
                         # Find the title corresponding to the chosen URL
                         chosen_title = None
@@ -216,7 +290,10 @@ def main() -> None:
                                 subpage_filename = subpage_filename or "subpage"
                             
                             print(f"Successfully scraped subpage: {subpage_content['title']}")
-                            web_scraper.save_content_to_session(subpage_content, subpage_filename, session_folder)
+                            if subpage_content.get("near_duplicate_of"):
+                                print(f"Not saved: near-duplicate of {subpage_content['near_duplicate_of']}")
+                            else:
+                                web_scraper.save_content_to_session(subpage_content, subpage_filename, session_folder)
                             
                             # Extract links from subpage for further exploration
                             subpage_links = web_scraper.extract_links_from_markdown(
@@ -246,6 +323,12 @@ def main() -> None:
     except Exception as e:
         print(f"Application error: {e}")
     finally:
+        # Let background search-cache refreshes finish before the report
+        if 'serp_client' in locals():
+            serp_client.close()
+        close_browser_pools()
+        # Flush session files still queued in the background writer
+        close_session_writer()
         # Restore proxy mode if it was overridden for stealth session
         try:
             if 'stealth_session_applied' in locals() and stealth_session_applied:
@@ -253,6 +336,13 @@ def main() -> None:
         except Exception:
             pass
     
+    # Report how many searches the response cache answered
+    serp_cache = get_serp_cache()
+    if serp_cache is not None:
+        serp_cache.print_report()
+    # Requests blocked during page loads, over the whole run
+    get_blocking_report().print_report()
+    
     print("Scraping session completed!")
 
 
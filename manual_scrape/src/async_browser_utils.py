@@ -0,0 +1,99 @@
+"""Async (async_playwright) equivalents of the popup and stealth helpers in `browser_utils`."""
+
+import random
+import time
+
+from .browser_utils import (
+    CONSENT_BUTTON_SELECTORS,
+    CONSENT_CANDIDATES,
+    CONSENT_MARKER_ATTR,
+    FIND_CONSENT_JS,
+    REMOVE_OVERLAYS_JS,
+    get_human_delay,
+)
+
+
+async def add_human_pause(page, min_ms=1000, max_ms=3000):
+    """Add a human-like pause with mouse movement."""
+    try:
+        viewport = page.viewport_size
+        if viewport:
+            x = random.randint(100, viewport['width'] - 100)
+            y = random.randint(100, viewport['height'] - 100)
+            await page.mouse.move(x, y)
+        await page.wait_for_timeout(get_human_delay(min_ms, max_ms))
+    except Exception:
+        await page.wait_for_timeout(get_human_delay(min_ms, max_ms))
+
+async def handle_cookies_and_consent(page, timeout=15000, settle=True):
+    """Handle cookies and consent dialogs with Playwright selectors.
+
+    With `settle=False` the fixed post-click wait is skipped; callers then
+    rely on the readiness check in `page_readiness`.
+
+    Returns the clicked selector (see `is_accept_selector`), or None.
+    """
+    print("Handling cookies and consent with Playwright selectors...")
+    
+    start_time = time.time()
+    max_time_ms = timeout
+    
+    try:
+        # All candidate selectors are matched in a single round trip
+        index = await page.evaluate(FIND_CONSENT_JS, [CONSENT_CANDIDATES, CONSENT_MARKER_ATTR])
+        if index < 0:
+            return None
+        
+        selector = CONSENT_BUTTON_SELECTORS[index]
+        print(f"Found popup button with selector: {selector}")
+        await page.click(f"[{CONSENT_MARKER_ATTR}='1']", timeout=min(2000, max_time_ms))
+        print(f"Successfully clicked popup button with selector: {selector}")
+        
+        if settle:
+            print("Cookie/consent button clicked, waiting for page to stabilize...")
+            remaining_time = max(0, max_time_ms - (time.time() - start_time) * 1000)
+            if remaining_time > 1000:
+                await page.wait_for_timeout(min(2000, int(remaining_time)))
+        return selector
+        
+    except Exception as e:
+        print(f"Error handling cookies and consent: {e}")
+        return None
+
+async def handle_any_popups(page, aggressive=False, human_pauses=True, try_buttons=True):
+    """Handle any type of popup, consent dialog, or cookie banner (see `browser_utils`)."""
+    print(f"Trying {'aggressive ' if aggressive else ''}popup handling...")
+    
+    # Step 1: Try button clicking with human delays
+    if try_buttons and human_pauses:
+        await add_human_pause(page, 500, 1200)
+    
+    button_clicked = try_buttons and await handle_cookies_and_consent(
+        page, timeout=8000 if aggressive else 5000, settle=human_pauses
+    )
+    
+    if button_clicked:
+        print("✅ Successfully handled popup with button clicking")
+        if human_pauses:
+            await add_human_pause(page, 1000, 2000)
+        return True
+    
+    # Step 2: DOM removal fallback if aggressive
+    if aggressive:
+        print("Using DOM removal fallback...")
+        if human_pauses:
+            await add_human_pause(page, 1000, 2000)
+        
+        try:
+            result = await page.evaluate(REMOVE_OVERLAYS_JS)
+            removed = result.get("removed", [])
+            print(f"DOM removal: removed {len(removed)} elements in {result.get('ms')} ms")
+            
+            if removed:
+                if human_pauses:
+                    await add_human_pause(page, 1500, 3000)
+                return True
+        except Exception as e:
+            print(f"DOM removal failed: {e}")
+    
+    return False
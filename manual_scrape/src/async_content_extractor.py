@@ -0,0 +1,173 @@
+"""Extract article content from webpages using async Playwright.
+
+Async equivalent of `ContentExtractor` so many pages can be processed
+concurrently on one event loop.
+"""
+
+import asyncio
+from bs4 import BeautifulSoup
+from .async_browser_utils import add_human_pause, handle_any_popups, handle_cookies_and_consent
+from .browser_utils import CONTENT_SELECTORS, EXCLUDED_TAGS, READABLE_CONTENT_JS, extract_readable_text, is_accept_selector
+from .consent_store import get_consent_store
+from .html_to_markdown import html_to_markdown
+from .page_readiness import SCROLL_JS, get_readiness_profile, get_target_selectors, wait_until_ready_async
+from .content_extractor import (
+    BODY_TEXT_JS,
+    MAIN_CONTENT_MIN_CHARS,
+    MAX_LINKS,
+    MIN_CONTENT_CHARS,
+    MIN_VALID_CONTENT_CHARS,
+    SUBSTANTIAL_CONTENT_CHARS,
+)
+
+
+class AsyncContentExtractor:
+    """Extract article content from a webpage (async Playwright page)."""
+
+    def __init__(self, readiness_profile=None, target_selectors=None):
+        """Initialize the extractor (same options as `ContentExtractor`)."""
+        self.readiness = get_readiness_profile(readiness_profile)
+        self.target_selectors = get_target_selectors() if target_selectors is None else list(target_selectors)
+        self.consent_store = get_consent_store()
+
+    async def extract_article_content(self, page, url, article, domain, source, user_email=None, extras=None):
+        """Extract article content from the page.
+        
+        Args:
+            page: The async Playwright page object
+            url: The URL of the article
+            article: The article metadata
+            domain: The domain of the article
+            source: The source of the article
+            user_email: Optional user email for validation context
+            extras: Optional dict filled with the page's "links" (title, url)
+                pairs and the extraction "method" ("in-page" or "soup")
+            
+        Returns:
+            tuple: (success, article_content, title, rejection_reason)
+        """
+        print(f"Extracting article content from {url}...")
+        
+        try:
+            profile = self.readiness
+            human_pauses = profile["human_pauses"]
+            await self._handle_popups(page, url, human_pauses)
+            
+            if profile["scroll_pause_ms"] is not None:
+                await self._perform_progressive_scrolling(page, profile["scroll_pause_ms"])
+                await self._handle_popups(page, url, human_pauses)
+            
+            await wait_until_ready_async(page, profile, self.target_selectors)
+            
+            if profile["networkidle_ms"]:
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=profile["networkidle_ms"])
+                except Exception as e:
+                    print(f"Error waiting for page ready state (continuing anyway): {e}")
+            
+            extras = {} if extras is None else extras
+            article_content = await self._extract_content(page, extras)
+            chars_count = len(article_content) if article_content else 0
+            print(f"Extracted {chars_count} chars from {url}")
+            
+            if article_content and len(article_content) > SUBSTANTIAL_CONTENT_CHARS:
+                title = await self._extract_title(page, article, extras.get("title"))
+                return True, article_content, title, None
+            
+            if article_content and len(article_content) > MIN_CONTENT_CHARS:
+                title = await self._extract_title(page, article, extras.get("title"))
+                
+                if len(article_content) < MIN_VALID_CONTENT_CHARS:
+                    try:
+                        fallback_content = await page.evaluate(BODY_TEXT_JS)
+                        if fallback_content and len(fallback_content) > MIN_VALID_CONTENT_CHARS:
+                            print(f"Fallback extraction succeeded, got {len(fallback_content)} chars")
+                            return True, fallback_content, title, None
+                    except Exception as fallback_error:
+                        print(f"Fallback extraction failed: {fallback_error}")
+                    
+                    rejection_reason = f"Content too short: {len(article_content)} chars (minimum {MIN_VALID_CONTENT_CHARS})"
+                    return False, "", title, rejection_reason
+                
+                return True, article_content, title, None
+            
+            return False, "", article.get("title", ""), "Content too short: 0 chars"
+            
+        except Exception as e:
+            print(f"Error extracting content from {url}: {e}")
+            return False, "", article.get("title", ""), f"Error: {str(e)}"
+
+    async def _handle_popups(self, page, url, human_pauses):
+        """Accept consent (skipped when the site's consent is stored), else remove overlays."""
+        if self.consent_store.has_consent(url):
+            # Stored consent only covers the cookie banner; still remove overlays
+            await handle_any_popups(page, aggressive=True, human_pauses=human_pauses, try_buttons=False)
+            return
+        
+        if human_pauses:
+            await add_human_pause(page, 500, 1200)
+        selector = await handle_cookies_and_consent(page, timeout=8000, settle=human_pauses)
+        if selector:
+            # Closing a popup is not consent; only accept clicks are persisted
+            if is_accept_selector(selector):
+                await self.consent_store.save_async(page.context, url)
+            if human_pauses:
+                await add_human_pause(page, 1000, 2000)
+            return
+        
+        await handle_any_popups(page, aggressive=True, human_pauses=human_pauses, try_buttons=False)
+
+    async def _perform_progressive_scrolling(self, page, pause_ms=1000):
+        """Perform progressive scrolling to expose all content."""
+        try:
+            await page.evaluate(SCROLL_JS, pause_ms)
+        except Exception as e:
+            print(f"Error during progressive scrolling: {e}")
+
+    async def _extract_content(self, page, extras):
+        """Extract readable content as markdown inside the page, falling back to BeautifulSoup text."""
+        try:
+            result = await page.evaluate(
+                READABLE_CONTENT_JS, [CONTENT_SELECTORS, EXCLUDED_TAGS, MAIN_CONTENT_MIN_CHARS, MAX_LINKS]
+            )
+            extras["title"] = result.get("title") or ""
+            extras["links"] = [(text, href) for text, href in result.get("links", [])]
+            if result.get("chars"):
+                extras["method"] = "in-page"
+                # Markdown keeps links/headings/tables like the Firecrawl backend
+                markdown = await asyncio.to_thread(
+                    html_to_markdown, result.get("html") or "", page.url, EXCLUDED_TAGS
+                )
+                if markdown:
+                    return markdown
+                # Plain text of the same markup when nothing converted
+                return BeautifulSoup(result.get("html") or "", "html.parser").get_text(separator=" ", strip=True)
+        except Exception as e:
+            print(f"In-page extraction failed, falling back to BeautifulSoup: {e}")
+        
+        extras["method"] = "soup"
+        return await self._extract_content_with_soup(page)
+
+    async def _extract_content_with_soup(self, page):
+        """Extract content using BeautifulSoup parsing off the event loop."""
+        try:
+            html_content = await page.content()
+            return await asyncio.to_thread(
+                lambda: extract_readable_text(BeautifulSoup(html_content, 'html.parser'))
+            )
+        except Exception as e:
+            print(f"Error during content extraction: {e}")
+            return ""
+
+    async def _extract_title(self, page, article, page_title=None):
+        """Extract title from the page (or use the title already read in-page)."""
+        if page_title and page_title.strip():
+            return page_title.strip()
+        try:
+            page_title = await page.title()
+            if page_title and len(page_title.strip()) > 0:
+                return page_title.strip()
+            return article.get("title", "")
+        except Exception as e:
+            print(f"Error extracting title: {e}")
+            return article.get("title", "")
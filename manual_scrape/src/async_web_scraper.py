@@ -0,0 +1,195 @@
+"""Async Playwright web scraper rendering many pages in parallel.
+
+One browser is launched per scraper; every page gets its own context and
+runs concurrently, bounded by a semaphore and a per-page timeout. Results
+use the same dict shape as `WebScraper.scrape_page`.
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+from .async_content_extractor import AsyncContentExtractor
+from .browsers.browser_factory import BrowserFactory
+from .near_duplicate import NearDuplicateIndex, annotate_near_duplicate
+from .request_blocking import RequestBlocker, get_blocking_report
+from .scrape_config import BROWSER
+from .web_scraper import BOT_DETECTED_MSG, WebScraper
+
+
+class AsyncWebScraper(WebScraper):
+    """`async_playwright` variant of `WebScraper` with `scrape_page`/`scrape_many`.
+
+    Link extraction, filename and session helpers are inherited from
+    `WebScraper`; only the fetching is async.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        page_timeout: Optional[float] = None,
+        near_duplicate_index: Optional[NearDuplicateIndex] = None,
+    ) -> None:
+        """Initialize the scraper (the browser starts on first use).
+
+        Args:
+            concurrency: Maximum pages rendered at once. Defaults to
+                `BROWSER['async']['concurrency']`.
+            page_timeout: Per-page timeout in seconds. Defaults to
+                `BROWSER['async']['page_timeout']`.
+            near_duplicate_index: See `WebScraper`.
+        """
+        super().__init__(near_duplicate_index=near_duplicate_index)
+        settings = BROWSER.get("async", {})
+        self.concurrency = concurrency or settings.get("concurrency", 4)
+        self.page_timeout = page_timeout or settings.get("page_timeout", 90)
+        self.content_extractor = AsyncContentExtractor()
+        self.browser_config = BrowserFactory.create()
+        self._playwright = None
+        self._browser = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def start(self) -> "AsyncWebScraper":
+        """Start Playwright and launch the browser."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                engine = getattr(self._playwright, self.browser_config.name)
+                print(f"🚀 Launching {self.browser_config.name} browser (async, headless)")
+                self._browser = await engine.launch(headless=True, args=self.browser_config.get_launch_args())
+        return self
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright."""
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "AsyncWebScraper":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def scrape_with_playwright(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Scrape content in a fresh context of the shared async browser.
+
+        Args:
+            url: URL to scrape
+
+        Returns:
+            Scraped content dict or None if failed
+        """
+        await self.start()
+        context = await self._browser.new_context(
+            user_agent=random.choice(self.browser_config.get_user_agents()),
+            viewport={"width": 1280, "height": 1200},
+            storage_state=self.content_extractor.consent_store.state_for(url),
+        )
+        blocker = RequestBlocker.from_config()
+        try:
+            await blocker.install_async(context)
+            page = await context.new_page()
+            page.set_default_navigation_timeout(60000)
+
+            response = await page.goto(url, wait_until="domcontentloaded")
+            if response and response.status >= 400:
+                print(f"HTTP error {response.status} while accessing {url}")
+                return None
+
+            domain = urlparse(url).netloc
+            article = {"title": f"Article from {domain}"}
+            extras: Dict[str, Any] = {}
+            success, article_content, title, rejection_reason = await self.content_extractor.extract_article_content(
+                page, url, article, domain, domain, extras=extras
+            )
+            if not success:
+                print(f"Content extraction failed for {url}: {rejection_reason}")
+                return None
+
+            return {
+                "url": url,
+                "title": title,
+                "markdown_content": article_content,
+                "structured_data": {},
+                "links": extras.get("links", []),
+                "status_code": str(response.status if response else 200),
+            }
+        finally:
+            get_blocking_report().add(blocker)
+            await context.close()
+
+    async def scrape_page(self, url: str, profile: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Scrape one URL with a per-page timeout.
+
+        Args:
+            url: URL to scrape.
+            profile: Accepted for interface parity with the Firecrawl backend.
+
+        Returns:
+            A dict containing metadata, markdown content, and structured data, or None if the request fails.
+            With near-duplicate detection on, `simhash` and `near_duplicate_of` are set as well.
+        """
+        try:
+            scraped_content = await asyncio.wait_for(self.scrape_with_playwright(url), timeout=self.page_timeout)
+        except asyncio.TimeoutError:
+            print(f"Timed out after {self.page_timeout}s scraping {url}")
+            return None
+        except Exception as e:  # noqa: BLE001 - broad except with logging for robustness
+            print(f"Error scraping {url}: {e}")
+            return None
+
+        if scraped_content and self.is_bot_detected(scraped_content.get("status_code", "Unknown")):
+            print(BOT_DETECTED_MSG.format(scraped_content.get("status_code")))
+            return scraped_content
+        return annotate_near_duplicate(scraped_content, self.near_duplicate_index)
+
+    async def scrape_many(self, urls: List[str]) -> List[Optional[Dict[str, str]]]:
+        """
+        Scrape many URLs concurrently, at most `concurrency` at a time.
+
+        Args:
+            urls: URLs to scrape.
+
+        Returns:
+            Results aligned with `urls` (None for failed pages).
+        """
+        await self.start()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(url: str) -> Optional[Dict[str, str]]:
+            async with semaphore:
+                return await self.scrape_page(url)
+
+        return await asyncio.gather(*(_bounded(url) for url in urls))
+
+
+def scrape_many_blocking(urls: List[str], concurrency: Optional[int] = None) -> List[Optional[Dict[str, str]]]:
+    """Render a batch of URLs in parallel from synchronous code.
+
+    Args:
+        urls: URLs to scrape.
+        concurrency: Maximum pages rendered at once.
+
+    Returns:
+        Results aligned with `urls` (None for failed pages).
+    """
+    async def _run() -> List[Optional[Dict[str, str]]]:
+        async with AsyncWebScraper(concurrency=concurrency) as scraper:
+            return await scraper.scrape_many(urls)
+
+    return asyncio.run(_run())
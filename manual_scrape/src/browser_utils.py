@@ -1,9 +1,162 @@
 """Browser utilities for popup handling, data extraction, and stealth operations."""
 
+import re
 import time
 import random
 from bs4 import BeautifulSoup
 
+# Consent/popup buttons in priority order: explicit accept, close/dismiss,
+# then generic attribute-based selectors
+CONSENT_BUTTON_SELECTORS = [
+    "button:has-text('I accept all cookies')",
+    "button:has-text('Accept all cookies')", 
+    "button:has-text('Accept All')",
+    "button:has-text('Accept')",
+    "button:has-text('Accetta tutto')",  # Italian
+    "button:has-text('Accetto')",       # Italian
+    "button:has-text('Close')",
+    "button:has-text('Chiudi')",        # Italian
+    "button:has-text('×')",
+    "button[aria-label*='close']",
+    "button[class*='close']",
+    "[id*='accept'] button:not([href]):not(a)",
+    "[class*='accept'] button:not([href]):not(a)", 
+    "[id*='cookie'] button:not([href]):not(a)",
+    "[class*='cookie'] button:not([href]):not(a)",
+    "[data-testid*='accept'] button:not([href]):not(a)",
+]
+
+
+# Selectors that accept consent; only clicks on these are worth persisting
+# (close/dismiss buttons just hide a modal, consent is still pending)
+CONSENT_ACCEPT_SELECTORS = frozenset(
+    selector for selector in CONSENT_BUTTON_SELECTORS
+    if "accept" in selector.lower() or "accett" in selector.lower()
+)
+
+
+def is_accept_selector(selector):
+    """Whether a matched consent selector accepts consent (not just closes a popup)."""
+    return selector in CONSENT_ACCEPT_SELECTORS
+
+
+def _split_has_text(selector):
+    """Split a Playwright `:has-text('...')` selector into (css, text)."""
+    match = re.match(r"^(.*?):has-text\((['\"])(.*)\2\)(.*)$", selector)
+    if match:
+        return [(match.group(1) + match.group(4)) or "*", match.group(3)]
+    return [selector, ""]
+
+
+# CONSENT_BUTTON_SELECTORS as plain CSS plus required text, for in-page matching
+CONSENT_CANDIDATES = [_split_has_text(selector) for selector in CONSENT_BUTTON_SELECTORS]
+
+# Attribute set on the matched consent button so it can be clicked by selector
+CONSENT_MARKER_ATTR = "data-scrape-consent"
+
+# Find the first visible consent button in one round trip; returns its index
+FIND_CONSENT_JS = """(args) => {
+    const [candidates, marker] = args;
+    document.querySelectorAll('[' + marker + ']').forEach((el) => el.removeAttribute(marker));
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    for (let i = 0; i < candidates.length; i++) {
+        const [css, text] = candidates[i];
+        let elements;
+        try { elements = document.querySelectorAll(css); } catch (e) { continue; }
+        for (const el of elements) {
+            if (text && !(el.innerText || el.textContent || '').toLowerCase().includes(text.toLowerCase())) continue;
+            if (!visible(el)) continue;
+            el.setAttribute(marker, '1');
+            return i;
+        }
+    }
+    return -1;
+}"""
+
+# DOM removal fallback for overlays, cookie banners and modals. Only fixed or
+# sticky candidates are inspected: the outermost fixed/sticky ancestors of the
+# elements at a grid of viewport points, plus the first two levels of body
+# children (TreeWalker that rejects deeper subtrees). Returns what was removed
+# and how long it took.
+REMOVE_OVERLAYS_JS = """() => {
+    const start = performance.now();
+    const body = document.body;
+    if (!body) return {removed: [], checked: 0, ms: 0};
+
+    const viewportArea = window.innerWidth * window.innerHeight;
+    const keywords = /cookie|consent|gdpr|privacy|popup|modal|overlay|backdrop|newsletter|banner|paywall|dialog/i;
+    const candidates = new Set();
+    let checked = 0;
+
+    const isFloating = (el) => {
+        checked++;
+        const position = window.getComputedStyle(el).position;
+        return position === 'fixed' || position === 'sticky';
+    };
+
+    // 1. Elements at viewport points -> outermost fixed/sticky ancestor
+    const points = [[0.5, 0.5], [0.25, 0.25], [0.75, 0.25], [0.25, 0.75], [0.75, 0.75],
+                    [0.5, 0.03], [0.5, 0.97], [0.03, 0.5], [0.97, 0.5]];
+    for (const [fx, fy] of points) {
+        let el = document.elementFromPoint(window.innerWidth * fx, window.innerHeight * fy);
+        let outermost = null;
+        while (el && el !== body && el !== document.documentElement) {
+            if (isFloating(el)) outermost = el;
+            el = el.parentElement;
+        }
+        if (outermost) candidates.add(outermost);
+    }
+
+    // 2. Top-level body children and their children only
+    const walker = document.createTreeWalker(body, NodeFilter.SHOW_ELEMENT, {
+        acceptNode: (node) => {
+            const parent = node.parentElement;
+            if (parent === body || (parent && parent.parentElement === body)) return NodeFilter.FILTER_ACCEPT;
+            return NodeFilter.FILTER_REJECT;
+        }
+    });
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        if (isFloating(node)) candidates.add(node);
+    }
+
+    const describe = (el, reason) => {
+        const id = el.id ? '#' + el.id : '';
+        const cls = typeof el.className === 'string' && el.className.trim()
+            ? '.' + el.className.trim().split(/\\s+/).slice(0, 2).join('.') : '';
+        return el.tagName.toLowerCase() + id + cls + ' (' + reason + ')';
+    };
+
+    const removed = [];
+    for (const el of candidates) {
+        if (!document.contains(el)) continue;  // Already removed with an ancestor
+        const style = window.getComputedStyle(el);
+        const rect = el.getBoundingClientRect();
+        const coverage = viewportArea ? (Math.max(0, rect.width) * Math.max(0, rect.height)) / viewportArea : 0;
+        const label = (el.id || '') + ' ' + (typeof el.className === 'string' ? el.className : '') + ' ' + (el.getAttribute('role') || '');
+        const zIndex = parseInt(style.zIndex) || 0;
+
+        let reason = null;
+        if (keywords.test(label) || el.getAttribute('aria-modal') === 'true') reason = 'keyword';
+        else if (coverage >= 0.3) reason = 'covers ' + Math.round(coverage * 100) + '%';
+        else if (zIndex > 999 && !['HEADER', 'NAV'].includes(el.tagName)) reason = 'z-index ' + zIndex;
+        if (!reason) continue;
+
+        removed.push(describe(el, reason));
+        el.remove();
+    }
+
+    if (removed.length) {
+        body.style.overflow = 'auto';
+        document.documentElement.style.overflow = 'auto';
+    }
+    return {removed, checked, ms: Math.round(performance.now() - start)};
+}"""
+
+
 def get_human_delay(min_ms=800, max_ms=2500):
     """Get a random delay that mimics human behavior."""
     return random.randint(min_ms, max_ms)
@@ -20,169 +173,164 @@ def add_human_pause(page, min_ms=1000, max_ms=3000):
     except Exception:
         page.wait_for_timeout(get_human_delay(min_ms, max_ms))
 
-def handle_cookies_and_consent(page, timeout=15000):
-    """Handle cookies and consent dialogs with Playwright selectors."""
+def handle_cookies_and_consent(page, timeout=15000, settle=True):
+    """Handle cookies and consent dialogs with Playwright selectors.
+
+    With `settle=False` the fixed post-click wait is skipped; callers then
+    rely on the readiness check in `page_readiness`.
+
+    Returns the clicked selector (see `is_accept_selector`), or None.
+    """
     print("Handling cookies and consent with Playwright selectors...")
     
     start_time = time.time()
     max_time_ms = timeout
     
     try:
-        if (time.time() - start_time) * 1000 > max_time_ms:
-            print(f"Cookie handling timed out after {timeout}ms")
-            return False
-        
-        # Priority 1: Explicit accept buttons
-        accept_buttons = [
-            "button:has-text('I accept all cookies')",
-            "button:has-text('Accept all cookies')", 
-            "button:has-text('Accept All')",
-            "button:has-text('Accept')",
-            "button:has-text('Accetta tutto')",  # Italian
-            "button:has-text('Accetto')",       # Italian
-        ]
+        # All candidate selectors are matched in a single round trip
+        index = page.evaluate(FIND_CONSENT_JS, [CONSENT_CANDIDATES, CONSENT_MARKER_ATTR])
+        if index < 0:
+            return None
         
-        # Priority 2: Close/dismiss buttons  
-        close_buttons = [
-            "button:has-text('Close')",
-            "button:has-text('Chiudi')",        # Italian
-            "button:has-text('×')",
-            "button[aria-label*='close']",
-            "button[class*='close']",
-        ]
-        
-        # Priority 3: Generic attribute-based selectors
-        generic_buttons = [
-            "[id*='accept'] button:not([href]):not(a)",
-            "[class*='accept'] button:not([href]):not(a)", 
-            "[id*='cookie'] button:not([href]):not(a)",
-            "[class*='cookie'] button:not([href]):not(a)",
-            "[data-testid*='accept'] button:not([href]):not(a)",
-        ]
-        
-        # Combine all selectors in priority order
-        button_selectors = accept_buttons + close_buttons + generic_buttons
-        
-        clicked = False
-        
-        # Try each selector with timeout check
-        for selector in button_selectors:
-            if (time.time() - start_time) * 1000 > max_time_ms:
-                print(f"Cookie handling timed out during selector iteration")
-                return False
-            
-            try:
-                if page.query_selector(selector):
-                    print(f"Found popup button with selector: {selector}")
-                    page.click(selector, timeout=2000)
-                    print(f"Successfully clicked popup button with selector: {selector}")
-                    clicked = True
-                    break
-            except Exception:
-                continue
+        selector = CONSENT_BUTTON_SELECTORS[index]
+        print(f"Found popup button with selector: {selector}")
+        page.click(f"[{CONSENT_MARKER_ATTR}='1']", timeout=min(2000, max_time_ms))
+        print(f"Successfully clicked popup button with selector: {selector}")
         
-        if clicked:
+        if settle:
             print("Cookie/consent button clicked, waiting for page to stabilize...")
             remaining_time = max(0, max_time_ms - (time.time() - start_time) * 1000)
             if remaining_time > 1000:
                 page.wait_for_timeout(min(2000, int(remaining_time)))
-            return True
-        
-        return False
+        return selector
         
     except Exception as e:
         print(f"Error handling cookies and consent: {e}")
-        return False
+        return None
+
+def handle_any_popups(page, aggressive=False, human_pauses=True, try_buttons=True):
+    """Handle any type of popup, consent dialog, or cookie banner.
 
-def handle_any_popups(page, aggressive=False):
-    """Handle any type of popup, consent dialog, or cookie banner."""
+    `human_pauses=False` drops the human-like pauses (used by the non-stealth
+    readiness profiles); `try_buttons=False` skips consent button clicking
+    when the caller has already handled consent.
+    """
     print(f"Trying {'aggressive ' if aggressive else ''}popup handling...")
     
     # Step 1: Try button clicking with human delays
-    add_human_pause(page, 500, 1200)
+    if try_buttons and human_pauses:
+        add_human_pause(page, 500, 1200)
     
-    button_clicked = handle_cookies_and_consent(page, timeout=8000 if aggressive else 5000)
+    button_clicked = try_buttons and handle_cookies_and_consent(
+        page, timeout=8000 if aggressive else 5000, settle=human_pauses
+    )
     
     if button_clicked:
         print("✅ Successfully handled popup with button clicking")
-        add_human_pause(page, 1000, 2000)
+        if human_pauses:
+            add_human_pause(page, 1000, 2000)
         return True
     
     # Step 2: DOM removal fallback if aggressive
     if aggressive:
         print("Using DOM removal fallback...")
-        add_human_pause(page, 1000, 2000)
+        if human_pauses:
+            add_human_pause(page, 1000, 2000)
         
         try:
-            removed_count = page.evaluate("""() => {
-                const removeElements = (selector) => {
-                    const elements = document.querySelectorAll(selector);
-                    let removed = 0;
-                    elements.forEach(el => {
-                        el.remove();
-                        removed++;
-                    });
-                    return removed;
-                };
-                
-                let removedCount = 0;
-                
-                // Remove elements with high z-index that could be overlays
-                document.querySelectorAll('*').forEach(el => {
-                    const style = window.getComputedStyle(el);
-                    const zIndex = parseInt(style.zIndex);
-                    if (zIndex > 999) {
-                        const position = style.position;
-                        if (position === 'fixed' || position === 'absolute') {
-                            el.remove();
-                            removedCount++;
-                        }
-                    }
-                });
-                
-                // Remove common cookie/consent banners
-                removedCount += removeElements('[class*="cookie"]:not(html):not(body)');
-                removedCount += removeElements('[class*="consent"]:not(html):not(body)');
-                removedCount += removeElements('[class*="popup"]:not(html):not(body)');
-                removedCount += removeElements('[class*="banner"]:not(html):not(body)');
-                removedCount += removeElements('[class*="overlay"]:not(html):not(body)');
-                removedCount += removeElements('[class*="modal"]:not(html):not(body)');
-                removedCount += removeElements('[id*="cookie"]:not(html):not(body)');
-                removedCount += removeElements('[id*="consent"]:not(html):not(body)');
-                
-                document.body.style.overflow = 'auto';
-                document.documentElement.style.overflow = 'auto';
-                
-                return removedCount;
-            }""")
+            result = page.evaluate(REMOVE_OVERLAYS_JS)
+            removed = result.get("removed", [])
+            print(f"DOM removal: removed {len(removed)} elements in {result.get('ms')} ms "
+                  f"({result.get('checked')} candidates checked)")
+            for descriptor in removed:
+                print(f"  - {descriptor}")
             
-            if removed_count > 0:
-                print("DOM removal: removed ${removed_count} elements")
-                add_human_pause(page, 1500, 3000)
+            if removed:
+                if human_pauses:
+                    add_human_pause(page, 1500, 3000)
                 return True
         except Exception as e:
             print(f"DOM removal failed: {e}")
     
     return False
 
+# Main-content selectors tried in order, by both extraction paths
+CONTENT_SELECTORS = [
+    'article', 
+    '[role="main"]', 
+    '.content', 
+    '#content',
+    '.post-content',
+    '.article-body',
+    '.entry-content'
+]
+
+# Elements whose text is never part of the readable content
+EXCLUDED_TAGS = ['script', 'style', 'nav', 'footer', 'aside', 'header']
+
+# In-page equivalent of extract_readable_text(): only the selected text and
+# markup, the title and the page's links cross the wire
+READABLE_CONTENT_JS = """(args) => {
+    const [selectors, excludedTags, minChars, maxLinks] = args;
+    const excluded = new Set(excludedTags.map((tag) => tag.toUpperCase()));
+    const excludedSelector = excludedTags.join(',');
+
+    // Length of the stripped text nodes joined by spaces, skipping excluded subtrees
+    const textLength = (root) => {
+        let length = -1;
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode: (node) => node.nodeType === Node.ELEMENT_NODE && excluded.has(node.tagName)
+                ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+        });
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.nodeType !== Node.TEXT_NODE) continue;
+            const text = node.nodeValue.trim();
+            if (text) length += text.length + 1;
+        }
+        return Math.max(length, 0);
+    };
+
+    let chars = null;
+    let selector = null;
+    let root = null;
+    for (const sel of selectors) {
+        const el = Array.from(document.querySelectorAll(sel)).find((node) => !node.closest(excludedSelector));
+        if (!el) continue;
+        const candidate = textLength(el);
+        if (candidate > minChars) {
+            chars = candidate;
+            selector = sel;
+            root = el;
+            break;
+        }
+    }
+    if (chars === null) chars = textLength(document.documentElement);
+    // Only the chosen element's markup crosses to Python (text is derived from
+    // it there), minus the excluded subtrees the markdown drops anyway
+    const clone = (root || document.body || document.documentElement).cloneNode(true);
+    if (excludedSelector) clone.querySelectorAll(excludedSelector).forEach((node) => node.remove());
+    const html = clone.outerHTML;
+
+    const links = [];
+    const seen = new Set();
+    for (const a of document.querySelectorAll('a[href]')) {
+        const href = a.href;
+        if (!href || !href.startsWith('http') || seen.has(href)) continue;
+        seen.add(href);
+        links.push([(a.innerText || a.textContent || '').trim().replace(/\\s+/g, ' '), href]);
+        if (links.length >= maxLinks) break;
+    }
+    return {chars, html, selector, title: document.title || '', links};
+}"""
+
 def extract_readable_text(soup):
     """Extract readable text from BeautifulSoup object."""
     # Remove unwanted elements
-    for element in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
+    for element in soup(EXCLUDED_TAGS):
         element.decompose()
     
     # Try to find main content areas
-    content_selectors = [
-        'article', 
-        '[role="main"]', 
-        '.content', 
-        '#content',
-        '.post-content',
-        '.article-body',
-        '.entry-content'
-    ]
-    
-    for selector in content_selectors:
+    for selector in CONTENT_SELECTORS:
         content = soup.select_one(selector)
         if content:
             text = content.get_text(separator=' ', strip=True)
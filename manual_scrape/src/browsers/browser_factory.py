@@ -1,9 +1,6 @@
 """Factory class for creating browser instances."""
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from config import BROWSER
+from ..scrape_config import BROWSER
 
 from .browser_chromium import ChromiumBrowser
 from .browser_firefox import FirefoxBrowser
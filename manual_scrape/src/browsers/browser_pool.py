@@ -0,0 +1,170 @@
+"""Persistent Playwright browser pool.
+
+Launching Firefox/Chromium costs 1-3 s, so browsers are launched once per
+process and reused; every scrape gets a fresh, isolated `BrowserContext`.
+Browsers are recycled after a configurable number of pages or when they
+crash (disconnect).
+
+Playwright's sync API is bound to the thread that started it, so there is
+one pool per thread (see `get_browser_pool`).
+"""
+
+import atexit
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from playwright.sync_api import sync_playwright
+
+from ..scrape_config import BROWSER
+from .browser_factory import BrowserFactory
+
+
+class BrowserPool:
+    """Long-lived browsers handing out fresh contexts per scrape."""
+
+    def __init__(self, size: int = 1, max_pages_per_browser: int = 50, warm_up: bool = False,
+                 headless: bool = True, browser_name: Optional[str] = None) -> None:
+        """Initialize the pool (browsers launch lazily unless warmed up).
+
+        Args:
+            size: Number of browsers kept alive.
+            max_pages_per_browser: Recycle a browser after this many contexts.
+            warm_up: Launch all browsers on first use instead of on demand.
+            headless: Launch browsers headless.
+            browser_name: Browser engine; defaults to `BROWSER['default']`.
+        """
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.warm_up = warm_up
+        self.headless = headless
+        self.browser_config = BrowserFactory.create(browser_name)
+        self._playwright = None
+        self._browsers: List[Any] = [None] * self.size
+        self._page_counts: List[int] = [0] * self.size
+        self._next_slot = 0
+        self.launches = 0
+        self.recycles = 0
+
+    def start(self) -> "BrowserPool":
+        """Start Playwright and optionally launch all browsers."""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+            if self.warm_up:
+                for slot in range(self.size):
+                    self._ensure_browser(slot)
+        return self
+
+    def _ensure_browser(self, slot: int):
+        """Return a connected browser for a slot, (re)launching if needed."""
+        browser = self._browsers[slot]
+        if browser is not None and browser.is_connected():
+            return browser
+        if browser is not None:
+            print(f"♻️ Browser in slot {slot} disconnected, relaunching")
+            self.recycles += 1
+        browser = self.browser_config.launch(self._playwright, headless=self.headless)
+        self._browsers[slot] = browser
+        self._page_counts[slot] = 0
+        self.launches += 1
+        return browser
+
+    def _recycle(self, slot: int) -> None:
+        """Close a browser so the next use of its slot relaunches it."""
+        browser = self._browsers[slot]
+        self._browsers[slot] = None
+        self._page_counts[slot] = 0
+        self.recycles += 1
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception as e:
+                print(f"Error closing recycled browser: {e}")
+
+    @contextmanager
+    def context(self, **context_kwargs: Any) -> Iterator[Any]:
+        """Yield a fresh `BrowserContext` from a pooled browser.
+
+        A random user agent for the configured engine and the default
+        viewport are applied unless given in `context_kwargs`.
+        """
+        self.start()
+        slot = self._next_slot
+        self._next_slot = (self._next_slot + 1) % self.size
+        browser = self._ensure_browser(slot)
+
+        options: Dict[str, Any] = {
+            "user_agent": random.choice(self.browser_config.get_user_agents()),
+            "viewport": {"width": 1280, "height": 1200},
+        }
+        options.update(context_kwargs)
+        context = browser.new_context(**options)
+        try:
+            yield context
+        finally:
+            try:
+                context.close()
+            except Exception:
+                pass
+            self._page_counts[slot] += 1
+            if not browser.is_connected():
+                # Crashed: drop it, the next use of this slot relaunches
+                self._browsers[slot] = None
+                self.recycles += 1
+            elif self._page_counts[slot] >= self.max_pages_per_browser:
+                self._recycle(slot)
+
+    def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        for slot in range(self.size):
+            browser = self._browsers[slot]
+            self._browsers[slot] = None
+            if browser is not None:
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+_thread_pools = threading.local()
+_all_pools: List[tuple] = []
+_registry_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return this thread's browser pool, creating it from `BROWSER['pool']`."""
+    pool = getattr(_thread_pools, "pool", None)
+    if pool is None:
+        settings = BROWSER.get("pool", {})
+        pool = BrowserPool(
+            size=settings.get("size", 1),
+            max_pages_per_browser=settings.get("max_pages_per_browser", 50),
+            warm_up=settings.get("warm_up", False),
+            headless=settings.get("headless", True),
+        )
+        _thread_pools.pool = pool
+        with _registry_lock:
+            _all_pools.append((threading.get_ident(), pool))
+    return pool
+
+
+def close_browser_pools() -> None:
+    """Close the pools owned by the calling thread (others exit with the process)."""
+    ident = threading.get_ident()
+    with _registry_lock:
+        owned = [pool for owner, pool in _all_pools if owner == ident]
+        _all_pools[:] = [(owner, pool) for owner, pool in _all_pools if owner != ident]
+    for pool in owned:
+        pool.close()
+    if getattr(_thread_pools, "pool", None) in owned:
+        _thread_pools.pool = None
+
+
+atexit.register(close_browser_pools)
@@ -0,0 +1,105 @@
+"""Per-domain persistence of consent state.
+
+After a consent banner has been accepted on a site, the context's cookies
+and localStorage are saved as a Playwright `storage_state` file for that
+site. New contexts for the same site start from that state, so the banner
+does not reappear and consent handling can be skipped entirely.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from .request_blocking import site_of
+from .scrape_config import BROWSER
+
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".consent_state")
+
+
+class ConsentStore:
+    """Storage-state files keyed by site (registrable domain)."""
+
+    def __init__(self, directory: Optional[str] = None, max_age_days: float = 30, enabled: bool = True) -> None:
+        """Initialize the store.
+
+        Args:
+            directory: Where state files are kept; defaults to
+                `manual_scrape/.consent_state`.
+            max_age_days: Saved state older than this is ignored (consent
+                cookies expire and banners change).
+            enabled: When False the store never loads or saves anything.
+        """
+        self.directory = directory or DEFAULT_STATE_DIR
+        self.max_age_seconds = max_age_days * 86400
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "ConsentStore":
+        """Build a store from `BROWSER['consent']`."""
+        settings = BROWSER.get("consent", {})
+        return cls(
+            directory=settings.get("state_dir"),
+            max_age_days=settings.get("max_age_days", 30),
+            enabled=settings.get("persist", True),
+        )
+
+    def state_path(self, url_or_domain: str) -> str:
+        """Return the state file path for a URL or domain."""
+        host = urlparse(url_or_domain).netloc if "://" in url_or_domain else url_or_domain
+        return os.path.join(self.directory, f"{site_of(host)}.json")
+
+    def state_for(self, url_or_domain: str) -> Optional[str]:
+        """Return a fresh saved state file for the site, or None."""
+        if not self.enabled:
+            return None
+        path = self.state_path(url_or_domain)
+        try:
+            if time.time() - os.path.getmtime(path) <= self.max_age_seconds:
+                return path
+        except OSError:
+            pass
+        return None
+
+    def has_consent(self, url_or_domain: str) -> bool:
+        """Whether consent was already accepted on this site."""
+        return self.state_for(url_or_domain) is not None
+
+    def save(self, context: Any, url_or_domain: str) -> None:
+        """Save a sync `BrowserContext`'s storage state for the site."""
+        if not self.enabled:
+            return
+        path = self.state_path(url_or_domain)
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                context.storage_state(path=path)
+            print(f"🍪 Saved consent state for {os.path.basename(path)[:-5]}")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not save consent state: {e}")
+
+    async def save_async(self, context: Any, url_or_domain: str) -> None:
+        """Save an async `BrowserContext`'s storage state for the site."""
+        if not self.enabled:
+            return
+        path = self.state_path(url_or_domain)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            await context.storage_state(path=path)
+            print(f"🍪 Saved consent state for {os.path.basename(path)[:-5]}")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not save consent state: {e}")
+
+
+_default_store: Optional[ConsentStore] = None
+
+
+def get_consent_store() -> ConsentStore:
+    """Return the process-wide consent store built from config."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ConsentStore.from_config()
+    return _default_store
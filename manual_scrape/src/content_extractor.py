@@ -2,15 +2,49 @@
 
 import time
 from bs4 import BeautifulSoup
-from .browser_utils import handle_any_popups, add_human_pause, extract_readable_text
+from .browser_utils import (
+    CONTENT_SELECTORS, EXCLUDED_TAGS, READABLE_CONTENT_JS,
+    handle_any_popups, handle_cookies_and_consent, add_human_pause, extract_readable_text,
+    is_accept_selector,
+)
+from .consent_store import get_consent_store
+from .html_to_markdown import html_to_markdown
+from .page_readiness import SCROLL_JS, get_readiness_profile, get_target_selectors, wait_until_ready
+
+# Content length thresholds (chars) used to accept or reject extractions
+SUBSTANTIAL_CONTENT_CHARS = 5500
+MIN_CONTENT_CHARS = 150
+MIN_VALID_CONTENT_CHARS = 1600
+
+# A main-content element must exceed this to be preferred over the whole page
+MAIN_CONTENT_MIN_CHARS = 500
+
+# Links returned by in-page extraction
+MAX_LINKS = 500
+
+# Fallback extraction: raw body text
+BODY_TEXT_JS = """() => {
+    const bodyText = document.body.innerText;
+    return bodyText || '';
+}"""
 
 class ContentExtractor:
     """Extract article content from a webpage."""
     
-    def __init__(self):
-        pass
+    def __init__(self, readiness_profile=None, target_selectors=None):
+        """Initialize the extractor.
+        
+        Args:
+            readiness_profile: "fast", "balanced" or "stealth"; defaults to
+                `BROWSER['readiness']['profile']`
+            target_selectors: Selectors that must be present before extraction;
+                defaults to `BROWSER['readiness']['target_selectors']`
+        """
+        self.readiness = get_readiness_profile(readiness_profile)
+        self.target_selectors = get_target_selectors() if target_selectors is None else list(target_selectors)
+        self.consent_store = get_consent_store()
     
-    def extract_article_content(self, page, url, article, domain, source, user_email=None):
+    def extract_article_content(self, page, url, article, domain, source, user_email=None, extras=None):
         """Extract article content from the page.
         
         Args:
@@ -20,6 +54,8 @@ class ContentExtractor:
             domain: The domain of the article
             source: The source of the article
             user_email: Optional user email for validation context
+            extras: Optional dict filled with the page's "links" (title, url)
+                pairs and the extraction "method" ("in-page" or "soup")
             
         Returns:
             tuple: (success, article_content, title, rejection_reason)
@@ -27,30 +63,35 @@ class ContentExtractor:
         print("Extracting article content...")
                 
         try:
+            profile = self.readiness
+            human_pauses = profile["human_pauses"]
+            
             # Start with aggressive popup handling first
-            print("Applying aggressive popup/cookie handling approach...")
-            handle_any_popups(page, aggressive=True)
-            page.wait_for_timeout(1000)
+            print(f"Applying aggressive popup/cookie handling approach ({profile['name']} profile)...")
+            self._handle_popups(page, url, human_pauses)
             
-            # Perform progressive scrolling for content exposure
-            print("Performing progressive scrolling for content exposure...")
-            self._perform_progressive_scrolling(page)
+            if profile["scroll_pause_ms"] is not None:
+                # Perform progressive scrolling for content exposure
+                print("Performing progressive scrolling for content exposure...")
+                self._perform_progressive_scrolling(page, profile["scroll_pause_ms"])
+                
+                # Handle any popups that appeared after scrolling
+                print("Handling any new popups after scrolling...")
+                self._handle_popups(page, url, human_pauses)
             
-            # Handle any popups that appeared after scrolling
-            print("Handling any new popups after scrolling...")
-            handle_any_popups(page, aggressive=True)
-            page.wait_for_timeout(1000)
+            # Wait until the DOM is quiet and the text has stopped growing
+            wait_until_ready(page, profile, self.target_selectors)
             
-            # Wait for page to be fully loaded with a timeout
-            print("Waiting for page ready state before content extraction...")
-            try:
-                page.wait_for_load_state("networkidle", timeout=10000)
-                print("Page ready state reached")
-            except Exception as e:
-                print(f"Error waiting for page ready state (continuing anyway): {e}")
+            if profile["networkidle_ms"]:
+                try:
+                    page.wait_for_load_state("networkidle", timeout=profile["networkidle_ms"])
+                    print("Page ready state reached")
+                except Exception as e:
+                    print(f"Error waiting for page ready state (continuing anyway): {e}")
             
-            # Extract content with BeautifulSoup
-            article_content = self._extract_content_with_soup(page)
+            # Extract readable text in the page (BeautifulSoup as fallback)
+            extras = {} if extras is None else extras
+            article_content = self._extract_content(page, extras)
             
             # Get character count
             chars_count = len(article_content) if article_content else 0
@@ -61,35 +102,32 @@ class ContentExtractor:
                 print(f"Content (under 100 chars): {article_content}")
             
             # If we have substantial content (>5500 chars), consider it valid
-            if article_content and len(article_content) > 5500:
-                title = self._extract_title(page, article)
+            if article_content and len(article_content) > SUBSTANTIAL_CONTENT_CHARS:
+                title = self._extract_title(page, article, extras.get("title"))
                 print(f"Article has substantial content ({len(article_content)} chars), accepting")
                 return True, article_content, title, None
             
             # Continue with validation for articles with less content
-            if article_content and len(article_content) > 150:
-                title = self._extract_title(page, article)
+            if article_content and len(article_content) > MIN_CONTENT_CHARS:
+                title = self._extract_title(page, article, extras.get("title"))
             
                 # Return the content for validation
-                if len(article_content) < 1600:
-                    print(f"Content too short: {len(article_content)} chars (minimum 1600)")
+                if len(article_content) < MIN_VALID_CONTENT_CHARS:
+                    print(f"Content too short: {len(article_content)} chars (minimum {MIN_VALID_CONTENT_CHARS})")
                     
                     # Try a more aggressive approach as fallback
                     try:
                         print("Attempting more aggressive content extraction as fallback...")
                         
-                        fallback_content = page.evaluate("""() => {
-                            const bodyText = document.body.innerText;
-                            return bodyText || '';
-                        }""")
+                        fallback_content = page.evaluate(BODY_TEXT_JS)
                         
-                        if fallback_content and len(fallback_content) > 1600:
+                        if fallback_content and len(fallback_content) > MIN_VALID_CONTENT_CHARS:
                             print(f"Fallback extraction succeeded, got {len(fallback_content)} chars")
                             return True, fallback_content, title, None
                     except Exception as fallback_error:
                         print(f"Fallback extraction failed: {fallback_error}")
                     
-                    rejection_reason = f"Content too short: {len(article_content)} chars (minimum 1600)"
+                    rejection_reason = f"Content too short: {len(article_content)} chars (minimum {MIN_VALID_CONTENT_CHARS})"
                     return False, "", title, rejection_reason
                 
                 return True, article_content, title, None
@@ -105,27 +143,59 @@ class ContentExtractor:
             rejection_reason = f"Error: {str(e)}"
             return False, "", article.get("title", ""), rejection_reason
 
-    def _perform_progressive_scrolling(self, page):
+    def _handle_popups(self, page, url, human_pauses):
+        """Accept consent (skipped when the site's consent is stored), else remove overlays."""
+        if self.consent_store.has_consent(url):
+            # Stored consent only covers the cookie banner: newsletter modals
+            # and other overlays still need removing
+            print("🍪 Consent already stored for this site, skipping consent buttons")
+            handle_any_popups(page, aggressive=True, human_pauses=human_pauses, try_buttons=False)
+            return
+        
+        if human_pauses:
+            add_human_pause(page, 500, 1200)
+        selector = handle_cookies_and_consent(page, timeout=8000, settle=human_pauses)
+        if selector:
+            print("✅ Successfully handled popup with button clicking")
+            # Closing a popup is not consent; only accept clicks are persisted
+            if is_accept_selector(selector):
+                self.consent_store.save(page.context, url)
+            if human_pauses:
+                add_human_pause(page, 1000, 2000)
+            return
+        
+        handle_any_popups(page, aggressive=True, human_pauses=human_pauses, try_buttons=False)
+
+    def _perform_progressive_scrolling(self, page, pause_ms=1000):
         """Perform progressive scrolling to expose all content."""
         try:
-            page_height = page.evaluate("document.body.scrollHeight")
-            view_height = page.evaluate("window.innerHeight")
-            
-            scroll_steps = min(4, max(2, int(page_height / view_height)))
-            print(f"Performing {scroll_steps} scroll steps to load all content...")
-            
-            for i in range(1, scroll_steps + 1):
-                scroll_position = (i * page_height) / scroll_steps
-                page.evaluate(f"window.scrollTo(0, {scroll_position})")
-                page.wait_for_timeout(1000)
-            
-            # Go back to top before extraction
-            page.evaluate("window.scrollTo(0, 0)")
-            page.wait_for_timeout(1000)
-            
+            scroll_steps = page.evaluate(SCROLL_JS, pause_ms)
+            print(f"Scrolled through page in {scroll_steps} steps")
         except Exception as e:
             print(f"Error during progressive scrolling: {e}")
 
+    def _extract_content(self, page, extras):
+        """Extract readable content as markdown inside the page, falling back to BeautifulSoup text."""
+        try:
+            result = page.evaluate(
+                READABLE_CONTENT_JS, [CONTENT_SELECTORS, EXCLUDED_TAGS, MAIN_CONTENT_MIN_CHARS, MAX_LINKS]
+            )
+            extras["title"] = result.get("title") or ""
+            extras["links"] = [(text, href) for text, href in result.get("links", [])]
+            if result.get("chars"):
+                extras["method"] = "in-page"
+                # Markdown keeps links/headings/tables like the Firecrawl backend
+                markdown = html_to_markdown(result.get("html") or "", page.url, EXCLUDED_TAGS)
+                if markdown:
+                    return markdown
+                # Plain text of the same markup when nothing converted
+                return BeautifulSoup(result.get("html") or "", "html.parser").get_text(separator=" ", strip=True)
+        except Exception as e:
+            print(f"In-page extraction failed, falling back to BeautifulSoup: {e}")
+        
+        extras["method"] = "soup"
+        return self._extract_content_with_soup(page)
+
     def _extract_content_with_soup(self, page):
         """Extract content using BeautifulSoup parsing."""
         try:
@@ -140,8 +210,10 @@ class ContentExtractor:
             print(f"Error during content extraction: {e}")
             return ""
 
-    def _extract_title(self, page, article):
-        """Extract title from the page."""
+    def _extract_title(self, page, article, page_title=None):
+        """Extract title from the page (or use the title already read in-page)."""
+        if page_title and page_title.strip():
+            return page_title.strip()
         try:
             # Try to get title from page
             page_title = page.title()
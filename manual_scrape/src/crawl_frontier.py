@@ -0,0 +1,193 @@
+"""
+Persistent crawl frontier with URL canonicalization and a scalable seen-set.
+
+URLs are canonicalized (lower-cased scheme/host, default ports and fragments
+stripped, tracking parameters removed, query parameters sorted) before they
+are queued. The seen-set is a Bloom filter in memory backed by an exact
+SQLite table: a Bloom miss means the URL is new without touching the
+database, and only Bloom hits are confirmed against SQLite. The queue lives in
+the same SQLite file, so an interrupted crawl resumes where it stopped.
+"""
+
+import hashlib
+import math
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+
+# Query parameters that only track the visitor and never change the content
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "_hsenc", "_hsmi", "ref", "ref_src", "spm", "srsltid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "piwik_")
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def canonicalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Canonicalize a URL for deduplication.
+
+    Args:
+        url: Absolute or relative URL.
+        base_url: Base for resolving relative URLs.
+
+    Returns:
+        The canonical URL, or None for non-HTTP(S) links (mailto:, javascript:, ...).
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    if base_url:
+        url = urljoin(base_url, url)
+
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    if scheme not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower().rstrip(".")
+    port = parsed.port
+    netloc = host if port is None or str(port) == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(params))
+    path = parsed.path or "/"
+
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001) -> None:
+        """
+        Size the filter for an expected number of items.
+
+        Args:
+            capacity: Expected number of items.
+            error_rate: Target false-positive rate at that capacity.
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class CrawlFrontier:
+    """SQLite-backed crawl queue and seen-set."""
+
+    def __init__(self, db_path: str, capacity: int = 1_000_000, error_rate: float = 0.001) -> None:
+        """
+        Open (or resume) a frontier.
+
+        Args:
+            db_path: SQLite file holding the queue and seen URLs.
+            capacity: Expected number of distinct URLs (Bloom filter sizing).
+            error_rate: Bloom filter false-positive rate; false positives only
+                cost one exact SQLite lookup.
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                depth INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                parent TEXT,
+                discovered_at REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_queue ON urls(status, depth)")
+        # Pages in flight when a previous run stopped are fetched again
+        self.conn.execute("UPDATE urls SET status = 'queued' WHERE status = 'in_progress'")
+        self.conn.commit()
+
+        self.seen = BloomFilter(capacity, error_rate)
+        self.bloom_hits = 0
+        self.exact_checks = 0
+        for (url,) in self.conn.execute("SELECT url FROM urls"):
+            self.seen.add(url)
+
+    def add(self, url: str, depth: int, parent: Optional[str] = None) -> bool:
+        """
+        Queue a URL unless it was seen before.
+
+        Args:
+            url: URL to queue (canonicalized by the caller).
+            depth: Link distance from the seed.
+            parent: Page the link was found on.
+
+        Returns:
+            True if the URL was new and queued.
+        """
+        if url in self.seen:
+            # Possible false positive: confirm against the exact set
+            self.bloom_hits += 1
+            self.exact_checks += 1
+            if self.conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone():
+                return False
+        self.conn.execute(
+            "INSERT OR IGNORE INTO urls (url, depth, parent, discovered_at) VALUES (?, ?, ?, ?)",
+            (url, depth, parent, time.time()),
+        )
+        self.seen.add(url)
+        return True
+
+    def pop_batch(self, limit: int) -> List[Tuple[str, int]]:
+        """Take up to `limit` queued URLs, shallowest first, marking them in progress."""
+        rows = self.conn.execute(
+            "SELECT url, depth FROM urls WHERE status = 'queued' ORDER BY depth, rowid LIMIT ?",
+            (limit,),
+        ).fetchall()
+        self.conn.executemany("UPDATE urls SET status = 'in_progress' WHERE url = ?", [(url,) for url, _ in rows])
+        self.conn.commit()
+        return rows
+
+    def mark(self, url: str, status: str) -> None:
+        """Set a URL's final status ("done", "failed", "skipped", "duplicate")."""
+        self.conn.execute("UPDATE urls SET status = ? WHERE url = ?", (status, url))
+
+    def commit(self) -> None:
+        """Flush pending changes to disk."""
+        self.conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of URLs per status plus seen-set counters."""
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+        counts["seen"] = sum(counts.values())
+        counts["bloom_hits"] = self.bloom_hits
+        counts["exact_checks"] = self.exact_checks
+        return counts
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        try:
+            self.conn.commit()
+        finally:
+            self.conn.close()
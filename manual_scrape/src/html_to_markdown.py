@@ -0,0 +1,266 @@
+"""Convert HTML to markdown, keeping links, headings, lists and tables.
+
+Built on lxml and a single `iterwalk` pass over the parsed tree (no
+recursion, so deeply nested pages are fine). Used by the Playwright backend
+so its `markdown_content` carries `[title](href)` links like Firecrawl's
+output, and by BMEcat's plain-HTTP tier.
+"""
+
+import re
+from typing import List, Optional, Sequence
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+
+
+DEFAULT_EXCLUDED_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "head")
+
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "header", "footer", "aside", "nav", "form",
+    "fieldset", "figure", "figcaption", "address", "dl", "dt", "dd", "details", "summary",
+    "blockquote", "ul", "ol", "hr", "body", "html",
+}
+HEADING_LEVELS = {f"h{level}": level for level in range(1, 7)}
+EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+
+# huge_tree lifts libxml2's size limits on very large pages
+_PARSER = lxml_html.HTMLParser(huge_tree=True)
+
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _tag(element) -> Optional[str]:
+    """Lower-case tag name, or None for comments and processing instructions."""
+    return element.tag.lower() if isinstance(element.tag, str) else None
+
+
+class _MarkdownWriter:
+    """Accumulates inline text and block separators."""
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+
+    def text(self, value: Optional[str], preformatted: bool = False) -> None:
+        if not value:
+            return
+        if not preformatted:
+            value = _WHITESPACE.sub(" ", value)
+            # Avoid leading spaces at line starts
+            if not self.parts or self.parts[-1].endswith("\n"):
+                value = value.lstrip()
+        if value:
+            self.parts.append(value)
+
+    def raw(self, value: str) -> None:
+        self.parts.append(value)
+
+    def block(self) -> None:
+        """Start a new paragraph."""
+        self._strip_trailing_spaces()
+        if self.parts and not self.parts[-1].endswith("\n\n"):
+            self.parts.append("\n\n" if not self.parts[-1].endswith("\n") else "\n")
+
+    def line(self) -> None:
+        """Start a new line."""
+        self._strip_trailing_spaces()
+        if self.parts and not self.parts[-1].endswith("\n"):
+            self.parts.append("\n")
+
+    def _strip_trailing_spaces(self) -> None:
+        while self.parts and self.parts[-1].strip(" ") == "":
+            self.parts.pop()
+        if self.parts:
+            self.parts[-1] = self.parts[-1].rstrip(" ")
+
+    def result(self) -> str:
+        return _BLANK_LINES.sub("\n\n", "".join(self.parts)).strip()
+
+
+class HTMLToMarkdown:
+    """Convert HTML documents or elements to markdown."""
+
+    def __init__(self, base_url: Optional[str] = None, excluded_tags: Sequence[str] = ()) -> None:
+        """
+        Args:
+            base_url: Base for resolving relative link and image URLs.
+            excluded_tags: Tags whose whole subtree is dropped, on top of
+                `DEFAULT_EXCLUDED_TAGS`.
+        """
+        self.base_url = base_url
+        self.excluded = {tag.lower() for tag in (*DEFAULT_EXCLUDED_TAGS, *excluded_tags)}
+
+    def _href(self, href: Optional[str]) -> Optional[str]:
+        href = (href or "").strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+            return None
+        return urljoin(self.base_url, href) if self.base_url else href
+
+    def convert(self, html: str) -> str:
+        """Convert an HTML string to markdown."""
+        if not html or not html.strip():
+            return ""
+        try:
+            root = lxml_html.fromstring(html, parser=_PARSER)
+        except (etree.ParserError, ValueError):
+            return ""
+        # iterwalk does not visit comments, so drop them (keeping their tails)
+        etree.strip_tags(root, etree.Comment, etree.ProcessingInstruction)
+        return self.convert_element(root)
+
+    def convert_element(self, root, in_cell: bool = False) -> str:
+        """Convert a parsed lxml element (and its subtree) to markdown.
+
+        Args:
+            root: Element to convert.
+            in_cell: The element is a table cell; tables inside it are
+                flattened, since pipe tables cannot nest.
+        """
+        out = _MarkdownWriter()
+        lists: List[List] = []   # [tag, item counter] per open list
+        link_hrefs: List[Optional[str]] = []
+        pre_depth = 0
+
+        walker = etree.iterwalk(root, events=("start", "end"))
+        for event, element in walker:
+            tag = _tag(element)
+
+            if event == "start":
+                if tag is None or tag in self.excluded:
+                    walker.skip_subtree()
+                    continue
+                if tag == "table":
+                    out.block()
+                    out.raw(self._inline_table(element) if in_cell else self._table(element))
+                    out.block()
+                    walker.skip_subtree()
+                    continue
+                if tag in HEADING_LEVELS:
+                    out.block()
+                    out.raw("#" * HEADING_LEVELS[tag] + " ")
+                elif tag in ("ul", "ol"):
+                    if lists:
+                        out.line()
+                    else:
+                        out.block()
+                    lists.append([tag, 0])
+                elif tag == "li":
+                    out.line()
+                    indent = "  " * max(0, len(lists) - 1)
+                    if lists and lists[-1][0] == "ol":
+                        lists[-1][1] += 1
+                        out.raw(f"{indent}{lists[-1][1]}. ")
+                    else:
+                        out.raw(f"{indent}- ")
+                elif tag == "pre":
+                    out.block()
+                    out.raw("```\n")
+                    pre_depth += 1
+                elif tag == "code" and not pre_depth:
+                    out.raw("`")
+                elif tag == "blockquote":
+                    out.block()
+                    out.raw("> ")
+                elif tag == "br":
+                    out.line()
+                elif tag == "hr":
+                    out.block()
+                    out.raw("---")
+                elif tag == "img":
+                    src = self._href(element.get("src"))
+                    alt = _WHITESPACE.sub(" ", element.get("alt") or "").strip()
+                    if src and alt:
+                        out.raw(f"![{alt}]({src})")
+                elif tag == "a":
+                    href = self._href(element.get("href"))
+                    link_hrefs.append(href)
+                    if href:
+                        out.raw("[")
+                elif tag in EMPHASIS:
+                    out.raw(EMPHASIS[tag])
+                elif tag in BLOCK_TAGS:
+                    out.block()
+                out.text(element.text, preformatted=bool(pre_depth))
+                continue
+
+            # end event
+            if tag is not None and tag not in self.excluded and tag != "table":
+                if tag in HEADING_LEVELS:
+                    out.block()
+                elif tag in ("ul", "ol"):
+                    if lists:
+                        lists.pop()
+                    if lists:
+                        out.line()
+                    else:
+                        out.block()
+                elif tag == "pre":
+                    pre_depth -= 1
+                    out.line()
+                    out.raw("```")
+                    out.block()
+                elif tag == "code" and not pre_depth:
+                    out.raw("`")
+                elif tag == "a":
+                    href = link_hrefs.pop() if link_hrefs else None
+                    if href:
+                        out.raw(f"]({href})")
+                elif tag in EMPHASIS:
+                    out.raw(EMPHASIS[tag])
+                elif tag in BLOCK_TAGS:
+                    out.block()
+            if element is not root:
+                out.text(element.tail, preformatted=bool(pre_depth))
+
+        return out.result()
+
+    def _rows(self, table) -> List[List[str]]:
+        """Cell texts of a table's own rows, each on one line."""
+        rows: List[List[str]] = []
+        for row in table.iter("tr"):
+            # Rows of nested tables belong to their own cell
+            if row.xpath("ancestor::table[1]")[0] is not table:
+                continue
+            cells = [
+                _WHITESPACE.sub(" ", self.convert_element(cell, in_cell=True)).strip()
+                for cell in row
+                if _tag(cell) in ("td", "th")
+            ]
+            if cells:
+                rows.append(cells)
+        return rows
+
+    def _inline_table(self, table) -> str:
+        """Flatten a table nested in a cell: cells joined by "; ", rows by <br>."""
+        return "<br>".join("; ".join(cell for cell in row if cell) for row in self._rows(table))
+
+    def _table(self, table) -> str:
+        """Render a table as a markdown pipe table (first row as header)."""
+        rows = [[cell.replace("|", "\\|") for cell in row] for row in self._rows(table)]
+        if not rows:
+            return ""
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n".join(lines)
+
+
+def html_to_markdown(
+    html: str,
+    base_url: Optional[str] = None,
+    excluded_tags: Sequence[str] = (),
+) -> str:
+    """
+    Convert HTML to markdown.
+
+    Args:
+        html: HTML document or fragment.
+        base_url: Base for resolving relative URLs.
+        excluded_tags: Extra tags whose subtree is dropped (scripts, styles and
+            `<head>` always are).
+
+    Returns:
+        Markdown text ("" for empty or unparseable input).
+    """
+    return HTMLToMarkdown(base_url, excluded_tags).convert(html)
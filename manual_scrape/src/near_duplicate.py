@@ -0,0 +1,233 @@
+"""
+Near-duplicate page detection with SimHash.
+
+Each scraped page gets a 64-bit SimHash of its word 3-shingles. Pages whose
+fingerprints differ in at most `max_distance` bits are near-duplicates
+(listing pages, print views, language variants sharing most of their text).
+The index splits fingerprints into `max_distance + 1` bands: two fingerprints
+within the distance must agree on at least one whole band, so a lookup only
+compares against pages sharing a band instead of scanning every page. The
+index is kept in memory and appended to a JSONL file so it survives runs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scrape_config import host_setting
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+# Pages with fewer words are too short to fingerprint reliably
+MIN_WORDS = 50
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".near_duplicate_index.jsonl"
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Markdown link targets and image URLs carry no page text
+_MARKDOWN_URL = re.compile(r"\]\([^)]*\)")
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE, min_words: int = MIN_WORDS) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash of a text's word shingles.
+
+    Args:
+        text: Page text (markdown is fine; link URLs are ignored).
+        shingle_size: Words per shingle.
+        min_words: Texts with fewer words return None.
+
+    Returns:
+        The fingerprint, or None for texts too short to compare.
+    """
+    words = _WORD.findall(_MARKDOWN_URL.sub("]", text or "").lower())
+    if len(words) < min_words:
+        return None
+    shingles = Counter(" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+
+    # Accumulate counts per (byte position, byte value) first; spreading
+    # them over bits afterwards is far cheaper than 64 updates per shingle
+    byte_counts = [[0] * 256 for _ in range(FINGERPRINT_BITS // 8)]
+    total = 0
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        for position, byte in enumerate(digest):
+            byte_counts[position][byte] += count
+        total += count
+
+    fingerprint = 0
+    for position, counts in enumerate(byte_counts):
+        for bit in range(8):
+            ones = sum(count for byte, count in enumerate(counts) if count and byte >> bit & 1)
+            if 2 * ones > total:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """Banded SimHash index queried by Hamming distance, persisted as JSONL."""
+
+    def __init__(self, path: Optional[str] = None, max_distance: int = 3) -> None:
+        """
+        Initialize (and load) the index.
+
+        Args:
+            path: JSONL file of `{"url", "simhash"}` records; None keeps the
+                index in memory only.
+            max_distance: Maximum Hamming distance counted as near-duplicate.
+        """
+        self.path = path
+        self.max_distance = max_distance
+        band_count = max_distance + 1
+        self._band_width = -(-FINGERPRINT_BITS // band_count)
+        self._band_count = band_count
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(band_count)]
+        self._entries: List[Tuple[str, int]] = []
+        self._urls: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_width) - 1
+        return [fingerprint >> (band * self._band_width) & mask for band in range(self._band_count)]
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._insert(record["url"], int(record["simhash"], 16))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # skip a torn last line
+        except OSError as e:
+            print(f"⚠️ Warning: Could not load near-duplicate index from {path}: {e}")
+
+    def _insert(self, url: str, fingerprint: int) -> None:
+        if url in self._urls:
+            # Re-scraped page: the newest fingerprint replaces the old one
+            self._entries[self._urls[url]] = (url, fingerprint)
+        else:
+            self._urls[url] = len(self._entries)
+            self._entries.append((url, fingerprint))
+        entry_id = self._urls[url]
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            ids = self._bands[band].setdefault(key, [])
+            if entry_id not in ids:
+                ids.append(entry_id)
+
+    def query(self, fingerprint: int, exclude_url: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """
+        Find the closest indexed page within `max_distance`.
+
+        Args:
+            fingerprint: SimHash to look up.
+            exclude_url: URL not to match (the page itself).
+
+        Returns:
+            (url, distance) of the closest near-duplicate, or None.
+        """
+        with self._lock:
+            best: Optional[Tuple[str, int]] = None
+            seen = set()
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                for entry_id in self._bands[band].get(key, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    url, other = self._entries[entry_id]
+                    if url == exclude_url:
+                        continue
+                    distance = hamming_distance(fingerprint, other)
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (url, distance)
+            return best
+
+    def add(self, url: str, fingerprint: int) -> None:
+        """Index a page and append it to the JSONL file."""
+        with self._lock:
+            self._insert(url, fingerprint)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"url": url, "simhash": f"{fingerprint:016x}"}) + "\n")
+            except OSError as e:
+                print(f"⚠️ Warning: Could not persist near-duplicate index: {e}")
+
+    def check(self, url: str, text: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Fingerprint a page, look it up and index it if it is new.
+
+        Near-duplicates are not indexed, so the first copy stays the reference.
+
+        Returns:
+            (fingerprint, URL of the page it duplicates). Both are None for
+            texts too short to fingerprint.
+        """
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None, None
+        with self._lock:
+            match = self.query(fingerprint, exclude_url=url)
+            if match is not None:
+                return fingerprint, match[0]
+            self.add(url, fingerprint)
+        return fingerprint, None
+
+
+def annotate_near_duplicate(
+    content: Optional[Dict[str, Any]], index: Optional[NearDuplicateIndex]
+) -> Optional[Dict[str, Any]]:
+    """
+    Add `simhash` (hex) and `near_duplicate_of` (URL or None) to a scrape result.
+
+    Callers check `near_duplicate_of` before saving a page or sending it to
+    downstream AI steps.
+    """
+    if not content or index is None:
+        return content
+    fingerprint, duplicate_of = index.check(content.get("url", ""), content.get("markdown_content") or "")
+    content["simhash"] = f"{fingerprint:016x}" if fingerprint is not None else None
+    content["near_duplicate_of"] = duplicate_of
+    if duplicate_of:
+        print(f"♻️  Near-duplicate of {duplicate_of}")
+    return content
+
+
+_default_index: Optional[NearDuplicateIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """Return the process-wide index when `NEAR_DUPLICATE_DETECTION` is enabled, else None.
+
+    Off unless the host application's config turns it on.
+    """
+    global _default_index
+    if not host_setting("NEAR_DUPLICATE_DETECTION", False):
+        return None
+    with _default_lock:
+        if _default_index is None:
+            _default_index = NearDuplicateIndex(
+                host_setting("NEAR_DUPLICATE_INDEX_PATH", None) or DEFAULT_INDEX_PATH,
+                host_setting("NEAR_DUPLICATE_MAX_DISTANCE", 3),
+            )
+        return _default_index
@@ -0,0 +1,161 @@
+"""Event-driven page readiness for Playwright scrapes.
+
+Instead of fixed sleeps, a single in-page script decides when a page is
+ready: the DOM has stopped mutating for a quiet period, the body text length
+has stabilised, and (optionally) one of the target selectors is present.
+An overall deadline bounds the wait either way.
+
+Profiles bundle the readiness thresholds with the behaviour around them:
+
+- "fast": no human pauses, no scrolling; simple pages finish in well under 1 s
+- "balanced": quick in-page scrolling for lazy content, no human pauses
+- "stealth": the original human-like pauses, slow scrolling and networkidle
+  wait (explicit opt-in for sites with bot detection)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .scrape_config import BROWSER
+
+
+READINESS_PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {
+        "quiet_ms": 250,
+        "poll_ms": 50,
+        "stable_checks": 2,
+        "min_text_chars": 200,
+        "deadline_ms": 3000,
+        "human_pauses": False,
+        "scroll_pause_ms": None,  # None disables scrolling
+        "networkidle_ms": 0,
+    },
+    "balanced": {
+        "quiet_ms": 500,
+        "poll_ms": 100,
+        "stable_checks": 3,
+        "min_text_chars": 500,
+        "deadline_ms": 8000,
+        "human_pauses": False,
+        "scroll_pause_ms": 150,
+        "networkidle_ms": 0,
+    },
+    "stealth": {
+        "quiet_ms": 1000,
+        "poll_ms": 200,
+        "stable_checks": 3,
+        "min_text_chars": 500,
+        "deadline_ms": 15000,
+        "human_pauses": True,
+        "scroll_pause_ms": 1000,
+        "networkidle_ms": 10000,
+    },
+}
+
+# Resolves once the DOM is quiet, text length is stable and a target selector
+# (if any) is present, or when the deadline passes
+READINESS_JS = """async (opts) => {
+    const start = performance.now();
+    let lastMutation = start;
+    let mutations = 0;
+    const observer = new MutationObserver((records) => {
+        mutations += records.length;
+        lastMutation = performance.now();
+    });
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+
+    const textLength = () => (document.body ? document.body.textContent.length : 0);
+    const hasTarget = () => opts.selectors.length === 0
+        || opts.selectors.some((sel) => { try { return !!document.querySelector(sel); } catch (e) { return false; } });
+
+    let previous = -1;
+    let stable = 0;
+    try {
+        while (true) {
+            const now = performance.now();
+            const length = textLength();
+            stable = length === previous ? stable + 1 : 0;
+            previous = length;
+
+            const quiet = now - lastMutation >= opts.quietMs;
+            const settled = stable >= opts.stableChecks && length >= opts.minText;
+            if (quiet && settled && hasTarget() && document.readyState !== 'loading') {
+                return {ready: true, reason: 'quiescent', elapsed_ms: Math.round(now - start), text_length: length, mutations};
+            }
+            if (now - start >= opts.deadlineMs) {
+                return {ready: false, reason: 'deadline', elapsed_ms: Math.round(now - start), text_length: length, mutations};
+            }
+            await new Promise((resolve) => setTimeout(resolve, opts.pollMs));
+        }
+    } finally {
+        observer.disconnect();
+    }
+}"""
+
+# Scroll through the page in a few steps to trigger lazy loading, then back to top
+SCROLL_JS = """async (pauseMs) => {
+    const height = document.body.scrollHeight;
+    const steps = Math.min(4, Math.max(2, Math.floor(height / window.innerHeight)));
+    for (let i = 1; i <= steps; i++) {
+        window.scrollTo(0, (i * height) / steps);
+        await new Promise((resolve) => setTimeout(resolve, pauseMs));
+    }
+    window.scrollTo(0, 0);
+    await new Promise((resolve) => setTimeout(resolve, pauseMs));
+    return steps;
+}"""
+
+
+def get_readiness_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """Return a readiness profile by name (default from `BROWSER['readiness']`)."""
+    name = name or BROWSER.get("readiness", {}).get("profile", "balanced")
+    if name not in READINESS_PROFILES:
+        print(f"⚠️ Warning: Unknown readiness profile '{name}', using 'balanced'")
+        name = "balanced"
+    return dict(READINESS_PROFILES[name], name=name)
+
+
+def get_target_selectors() -> List[str]:
+    """Return the configured readiness target selectors."""
+    return list(BROWSER.get("readiness", {}).get("target_selectors") or [])
+
+
+def _readiness_options(profile: Dict[str, Any], selectors: Optional[List[str]]) -> Dict[str, Any]:
+    return {
+        "quietMs": profile["quiet_ms"],
+        "pollMs": profile["poll_ms"],
+        "stableChecks": profile["stable_checks"],
+        "minText": profile["min_text_chars"],
+        "deadlineMs": profile["deadline_ms"],
+        "selectors": list(selectors or []),
+    }
+
+
+def _report(result: Dict[str, Any]) -> Dict[str, Any]:
+    status = "ready" if result.get("ready") else "not settled"
+    print(f"⏱️ Page {status} after {result.get('elapsed_ms')} ms ({result.get('reason')}, "
+          f"{result.get('text_length')} chars, {result.get('mutations')} mutations)")
+    return result
+
+
+def wait_until_ready(page, profile: Dict[str, Any], selectors: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Block until the page is ready per the profile (sync Playwright page).
+
+    Returns:
+        {"ready", "reason", "elapsed_ms", "text_length", "mutations"}
+    """
+    try:
+        return _report(page.evaluate(READINESS_JS, _readiness_options(profile, selectors)))
+    except Exception as e:
+        print(f"Error waiting for page readiness (continuing anyway): {e}")
+        return {"ready": False, "reason": "error", "elapsed_ms": None, "text_length": None, "mutations": None}
+
+
+async def wait_until_ready_async(page, profile: Dict[str, Any], selectors: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Async equivalent of `wait_until_ready`."""
+    try:
+        return _report(await page.evaluate(READINESS_JS, _readiness_options(profile, selectors)))
+    except Exception as e:
+        print(f"Error waiting for page readiness (continuing anyway): {e}")
+        return {"ready": False, "reason": "error", "elapsed_ms": None, "text_length": None, "mutations": None}
@@ -0,0 +1,272 @@
+"""Network request blocking profiles for Playwright page loads.
+
+Text and spec extraction never needs images, fonts, video, ads or analytics,
+yet downloading them slows every page and delays `networkidle`. A
+`RequestBlocker` is installed as a route handler on a browser context and
+aborts requests by resource type, by third-party origin and by a domain
+blocklist, depending on the selected profile:
+
+- "none": load everything
+- "no-media": block images, media and fonts
+- "text-only": additionally block stylesheets, websockets and other
+  non-document resources
+- "first-party-only": "no-media" plus every request to another site
+
+The blocklist applies to every profile except "none". Blocked requests are
+never downloaded, so the bytes they would have cost are estimated from the
+`Content-Length` of loaded responses of the same resource type (or a typical
+size when none was loaded).
+
+Counters of every page load are added to a process-wide `BlockingReport`
+(`get_blocking_report()`), printed once at the end of a run.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from .scrape_config import BROWSER
+
+
+BLOCKING_PROFILES: Dict[str, Dict[str, Any]] = {
+    "none": {"resource_types": set(), "first_party_only": False, "use_blocklist": False},
+    "no-media": {"resource_types": {"image", "media", "font"}, "first_party_only": False, "use_blocklist": True},
+    "text-only": {
+        "resource_types": {"image", "media", "font", "stylesheet", "websocket", "eventsource", "manifest", "texttrack"},
+        "first_party_only": False,
+        "use_blocklist": True,
+    },
+    "first-party-only": {"resource_types": {"image", "media", "font"}, "first_party_only": True, "use_blocklist": True},
+}
+
+# Ad, analytics and tracking hosts (subdomains match too)
+DEFAULT_BLOCKLIST = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "scorecardresearch.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "adnxs.com",
+    "amazon-adsystem.com",
+    "matomo.cloud",
+    "newrelic.com",
+    "nr-data.net",
+    "segment.io",
+    "mixpanel.com",
+]
+
+# Typical transfer size (bytes) per resource type, used when no response of
+# that type was loaded to measure
+TYPICAL_RESOURCE_BYTES: Dict[str, int] = {
+    "image": 20_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 15_000,
+    "script": 20_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "manifest": 1_000,
+    "texttrack": 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 5_000
+
+# Second-level labels used under country TLDs (example.co.uk -> example.co.uk)
+_COUNTRY_SECOND_LEVEL = {"co", "com", "org", "net", "ac", "gov", "edu"}
+
+
+def site_of(host: str) -> str:
+    """Approximate the registrable domain of a host name."""
+    labels = host.lower().split(":")[0].strip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _COUNTRY_SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class RequestBlocker:
+    """Route handler aborting unneeded requests, with per-load counters."""
+
+    def __init__(self, profile: str = "no-media", blocklist: Optional[Iterable[str]] = None) -> None:
+        """Initialize the blocker.
+
+        Args:
+            profile: One of `BLOCKING_PROFILES`.
+            blocklist: Blocked domains; defaults to `DEFAULT_BLOCKLIST`.
+        """
+        if profile not in BLOCKING_PROFILES:
+            print(f"⚠️ Warning: Unknown blocking profile '{profile}', falling back to 'no-media'")
+            profile = "no-media"
+        self.profile = profile
+        settings = BLOCKING_PROFILES[profile]
+        self.resource_types = settings["resource_types"]
+        self.first_party_only = settings["first_party_only"]
+        self.blocklist = [d.lower().lstrip(".") for d in (DEFAULT_BLOCKLIST if blocklist is None else blocklist)]
+        if not settings["use_blocklist"]:
+            self.blocklist = []
+        self.page_site: Optional[str] = None
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_reason: Dict[str, int] = {}
+        self.blocked_by_type: Dict[str, int] = {}
+        self.loaded_bytes = 0
+        self.loaded_bytes_by_type: Dict[str, int] = {}
+        self.sized_by_type: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls) -> "RequestBlocker":
+        """Build a blocker from `BROWSER['blocking']`."""
+        settings = BROWSER.get("blocking", {})
+        return cls(
+            profile=settings.get("profile", "no-media"),
+            blocklist=settings.get("blocklist"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the profile blocks anything at all."""
+        return bool(self.resource_types or self.first_party_only or self.blocklist)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Return why a request should be blocked, or None to let it through."""
+        if resource_type == "document" and self.page_site is None:
+            # First navigation defines the first-party site
+            self.page_site = site_of(urlparse(url).netloc)
+            return None
+        if resource_type in self.resource_types:
+            return resource_type
+
+        host = urlparse(url).netloc.lower().split(":")[0]
+        if not host:
+            return None
+        for domain in self.blocklist:
+            if host == domain or host.endswith("." + domain):
+                return "blocklist"
+        if self.first_party_only and self.page_site and site_of(host) != self.page_site:
+            return "third-party"
+        return None
+
+    def _count(self, reason: Optional[str], resource_type: str) -> None:
+        if reason is None:
+            self.allowed += 1
+        else:
+            self.blocked += 1
+            self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def _on_response(self, response: Any) -> None:
+        """Record the `Content-Length` of a loaded response."""
+        try:
+            size = int(response.headers.get("content-length", ""))
+            resource_type = response.request.resource_type
+        except (ValueError, AttributeError):
+            return
+        self.loaded_bytes += size
+        self.loaded_bytes_by_type[resource_type] = self.loaded_bytes_by_type.get(resource_type, 0) + size
+        self.sized_by_type[resource_type] = self.sized_by_type.get(resource_type, 0) + 1
+
+    def bytes_saved(self) -> int:
+        """Estimated bytes not downloaded because of blocked requests."""
+        saved = 0
+        for resource_type, count in self.blocked_by_type.items():
+            sized = self.sized_by_type.get(resource_type, 0)
+            if sized:
+                average = self.loaded_bytes_by_type[resource_type] / sized
+            else:
+                average = TYPICAL_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES)
+            saved += int(count * average)
+        return saved
+
+    def _handle(self, route: Any) -> None:
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        self._count(reason, request.resource_type)
+        if reason is None:
+            route.continue_()
+        else:
+            route.abort()
+
+    async def _handle_async(self, route: Any) -> None:
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        self._count(reason, request.resource_type)
+        if reason is None:
+            await route.continue_()
+        else:
+            await route.abort()
+
+    def install(self, context: Any) -> None:
+        """Route all requests of a sync `BrowserContext` through the blocker."""
+        if self.enabled:
+            context.on("response", self._on_response)
+            context.route("**/*", self._handle)
+
+    async def install_async(self, context: Any) -> None:
+        """Route all requests of an async `BrowserContext` through the blocker."""
+        if self.enabled:
+            context.on("response", self._on_response)
+            await context.route("**/*", self._handle_async)
+
+    def summary(self) -> str:
+        """One-line summary of blocked requests for logging."""
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.blocked_by_reason.items()))
+        saved_kb = self.bytes_saved() / 1024
+        return (
+            f"🚫 Blocked {self.blocked}/{self.blocked + self.allowed} requests ({self.profile}), "
+            f"~{saved_kb:.0f} KB saved vs {self.loaded_bytes / 1024:.0f} KB loaded{f' - {reasons}' if reasons else ''}"
+        )
+
+    def add(self, other: "RequestBlocker") -> None:
+        """Add another blocker's counters to this one."""
+        self.allowed += other.allowed
+        self.blocked += other.blocked
+        self.loaded_bytes += other.loaded_bytes
+        for totals, counts in (
+            (self.blocked_by_reason, other.blocked_by_reason),
+            (self.blocked_by_type, other.blocked_by_type),
+            (self.loaded_bytes_by_type, other.loaded_bytes_by_type),
+            (self.sized_by_type, other.sized_by_type),
+        ):
+            for key, count in counts.items():
+                totals[key] = totals.get(key, 0) + count
+
+
+class BlockingReport:
+    """Thread-safe totals of the blockers of all page loads in a run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.totals: Optional[RequestBlocker] = None
+
+    def add(self, blocker: RequestBlocker) -> None:
+        """Add the counters of one page load (disabled blockers are ignored)."""
+        if not blocker.enabled:
+            return
+        with self._lock:
+            if self.totals is None:
+                self.totals = RequestBlocker(profile=blocker.profile, blocklist=blocker.blocklist)
+            self.totals.add(blocker)
+            self.pages += 1
+
+    def print_report(self) -> None:
+        """Print blocked requests and bytes saved over all pages."""
+        with self._lock:
+            if self.totals is not None:
+                print(f"{self.totals.summary()} over {self.pages} page(s)")
+
+
+_default_report = BlockingReport()
+
+
+def get_blocking_report() -> BlockingReport:
+    """Return the process-wide blocking report."""
+    return _default_report
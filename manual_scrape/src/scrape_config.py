@@ -0,0 +1,50 @@
+"""Access manual_scrape's `config.py` from any entry point.
+
+`manual_scrape/main.py` imports `config` from its own directory, but other
+projects (e.g. BMEcat_transformer in playwright mode) import this package
+while their own `config` module is first on `sys.path`. This loader returns
+manual_scrape's config module in both cases.
+
+A few settings are chosen by the application embedding these modules rather
+than by manual_scrape: near-duplicate detection and the search cache and
+client. `host_setting` reads them from the loaded `config` module (easy_rich's
+or BMEcat_transformer's when they are the entry point, manual_scrape's own
+otherwise) and falls back to a default when the host does not define them.
+"""
+
+import importlib.util
+import os
+import sys
+from typing import Any
+
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.py")
+
+
+def _load_config():
+    """Return the already-imported manual_scrape config or load it by path."""
+    existing = sys.modules.get("config")
+    if existing is not None and os.path.abspath(getattr(existing, "__file__", "") or "") == _CONFIG_PATH:
+        return existing
+
+    loaded = sys.modules.get("manual_scrape_config")
+    if loaded is not None:
+        return loaded
+
+    spec = importlib.util.spec_from_file_location("manual_scrape_config", _CONFIG_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["manual_scrape_config"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def host_setting(name: str, default: Any) -> Any:
+    """Return a setting of the host application's config, or `default`.
+
+    Read at call time, so the host's `config` is already imported.
+    """
+    host = sys.modules.get("config") or config
+    return getattr(host, name, default)
+
+
+config = _load_config()
+BROWSER = config.BROWSER
@@ -3,36 +3,120 @@ Client for handling SerpAPI search requests.
 """
 
 import os
-from typing import Dict, Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Set, Tuple, Union
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from .scrape_config import host_setting
+from .serp_cache import SerpCache, cache_key, get_serp_cache
+
+# Retries of a search answered with HTTP 429 (throughput limit)
+RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_BACKOFF = 2.0
+
+# Seconds `close` waits for background refreshes still in flight
+REFRESH_JOIN_TIMEOUT = 35
+
+# Marks an argument left to the host config (None is meaningful for the budget)
+_FROM_CONFIG: Any = object()
+
+# A search: query text, or (query, website) for a site-restricted search
+SearchQuery = Union[str, Tuple[str, Optional[str]]]
 
 
 class SerpAPIClient:
     """Client for handling SerpAPI search requests."""
 
-    def __init__(self) -> None:
-        """Initialize client by loading environment variables and base config."""
+    def __init__(
+        self,
+        cache: Optional[SerpCache] = None,
+        max_concurrency: Optional[int] = None,
+        credit_budget: Optional[int] = _FROM_CONFIG,
+    ) -> None:
+        """
+        Initialize client by loading environment variables and base config.
+
+        Args:
+            cache: Response cache; defaults to the process-wide cache
+                (disabled when `SERP_CACHE_ENABLED` is False).
+            max_concurrency: Searches run at once by `search_many` (and
+                pooled connections); defaults to `SERP_MAX_CONCURRENCY`.
+            credit_budget: Searches this client may send to SerpAPI (cache
+                hits are free); defaults to `SERP_CREDIT_BUDGET` (None: no
+                limit).
+        """
         # Load environment variables from .env (searched from CWD upward)
         load_dotenv()
         self.api_key: Optional[str] = os.getenv("SERP_API_KEY")
         self.base_url: str = "https://serpapi.com/search.json"
+        self.account_url: str = "https://serpapi.com/account.json"
 
         if not self.api_key:
             raise ValueError("SERP_API_KEY not found in environment variables")
 
-    def search_web(self, query: str, website: Optional[str] = None) -> Optional[Dict]:
+        self.cache: Optional[SerpCache] = cache or get_serp_cache()
+        self._refreshing: Set[str] = set()
+        self._refresh_threads: List[threading.Thread] = []
+        self._refresh_lock = threading.Lock()
+        self._closed = False
+
+        # Pooled keep-alive connections shared by concurrent searches
+        if max_concurrency is None:
+            max_concurrency = host_setting("SERP_MAX_CONCURRENCY", 5)
+        self.max_concurrency = max(1, max_concurrency)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if credit_budget is _FROM_CONFIG:
+            credit_budget = host_setting("SERP_CREDIT_BUDGET", None)
+        self.credit_budget: Optional[int] = credit_budget
+        self.credits_used = 0
+        self.searches_left: Optional[int] = None  # Account quota, see `refresh_quota`
+        self._credit_lock = threading.Lock()
+
+    def search_web(
+        self,
+        query: str,
+        website: Optional[str] = None,
+        engine: str = "google",
+        num: int = 10,
+        use_cache: bool = True,
+    ) -> Optional[Dict]:
         """
         Search the web using SerpAPI with optional site restriction.
 
+        Cached responses are returned without a request; stale ones are
+        returned as well and refreshed in the background.
+
         Args:
             query: Search query (e.g., "ninja assassin").
             website: Optional website to restrict search to (e.g., "imdb.com").
+            engine: SerpAPI engine.
+            num: Number of results requested.
+            use_cache: False always queries SerpAPI (the result is still cached).
 
         Returns:
             The parsed JSON response as a dict, or None if the request failed.
         """
+        key = cache_key(query, website, engine, num)
+        if self.cache is not None and use_cache:
+            cached, state = self.cache.get(key)
+            if cached is not None:
+                if state == "stale":
+                    self._refresh_in_background(key, query, website, engine, num)
+                return cached
+
+        return self._fetch(key, query, website, engine, num)
+
+    def _fetch(self, key: str, query: str, website: Optional[str], engine: str, num: int) -> Optional[Dict]:
+        """Query SerpAPI and cache successful responses."""
         # Construct search query
         if website:
             search_query = f"site:{website} {query}"
@@ -40,20 +124,138 @@ class SerpAPIClient:
             search_query = query
 
         params: Dict[str, str | int] = {
-            "engine": "google",
+            "engine": engine,
             "q": search_query,
             "api_key": self.api_key or "",
-            "num": 10,
+            "num": num,
         }
 
+        if not self._reserve_credit():
+            print(f"💸 Skipping search for '{query}': SerpAPI credit budget exhausted")
+            return None
+
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                response = self.session.get(self.base_url, params=params, timeout=30)
+                if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+                time.sleep(RATE_LIMIT_BACKOFF * (2 ** attempt))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            results = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Error making API request: {e}")
             return None
 
+        # SerpAPI reports failed searches in an "error" field; never cache those
+        if self.cache is not None and isinstance(results, dict) and not results.get("error"):
+            self.cache.put(key, query, website, engine, num, results)
+        return results
+
+    def _refresh_in_background(self, key: str, query: str, website: Optional[str], engine: str, num: int) -> None:
+        """Re-query a stale entry on a background thread (once per key at a time, never after `close`)."""
+        with self._refresh_lock:
+            if self._closed or key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            # Refreshes are paid searches: say so rather than spending silently
+            print(f"🔄 Refreshing stale cached search for '{query}' in the background (1 SerpAPI credit)")
+            thread = threading.Thread(
+                target=self._refresh, args=(key, query, website, engine, num), name="serp-cache-refresh", daemon=True
+            )
+            self._refresh_threads = [t for t in self._refresh_threads if t.is_alive()] + [thread]
+            thread.start()
+
+    def _refresh(self, key: str, query: str, website: Optional[str], engine: str, num: int) -> None:
+        try:
+            self._fetch(key, query, website, engine, num)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+    def close(self) -> None:
+        """Stop starting refreshes, wait for those in flight and close the pooled session."""
+        with self._refresh_lock:
+            self._closed = True
+            threads = list(self._refresh_threads)
+        deadline = time.monotonic() + REFRESH_JOIN_TIMEOUT
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self.session.close()
+
+    def _reserve_credit(self) -> bool:
+        """Count one SerpAPI search against the budget (False when exhausted)."""
+        with self._credit_lock:
+            if self.credit_budget is not None and self.credits_used >= self.credit_budget:
+                return False
+            self.credits_used += 1
+            return True
+
+    def search_many(
+        self,
+        queries: Iterable[SearchQuery],
+        website: Optional[str] = None,
+        engine: str = "google",
+        num: int = 10,
+        max_concurrency: Optional[int] = None,
+    ) -> Iterator[Tuple[SearchQuery, Optional[Dict], Optional[str]]]:
+        """
+        Run many searches concurrently and yield them as they complete.
+
+        Cached searches are answered without a request; the rest share the
+        pooled session, at most `max_concurrency` at a time, and stop being
+        sent once the credit budget is spent.
+
+        Args:
+            queries: Query strings, or (query, website) tuples to override
+                `website` per search.
+            website: Default website to restrict searches to.
+            engine: SerpAPI engine.
+            num: Number of results requested per search.
+            max_concurrency: Parallel searches (default: the client's cap).
+
+        Yields:
+            (query item as given, results or None, first relevant URL or None),
+            once per distinct query item.
+        """
+        workers = max(1, min(max_concurrency or self.max_concurrency, self.max_concurrency))
+
+        def run(item: SearchQuery) -> Tuple[SearchQuery, Optional[Dict], Optional[str]]:
+            query, site = item if isinstance(item, tuple) else (item, website)
+            results = self.search_web(query, site, engine=engine, num=num)
+            return item, results, self.extract_first_url(results, site) if results else None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, item) for item in dict.fromkeys(queries)]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Stopping early (break / Ctrl-C) drops searches not yet started
+                for future in futures:
+                    future.cancel()
+
+    def refresh_quota(self) -> Optional[int]:
+        """Fetch the account's remaining searches from SerpAPI (this call is free)."""
+        try:
+            response = self.session.get(self.account_url, params={"api_key": self.api_key or ""}, timeout=30)
+            response.raise_for_status()
+            left = response.json().get("total_searches_left")
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            print(f"Error fetching SerpAPI account quota: {e}")
+            return None
+        with self._credit_lock:
+            self.searches_left = left if isinstance(left, int) else None
+            return self.searches_left
+
+    def credit_report(self) -> Dict[str, Optional[int]]:
+        """SerpAPI searches sent by this client, its budget and the account's remaining quota."""
+        with self._credit_lock:
+            return {
+                "credits_used": self.credits_used,
+                "credit_budget": self.credit_budget,
+                "searches_left": self.searches_left,
+            }
+
     def extract_first_url(self, search_results: Dict, website: Optional[str] = None) -> Optional[str]:
         """
         Extract the first relevant URL from search results.
@@ -0,0 +1,201 @@
+"""
+Persistent TTL cache for SerpAPI responses.
+
+Responses are stored in SQLite under a key built from the normalized
+`(query, website, engine, num)`, so "Ninja  Assassin" on "https://www.imdb.com/"
+and "ninja assassin" on "imdb.com" share one entry. Entries younger than the
+TTL are fresh; older entries are still served for a stale window while the
+client refreshes them in the background (stale-while-revalidate). Recently
+used responses are also kept parsed in memory, so repeat searches skip both
+the network and JSON decoding.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .scrape_config import host_setting
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".serp_cache.sqlite"
+)
+
+# Parsed responses kept in memory
+MEMORY_ENTRIES = 256
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return _WHITESPACE.sub(" ", (query or "").strip()).lower()
+
+
+def normalize_website(website: Optional[str]) -> str:
+    """Bare host (and path) of a site filter: no scheme, `www.` or trailing slash."""
+    site = (website or "").strip().lower()
+    site = re.sub(r"^[a-z][a-z0-9+.-]*://", "", site)
+    if site.startswith("www."):
+        site = site[4:]
+    return site.rstrip("/")
+
+
+def cache_key(query: str, website: Optional[str], engine: str, num: int) -> str:
+    """Stable cache key for a search."""
+    payload = json.dumps(
+        [normalize_query(query), normalize_website(website), (engine or "").strip().lower(), int(num)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """SQLite-backed SerpAPI response cache with TTL and a stale window."""
+
+    def __init__(self, path: Optional[str] = None, ttl_hours: float = 24, stale_hours: float = 144) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file; None keeps the cache in memory only.
+            ttl_hours: Age until which a response is fresh.
+            stale_hours: Extra age during which a response is still served
+                (and refreshed in the background); older entries are misses.
+        """
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.stale = stale_hours * 3600
+        self.stats: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "stores": 0}
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                website TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                num INTEGER NOT NULL,
+                response TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def _remember(self, key: str, response: Dict[str, Any], fetched_at: float) -> None:
+        self._memory[key] = (response, fetched_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Look up a response.
+
+        Returns:
+            (response, state) with state "fresh" or "stale", or (None, None)
+            on a miss (including entries past the stale window).
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                row = self.conn.execute(
+                    "SELECT response, fetched_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    try:
+                        entry = (json.loads(row[0]), row[1])
+                        self._remember(key, *entry)
+                    except ValueError:
+                        entry = None
+
+            age = time.time() - entry[1] if entry is not None else None
+            if age is None or age > self.ttl + self.stale:
+                self.stats["misses"] += 1
+                return None, None
+            if age > self.ttl:
+                self.stats["stale_hits"] += 1
+                return entry[0], "stale"
+            self.stats["hits"] += 1
+            return entry[0], "fresh"
+
+    def put(self, key: str, query: str, website: Optional[str], engine: str, num: int, response: Dict[str, Any]) -> None:
+        """Store a response as fetched now."""
+        fetched_at = time.time()
+        try:
+            payload = json.dumps(response)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Warning: Could not cache search response: {e}")
+            return
+        with self._lock:
+            self._remember(key, response, fetched_at)
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, query, website, engine, num, response, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, normalize_query(query), normalize_website(website), engine, int(num), payload, fetched_at),
+                )
+                self.conn.commit()
+                self.stats["stores"] += 1
+            except sqlite3.Error as e:
+                print(f"⚠️ Warning: Could not persist search response: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete entries past the stale window; returns the number removed."""
+        cutoff = time.time() - self.ttl - self.stale
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM responses WHERE fetched_at < ?", (cutoff,)).rowcount
+            self.conn.commit()
+            for key in [k for k, (_, fetched_at) in self._memory.items() if fetched_at < cutoff]:
+                del self._memory[key]
+        return removed
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache (fresh or stale)."""
+        with self._lock:
+            hits = self.stats["hits"] + self.stats["stale_hits"]
+            total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def print_report(self) -> None:
+        """Print hit/miss counters."""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        if lookups:
+            print(f"🗄️  Search cache: {stats['hits']} fresh + {stats['stale_hits']} stale hits, "
+                  f"{stats['misses']} misses ({self.hit_rate():.0%} hit rate)")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self.conn.close()
+
+
+_default_cache: Optional[SerpCache] = None
+_default_lock = threading.Lock()
+
+
+def get_serp_cache() -> Optional[SerpCache]:
+    """Return the process-wide cache when `SERP_CACHE_ENABLED` is set, else None."""
+    global _default_cache
+    if not host_setting("SERP_CACHE_ENABLED", True):
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SerpCache(
+                host_setting("SERP_CACHE_PATH", None) or DEFAULT_CACHE_PATH,
+                host_setting("SERP_CACHE_TTL_HOURS", 24),
+                host_setting("SERP_CACHE_STALE_HOURS", 144),
+            )
+        return _default_cache
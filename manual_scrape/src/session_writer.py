@@ -0,0 +1,156 @@
+"""
+Background writer for session folder files.
+
+`save_content_to_session` hands finished file contents to a `SessionWriter`
+instead of writing them on the scraping thread. A single daemon thread drains
+a bounded queue (callers block only when it is full), writes each file and
+fsyncs them in batches. Pending writes are flushed on `close()`, at
+interpreter exit and after Ctrl-C.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+# Sentinel telling the writer thread to stop
+_STOP = object()
+
+
+class SessionWriter:
+    """Write files off the calling thread through a bounded queue."""
+
+    def __init__(self, max_queue: int = 256, fsync_batch: int = 16, fsync_interval: float = 1.0) -> None:
+        """
+        Start the writer thread.
+
+        Args:
+            max_queue: Files waiting to be written before `write` blocks.
+            fsync_batch: Written files fsynced together.
+            fsync_interval: Seconds after which a partial batch is fsynced anyway.
+        """
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self.errors = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._pending: List[Tuple[int, str]] = []  # (fd, path) awaiting fsync
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path: str, text: str) -> None:
+        """
+        Queue a file write (blocks while the queue is full).
+
+        Args:
+            path: Destination file path.
+            text: File content (UTF-8).
+        """
+        with self._lock:
+            if not self._closed:
+                self._queue.put((path, text))
+                return
+        # Late writes after shutdown still land on disk, once the thread is done
+        self._thread.join()
+        self._write_file(path, text)
+        self._fsync_pending()
+
+    def flush(self) -> None:
+        """Block until every queued file is written and fsynced."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                # Idle: make partial batches durable
+                self._fsync_pending()
+                continue
+            try:
+                if item is _STOP:
+                    self._fsync_pending()
+                    return
+                path, text = item
+                self._write_file(path, text)
+                if (
+                    len(self._pending) >= self.fsync_batch
+                    or time.monotonic() - self._last_fsync >= self.fsync_interval
+                    or self._queue.empty()
+                ):
+                    self._fsync_pending()
+            finally:
+                self._queue.task_done()
+
+    def _write_file(self, path: str, text: str) -> None:
+        """Write one file; its descriptor stays open until the batch fsync."""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                data = text.encode("utf-8")
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            except Exception:
+                os.close(fd)
+                raise
+            self._pending.append((fd, path))
+            self.written += 1
+        except Exception as e:  # noqa: BLE001 - one failed file must not stop the writer
+            self.errors += 1
+            print(f"⚠️ Warning: Could not write {path}: {e}")
+
+    def _fsync_pending(self) -> None:
+        """Fsync and close every file written since the last batch."""
+        pending, self._pending = self._pending, []
+        for fd, path in pending:
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                self.errors += 1
+                print(f"⚠️ Warning: Could not fsync {path}: {e}")
+            finally:
+                os.close(fd)
+        self._last_fsync = time.monotonic()
+
+
+_default_writer: Optional[SessionWriter] = None
+_default_lock = threading.Lock()
+
+
+def get_session_writer() -> SessionWriter:
+    """Return the process-wide writer, flushed automatically at exit."""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = SessionWriter()
+            atexit.register(_default_writer.close)
+        return _default_writer
+
+
+def close_session_writer() -> None:
+    """Flush and stop the process-wide writer (if one was started)."""
+    with _default_lock:
+        writer = _default_writer
+    if writer is not None:
+        writer.close()
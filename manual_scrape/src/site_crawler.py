@@ -0,0 +1,300 @@
+"""
+Polite site crawler on top of a WebScraper backend.
+
+Starting from a seed URL, pages are fetched breadth-first through the
+backend's `scrape_page`, their links are canonicalized and queued in a
+persistent `CrawlFrontier`, and each page is saved into the session folder.
+Crawling honours robots.txt (including Crawl-delay), a per-domain delay,
+depth and page limits, and a domain allow-list. The frontier lives in the
+session folder, so re-running on the same folder resumes the crawl.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from .crawl_frontier import CrawlFrontier, canonicalize_url
+
+
+FRONTIER_FILENAME = "crawl_frontier.sqlite"
+ROBOTS_TIMEOUT = 10
+
+# Seconds workers wait for each other while running the worker cleanup
+WORKER_CLEANUP_TIMEOUT = 30
+
+# Links to files that are not pages
+SKIP_EXTENSIONS = (
+    ".pdf", ".zip", ".gz", ".rar", ".7z", ".exe", ".dmg", ".jpg", ".jpeg", ".png", ".gif",
+    ".webp", ".svg", ".ico", ".mp3", ".mp4", ".avi", ".mov", ".webm", ".css", ".js",
+    ".xml", ".json", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+)
+
+MARKDOWN_LINK_PATTERN = re.compile(r"\[[^\]]*\]\(([^)\s]+)")
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class SiteCrawler:
+    """Crawl a site from a seed URL and save every page into a session folder."""
+
+    def __init__(
+        self,
+        web_scraper: Any,
+        session_folder: str,
+        max_depth: int = 2,
+        max_pages: int = 50,
+        same_domain: bool = True,
+        allowed_domains: Optional[Iterable[str]] = None,
+        concurrency: int = 4,
+        delay: float = 1.0,
+        respect_robots: bool = True,
+        profile: str = "markdown_links",
+        frontier_path: Optional[str] = None,
+        worker_cleanup: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the crawler.
+
+        Args:
+            web_scraper: Backend with `scrape_page(url, profile=...)` and
+                `save_content_to_session(...)`.
+            session_folder: Folder receiving the pages (and the frontier).
+            max_depth: Maximum link distance from the seed.
+            max_pages: Maximum pages fetched in this run.
+            same_domain: Only follow links on the seed's domain.
+            allowed_domains: Extra domains to follow (subdomains included).
+            concurrency: Pages fetched at once.
+            delay: Minimum seconds between requests to the same domain.
+            respect_robots: Skip URLs disallowed by robots.txt.
+            profile: Scrape profile passed to the backend.
+            frontier_path: Frontier database; defaults to the session folder.
+            worker_cleanup: Called once on every worker thread when the crawl
+                ends, for thread-bound backend state such as the Playwright
+                browser pools (`close_browser_pools`).
+        """
+        self.web_scraper = web_scraper
+        self.session_folder = session_folder
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_domain = same_domain
+        self.allowed_domains: Set[str] = {d.lower().lstrip(".") for d in (allowed_domains or [])}
+        self.concurrency = max(1, concurrency)
+        self.delay = delay
+        self.respect_robots = respect_robots
+        self.profile = profile
+        self.frontier_path = frontier_path or os.path.join(session_folder, FRONTIER_FILENAME)
+        self.worker_cleanup = worker_cleanup
+
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._robots_lock = threading.Lock()
+        self._next_request: Dict[str, float] = {}
+        self._delay_lock = threading.Lock()
+
+    # ---- Politeness -------------------------------------------------------
+
+    def _robots_for(self, url: str) -> Optional[RobotFileParser]:
+        """Fetch and cache robots.txt per scheme+host (None when unavailable)."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._robots_lock:
+            if origin in self._robots:
+                return self._robots[origin]
+        parser: Optional[RobotFileParser] = None
+        try:
+            response = requests.get(f"{origin}/robots.txt", timeout=ROBOTS_TIMEOUT)
+            if response.status_code < 400:
+                parser = RobotFileParser()
+                parser.parse(response.text.splitlines())
+        except requests.RequestException as e:
+            print(f"⚠️ Warning: Could not fetch robots.txt for {parsed.netloc}: {e}")
+        with self._robots_lock:
+            self._robots[origin] = parser
+        return parser
+
+    def is_allowed(self, url: str) -> bool:
+        """Whether robots.txt permits fetching the URL."""
+        if not self.respect_robots:
+            return True
+        parser = self._robots_for(url)
+        return parser is None or parser.can_fetch("*", url)
+
+    def _domain_delay(self, url: str) -> float:
+        """Per-domain delay: the configured delay or the site's Crawl-delay."""
+        delay = self.delay
+        if self.respect_robots:
+            parser = self._robots_for(url)
+            crawl_delay = parser.crawl_delay("*") if parser else None
+            if crawl_delay:
+                delay = max(delay, float(crawl_delay))
+        return delay
+
+    def _wait_for_turn(self, url: str) -> None:
+        """Block until the URL's domain may be requested again."""
+        host = _host(url)
+        delay = self._domain_delay(url)
+        with self._delay_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, now))
+            self._next_request[host] = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+    # ---- Scope ------------------------------------------------------------
+
+    def in_scope(self, url: str, seed_host: str) -> bool:
+        """Whether a canonical URL belongs to the crawl."""
+        if urlparse(url).path.lower().endswith(SKIP_EXTENSIONS):
+            return False
+        host = _host(url)
+        domains = set(self.allowed_domains)
+        if self.same_domain:
+            domains.add(seed_host)
+        if not domains:
+            return True
+        return any(host == d or host.endswith("." + d) for d in domains)
+
+    @staticmethod
+    def extract_links(content: Dict[str, Any]) -> List[str]:
+        """All link targets of a scrape result (link list plus markdown links)."""
+        links: List[str] = []
+        for link in content.get("links") or []:
+            if isinstance(link, (tuple, list)):
+                link = link[1] if len(link) > 1 else link[0]
+            if isinstance(link, str):
+                links.append(link)
+        links.extend(MARKDOWN_LINK_PATTERN.findall(content.get("markdown_content") or ""))
+        return links
+
+    def page_filename(self, url: str) -> str:
+        """Filesystem-safe, collision-free filename for a page."""
+        parsed = urlparse(url)
+        readable = self.web_scraper.sanitize_filename(
+            f"{parsed.netloc.replace('.', '_')}_{parsed.path.replace('/', '_').strip('_')}"
+        )
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+        return f"{readable}_{digest}"
+
+    # ---- Crawl ------------------------------------------------------------
+
+    def _fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        self._wait_for_turn(url)
+        try:
+            return self.web_scraper.scrape_page(url, profile=self.profile)
+        except Exception as e:  # noqa: BLE001 - one bad page must not stop the crawl
+            print(f"Error crawling {url}: {e}")
+            return None
+
+    def _clean_up_workers(self, executor: ThreadPoolExecutor) -> None:
+        """Run `worker_cleanup` on each worker thread before the pool shuts down."""
+        if self.worker_cleanup is None:
+            return
+        # Every task blocks until all have started, so each lands on its own thread
+        barrier = threading.Barrier(self.concurrency)
+
+        def clean_up() -> None:
+            try:
+                barrier.wait(timeout=WORKER_CLEANUP_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+            self.worker_cleanup()
+
+        for future in [executor.submit(clean_up) for _ in range(self.concurrency)]:
+            try:
+                future.result()
+            except Exception as e:  # noqa: BLE001 - cleanup must not mask crawl results
+                print(f"⚠️ Warning: Crawl worker cleanup failed: {e}")
+
+    def crawl(self, seed_url: str) -> Dict[str, Any]:
+        """
+        Crawl from a seed URL until the frontier is empty or a limit is hit.
+
+        Args:
+            seed_url: First page of the crawl.
+
+        Returns:
+            Stats: pages saved/failed/skipped in this run plus frontier counters.
+        """
+        seed = canonicalize_url(seed_url)
+        if not seed:
+            raise ValueError(f"Not a crawlable URL: {seed_url}")
+        seed_host = _host(seed)
+
+        frontier = CrawlFrontier(self.frontier_path)
+        if frontier.add(seed, 0):
+            frontier.commit()
+        else:
+            print(f"Resuming crawl from {self.frontier_path}")
+
+        saved = failed = disallowed = duplicates = 0
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            while saved + failed + duplicates < self.max_pages:
+                batch = frontier.pop_batch(
+                    min(self.concurrency * 2, self.max_pages - saved - failed - duplicates)
+                )
+                if not batch:
+                    break
+
+                futures = {}
+                for url, depth in batch:
+                    if not self.is_allowed(url):
+                        print(f"🤖 Disallowed by robots.txt: {url}")
+                        frontier.mark(url, "skipped")
+                        disallowed += 1
+                        continue
+                    futures[executor.submit(self._fetch, url)] = (url, depth)
+
+                # Frontier and file writes stay on this thread
+                for future in as_completed(futures):
+                    url, depth = futures[future]
+                    content = future.result()
+                    if not content:
+                        frontier.mark(url, "failed")
+                        failed += 1
+                        continue
+
+                    if content.get("near_duplicate_of"):
+                        # Links are still followed; only the copy is not saved
+                        frontier.mark(url, "duplicate")
+                        duplicates += 1
+                    else:
+                        self.web_scraper.save_content_to_session(
+                            content, self.page_filename(url), self.session_folder
+                        )
+                        frontier.mark(url, "done")
+                        saved += 1
+
+                    if depth < self.max_depth:
+                        for link in self.extract_links(content):
+                            canonical = canonicalize_url(link, url)
+                            if canonical and self.in_scope(canonical, seed_host):
+                                frontier.add(canonical, depth + 1, url)
+                frontier.commit()
+                print(f"🕸️  Crawl progress: {saved} saved, {failed} failed, "
+                      f"{frontier.stats().get('queued', 0)} queued")
+        finally:
+            self._clean_up_workers(executor)
+            executor.shutdown()
+            stats = frontier.stats()
+            frontier.close()
+
+        return {
+            "saved": saved,
+            "failed": failed,
+            "disallowed": disallowed,
+            "duplicates": duplicates,
+            "seconds": round(time.monotonic() - started, 1),
+            "frontier": stats,
+        }
@@ -1,9 +1,8 @@
-from typing import Optional, Dict, List, Tuple, Set
+from typing import Any, Optional, Dict, List, Tuple, Set
 import os
 import sys
 import re
 from urllib.parse import urlparse, urljoin
-from playwright.sync_api import sync_playwright
 
 # Add config imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,16 +22,26 @@ except ImportError:
     STEALTH_PROMPT_MSG = "🤔 Try stealth mode? [y/N]: "
     STEALTH_TRYING_MSG = "🥷 Trying stealth mode..."
 
-from .browsers.browser_factory import BrowserFactory
+from .browsers.browser_pool import get_browser_pool
 from .content_extractor import ContentExtractor
+from .near_duplicate import NearDuplicateIndex, annotate_near_duplicate, get_near_duplicate_index
+from .request_blocking import RequestBlocker, get_blocking_report
+from .session_writer import get_session_writer
 
 
 class WebScraper:
     """Web scraper for extracting content from web pages."""
 
-    def __init__(self) -> None:
-        """Initialize web scraper with Playwright."""
+    def __init__(self, near_duplicate_index: Optional[NearDuplicateIndex] = None) -> None:
+        """Initialize web scraper with Playwright (browsers come from a shared pool).
+
+        Args:
+            near_duplicate_index: SimHash index used to flag near-duplicate
+                pages. Defaults to the shared index when
+                `NEAR_DUPLICATE_DETECTION` is enabled in config.
+        """
         self.content_extractor = ContentExtractor()
+        self.near_duplicate_index = near_duplicate_index or get_near_duplicate_index()
 
     def is_bot_detected(self, status_code: str) -> bool:
         """Check if the response indicates bot detection."""
@@ -66,18 +75,14 @@ class WebScraper:
             Scraped content dict or None if failed
         """
         try:
-            with sync_playwright() as p:
-                # Create browser instance
-                browser_config = BrowserFactory.create()
-                browser = browser_config.launch(p, headless=True)
-                
-                # Create context with stealth settings
-                user_agents = browser_config.get_user_agents()
-                import random
-                context = browser.new_context(
-                    user_agent=random.choice(user_agents),
-                    viewport={"width": 1280, "height": 1200}
-                )
+            # Reuse this thread's long-lived browser; each scrape gets a fresh context
+            pool = get_browser_pool()
+            # Start from the site's stored consent state, if any
+            storage_state = self.content_extractor.consent_store.state_for(url)
+            with pool.context(storage_state=storage_state) as context:
+                # Skip media, ads and trackers per BROWSER['blocking']
+                blocker = RequestBlocker.from_config()
+                blocker.install(context)
                 page = context.new_page()
                 
                 # Set timeout
@@ -94,10 +99,11 @@ class WebScraper:
                     # Extract domain and create article dict
                     domain = urlparse(url).netloc
                     article = {"title": f"Article from {domain}"}
+                    extras: Dict[str, Any] = {}
                     
                     # Extract content
                     success, article_content, title, rejection_reason = self.content_extractor.extract_article_content(
-                        page, url, article, domain, domain
+                        page, url, article, domain, domain, extras=extras
                     )
                     
                     if not success:
@@ -109,27 +115,30 @@ class WebScraper:
                         "title": title,
                         "markdown_content": article_content,
                         "structured_data": {},
+                        "links": extras.get("links", []),
                         "status_code": str(response.status if response else 200),
                     }
                     
                 finally:
+                    get_blocking_report().add(blocker)
                     page.close()
-                    context.close()
-                    browser.close()
 
         except Exception as e:  # noqa: BLE001 - broad except with logging for robustness
             print(f"Error scraping {url}: {e}")
             return None
 
-    def scrape_page(self, url: str) -> Optional[Dict[str, str]]:
+    def scrape_page(self, url: str, profile: Optional[str] = None) -> Optional[Dict[str, str]]:
         """
         Scrape content from a given URL using Playwright with bot detection.
 
         Args:
             url: URL to scrape.
+            profile: Accepted for interface parity with the Firecrawl backend
+                (a rendered page always yields text and links).
 
         Returns:
             A dict containing metadata, markdown content, and structured data, or None if the request fails.
+            With near-duplicate detection on, `simhash` and `near_duplicate_of` are set as well.
         """
         # Scrape with Playwright
         scraped_content = self.scrape_with_playwright(url)
@@ -144,8 +153,9 @@ class WebScraper:
             
             # For now, just return None - stealth retry could be implemented later
             print("⭐ Bot detection encountered")
+            return scraped_content
         
-        return scraped_content
+        return annotate_near_duplicate(scraped_content, self.near_duplicate_index)
 
     def save_content(self, content: Dict[str, str], filename: str = "scraped_content") -> None:
         """
@@ -273,29 +283,30 @@ class WebScraper:
             return "."
 
     def save_content_to_session(self, content: Dict[str, str], filename: str, session_folder: str) -> None:
-        """Save content to session folder."""
+        """Save content to session folder (written by the background session writer)."""
         try:
             import json
             
+            writer = get_session_writer()
+            
             # Save markdown content
             md_path = os.path.join(session_folder, f"{filename}.md")
-            with open(md_path, "w", encoding="utf-8") as f:
-                f.write(f"# {content['title']}\n\n")
-                f.write(f"**Source:** {content['url']}\n\n")
-                f.write(content.get("markdown_content", ""))
+            writer.write(
+                md_path,
+                f"# {content['title']}\n\n**Source:** {content['url']}\n\n{content.get('markdown_content', '')}",
+            )
             print(f"Markdown saved to {md_path}")
 
             # Save structured data if available
             if content.get("structured_data") is not None:
                 json_path = os.path.join(session_folder, f"{filename}_data.json")
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "url": content.get("url", ""),
-                        "title": content.get("title", ""),
-                        "status_code": content.get("status_code", ""),
-                        "structured_data": content.get("structured_data", {}),
-                    }, f, indent=2, ensure_ascii=False)
+                writer.write(json_path, json.dumps({
+                    "url": content.get("url", ""),
+                    "title": content.get("title", ""),
+                    "status_code": content.get("status_code", ""),
+                    "structured_data": content.get("structured_data", {}),
+                }, indent=2, ensure_ascii=False))
                 print(f"Structured data saved to {json_path}")
             
         except Exception as e:
-            print(f"Error saving content to session: {e}")
\ No newline at end of file
+            print(f"Error saving content to session: {e}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for src/crawl_frontier.py"""
+
+import sys
+from pathlib import Path
+
+# Add the manual_scrape package directory so 'src' resolves
+PACKAGE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PACKAGE_DIR))
+
+from src.crawl_frontier import BloomFilter, CrawlFrontier, canonicalize_url
+
+
+def test_canonicalize_normalizes_host_port_fragment_and_query():
+    assert (
+        canonicalize_url("HTTPS://Www.Example.COM:443/a/b?z=1&utm_source=x&a=2&gclid=abc#section")
+        == "https://www.example.com/a/b?a=2&z=1"
+    )
+    assert canonicalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_canonicalize_resolves_relative_urls():
+    assert canonicalize_url("../c?x=1", "https://example.com/a/b/") == "https://example.com/a/c?x=1"
+
+
+def test_canonicalize_rejects_non_http_links():
+    for url in ("mailto:a@b.c", "javascript:void(0)", "ftp://example.com/f", "", "   "):
+        assert canonicalize_url(url) is None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://example.com/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(10000))
+    # Sized for 1%: allow generous slack against the target rate
+    assert false_positives < 300
+
+
+def test_frontier_deduplicates_and_pops_shallowest_first(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"), capacity=100)
+    assert frontier.add("https://example.com/deep", 2)
+    assert frontier.add("https://example.com/", 0)
+    assert not frontier.add("https://example.com/", 1)
+    assert frontier.pop_batch(10) == [("https://example.com/", 0), ("https://example.com/deep", 2)]
+    assert frontier.pop_batch(10) == []
+    stats = frontier.stats()
+    assert stats["in_progress"] == 2 and stats["seen"] == 2
+    assert stats["exact_checks"] == 1
+    frontier.close()
+
+
+def test_frontier_resumes_in_progress_urls(tmp_path):
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier(path)
+    frontier.add("https://example.com/a", 0)
+    frontier.add("https://example.com/b", 1)
+    frontier.pop_batch(2)
+    frontier.mark("https://example.com/a", "done")
+    frontier.close()
+
+    resumed = CrawlFrontier(path)
+    # The seen-set is rebuilt from disk and unfinished pages are queued again
+    assert not resumed.add("https://example.com/a", 0)
+    assert resumed.pop_batch(10) == [("https://example.com/b", 1)]
+    resumed.close()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for src/html_to_markdown.py"""
+
+import sys
+from pathlib import Path
+
+# Add the manual_scrape package directory so 'src' resolves
+PACKAGE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PACKAGE_DIR))
+
+from src.html_to_markdown import html_to_markdown
+
+
+def test_headings_paragraphs_and_emphasis():
+    markdown = html_to_markdown("<h2>Specs</h2><p>Made of <b>steel</b> and <em>wood</em>.</p><p>Second</p>")
+    assert markdown == "## Specs\n\nMade of **steel** and *wood*.\n\nSecond"
+
+
+def test_links_resolve_against_base_url():
+    markdown = html_to_markdown(
+        '<p><a href="/p/1">One</a> <a href="#top">Top</a> <a href="mailto:x@y.z">Mail</a></p>',
+        "https://example.com/shop/",
+    )
+    assert markdown == "[One](https://example.com/p/1) Top Mail"
+
+
+def test_nested_lists():
+    markdown = html_to_markdown("<ul><li>a<ol><li>b</li><li>c</li></ol></li><li>d</li></ul>")
+    assert markdown == "- a\n  1. b\n  2. c\n- d"
+
+
+def test_excluded_tags_and_comments_are_dropped():
+    markdown = html_to_markdown(
+        "<div><script>var x;</script><!-- note -->Kept<nav>Menu</nav></div>", excluded_tags=["nav"]
+    )
+    assert markdown == "Kept"
+
+
+def test_table_first_row_is_header_and_pipes_are_escaped():
+    markdown = html_to_markdown(
+        "<table><tr><th>Name</th><th>Value</th></tr><tr><td>Size</td><td>a|b</td></tr><tr><td>Only</td></tr></table>"
+    )
+    assert markdown.splitlines() == [
+        "| Name | Value |",
+        "| --- | --- |",
+        "| Size | a\\|b |",
+        "| Only |  |",
+    ]
+
+
+def test_nested_table_is_flattened_into_its_cell():
+    markdown = html_to_markdown(
+        "<table><tr><th>Feature</th><th>Values</th></tr>"
+        "<tr><td>Voltage</td><td><table><tr><td>230 V</td><td>50 Hz</td></tr>"
+        "<tr><td>110 V</td><td>60 Hz</td></tr></table></td></tr></table>"
+    )
+    assert markdown.splitlines() == [
+        "| Feature | Values |",
+        "| --- | --- |",
+        "| Voltage | 230 V; 50 Hz<br>110 V; 60 Hz |",
+    ]
+
+
+def test_cell_content_stays_on_one_line():
+    markdown = html_to_markdown("<table><tr><td><p>a</p><p>b</p></td><td><ul><li>x</li><li>y</li></ul></td></tr></table>")
+    assert markdown.splitlines()[0] == "| a b | - x - y |"
+
+
+def test_empty_and_unparseable_input():
+    assert html_to_markdown("") == ""
+    assert html_to_markdown("   ") == ""
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for src/near_duplicate.py"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add the manual_scrape package directory so 'src' resolves
+PACKAGE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PACKAGE_DIR))
+
+from src.near_duplicate import NearDuplicateIndex, annotate_near_duplicate, hamming_distance, simhash
+
+_VOCABULARY = [f"word{i}" for i in range(500)]
+
+
+def _text(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(words))
+
+
+def test_simhash_ignores_case_and_link_targets():
+    text = _text(1)
+    assert simhash(text) == simhash(text.upper())
+    assert simhash("[Home](https://a.com/x) " + text) == simhash("[Home](https://b.com/y) " + text)
+
+
+def test_short_texts_are_not_fingerprinted():
+    assert simhash("too short to compare") is None
+
+
+def test_small_edit_stays_close_and_different_text_does_not():
+    text = _text(2)
+    edited = text.replace(text.split()[150], "changed", 1)
+    assert hamming_distance(simhash(text), simhash(edited)) <= 3
+    assert hamming_distance(simhash(text), simhash(_text(3))) > 10
+
+
+def test_index_flags_near_duplicates_and_keeps_the_first_copy():
+    index = NearDuplicateIndex(max_distance=3)
+    text = _text(4)
+    assert index.check("https://a.com/p", text)[1] is None
+    assert index.check("https://a.com/p?print=1", text + " footer")[1] == "https://a.com/p"
+    assert index.check("https://a.com/other", _text(5))[1] is None
+    # Near-duplicates are not indexed; re-checking the original is not a match with itself
+    assert len(index) == 2
+    assert index.check("https://a.com/p", text)[1] is None
+
+
+def test_index_persists_and_reloads(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    text = _text(6)
+    NearDuplicateIndex(path).check("https://a.com/p", text)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"url": "https://a.com/torn", "sim')  # torn last line is skipped
+
+    reloaded = NearDuplicateIndex(path)
+    assert len(reloaded) == 1
+    assert reloaded.check("https://b.com/copy", text)[1] == "https://a.com/p"
+
+
+def test_annotate_sets_fields():
+    index = NearDuplicateIndex()
+    content = annotate_near_duplicate({"url": "https://a.com/", "markdown_content": _text(7)}, index)
+    assert len(content["simhash"]) == 16 and content["near_duplicate_of"] is None
+    assert annotate_near_duplicate(None, index) is None
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for src/serp_cache.py and the stale refresh in src/serp_api_client.py"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add the manual_scrape package directory so 'src' resolves
+PACKAGE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PACKAGE_DIR))
+
+from src import serp_cache
+from src.serp_api_client import SerpAPIClient
+from src.serp_cache import SerpCache, cache_key
+
+RESPONSE = {"organic_results": [{"link": "https://www.imdb.com/title/tt1186367/"}]}
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def _cache(monkeypatch, path=None):
+    clock = _Clock()
+    monkeypatch.setattr(serp_cache.time, "time", clock.time)
+    return SerpCache(path, ttl_hours=1, stale_hours=2), clock
+
+
+def test_cache_key_normalizes_query_and_website():
+    assert cache_key("Ninja  Assassin", "https://www.imdb.com/", "google", 10) == cache_key(
+        "ninja assassin", "imdb.com", "Google", 10
+    )
+    assert cache_key("ninja assassin", "imdb.com", "google", 10) != cache_key("ninja assassin", "imdb.com", "google", 20)
+
+
+def test_entries_go_fresh_then_stale_then_missing(monkeypatch):
+    cache, clock = _cache(monkeypatch)
+    key = cache_key("q", None, "google", 10)
+    assert cache.get(key) == (None, None)
+    cache.put(key, "q", None, "google", 10, RESPONSE)
+
+    assert cache.get(key) == (RESPONSE, "fresh")
+    clock.now += 3600 + 1
+    assert cache.get(key) == (RESPONSE, "stale")
+    clock.now += 2 * 3600
+    assert cache.get(key) == (None, None)
+    assert cache.stats == {"hits": 1, "stale_hits": 1, "misses": 2, "stores": 1}
+    assert cache.hit_rate() == 0.5
+
+
+def test_entries_persist_across_instances_and_purge(monkeypatch, tmp_path):
+    path = str(tmp_path / "serp.sqlite")
+    cache, clock = _cache(monkeypatch, path)
+    key = cache_key("q", "imdb.com", "google", 10)
+    cache.put(key, "q", "imdb.com", "google", 10, RESPONSE)
+    cache.close()
+
+    reopened = SerpCache(path, ttl_hours=1, stale_hours=2)
+    assert reopened.get(key) == (RESPONSE, "fresh")
+    clock.now += 3 * 3600 + 1
+    assert reopened.purge_expired() == 1
+    assert reopened.get(key) == (None, None)
+    reopened.close()
+
+
+def test_stale_hit_refreshes_once_and_close_waits(monkeypatch):
+    monkeypatch.setenv("SERP_API_KEY", "test")
+    cache, clock = _cache(monkeypatch)
+    client = SerpAPIClient(cache=cache)
+    release = threading.Event()
+    fetched = []
+
+    def fake_fetch(key, query, website, engine, num):
+        release.wait(5)
+        fetched.append(query)
+        cache.put(key, query, website, engine, num, RESPONSE)
+        return RESPONSE
+
+    monkeypatch.setattr(client, "_fetch", fake_fetch)
+    cache.put(cache_key("q", None, "google", 10), "q", None, "google", 10, RESPONSE)
+    clock.now += 3600 + 1
+
+    # Stale entries are served at once; concurrent stale hits share one refresh
+    assert client.search_web("q") == RESPONSE
+    assert client.search_web("q") == RESPONSE
+    release.set()
+    client.close()
+    assert fetched == ["q"]
+    assert cache.get(cache_key("q", None, "google", 10))[1] == "fresh"
+
+    # No refreshes start once the client is closed
+    clock.now += 3600 + 1
+    assert client.search_web("q") == RESPONSE
+    assert fetched == ["q"]